@@ -0,0 +1,46 @@
+"""
+Compare the throughput of the fontconfig enumeration when it is called serially and from many threads.
+
+    python benchmarks/benchmark_concurrent_enumeration.py --threads 64 --calls 640
+
+Each call lists the fonts with FcFontList on the shared FcConfig of the session,
+so the process-wide snapshot cache doesn't hide the cost of the enumeration.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from find_system_fonts_filename.unix.fontconfig_session import FontConfigSession
+from find_system_fonts_filename.unix.unix_fonts import UnixFonts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--calls", type=int, default=640)
+    args = parser.parse_args()
+
+    session = FontConfigSession.get()
+    # Load the FcConfig before measuring.
+    _enumerate(session)
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        _enumerate(session)
+    serial = time.perf_counter() - start
+    print(f"serial      {args.calls / serial:10.1f} calls/s")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as executor:
+        for _ in executor.map(lambda _: _enumerate(session), range(args.calls)):
+            pass
+    concurrent = time.perf_counter() - start
+    print(f"{args.threads} threads  {args.calls / concurrent:10.1f} calls/s  speedup {serial / concurrent:5.2f}x")
+
+
+def _enumerate(session: FontConfigSession) -> None:
+    with session.config() as loaded_config:
+        UnixFonts._list_fonts_faces(session.font_config, loaded_config.config)
+
+
+if __name__ == "__main__":
+    main()
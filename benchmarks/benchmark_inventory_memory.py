@@ -0,0 +1,52 @@
+"""
+Compare the memory used by a set of str and by a FontsInventory of the same fonts filename.
+
+    python benchmarks/benchmark_inventory_memory.py --fonts 50000
+
+The filenames look like the ones of TeX Live, Noto and the CJK fonts: many directories
+with long paths, and families of a few dozen styles.
+"""
+import argparse
+import tracemalloc
+from typing import List
+from find_system_fonts_filename import FontsInventory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fonts", type=int, default=50000)
+    args = parser.parse_args()
+
+    set_size = _measure(lambda: set(_build_fonts_filename(args.fonts)))
+    inventory_size = _measure(lambda: FontsInventory(_build_fonts_filename(args.fonts)))
+
+    print(f"set(str)        {set_size / 1024 / 1024:8.2f} MiB")
+    print(f"FontsInventory  {inventory_size / 1024 / 1024:8.2f} MiB  {set_size / inventory_size:.1f}x smaller")
+
+
+def _measure(build) -> int:
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        fonts = build()
+        size = tracemalloc.get_traced_memory()[0] - start
+        del fonts
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def _build_fonts_filename(count: int) -> List[str]:
+    prefixes = (
+        "/usr/share/texlive/texmf-dist/fonts/opentype/public/",
+        "/usr/share/fonts/truetype/noto/",
+        "/usr/share/fonts/opentype/noto-cjk/",
+    )
+    return [
+        f"{prefixes[i % 3]}family{i // 24:05d}/Family{i // 24:05d}-Style{i % 24:02d}.{'otf' if i % 2 else 'ttf'}"
+        for i in range(count)
+    ]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measure how extract_metadata scales with the number of workers.
+
+    python benchmarks/benchmark_metadata_extraction.py --backend process --copies 2000
+
+The system fonts are copied to a temporary directory until there are at least --copies files,
+so the benchmark doesn't depend on how many fonts are installed.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from find_system_fonts_filename import extract_metadata, get_system_fonts_filename
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=("thread", "process"), default="process")
+    parser.add_argument("--copies", type=int, default=2000, help="The minimum number of font files to read.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3, help="The best of this number of runs is kept.")
+    args = parser.parse_args()
+
+    fonts_filename = sorted(get_system_fonts_filename())
+    if not fonts_filename:
+        parser.error("No font is installed.")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        while len(paths) < args.copies:
+            for filename in fonts_filename:
+                path = os.path.join(directory, f"{len(paths)}-{os.path.basename(filename)}")
+                shutil.copyfile(filename, path)
+                paths.append(path)
+
+        print(f"{len(paths)} files, backend={args.backend}, {os.cpu_count()} CPUs")
+        baseline = None
+        for workers in args.workers:
+            best = min(_run(paths, workers, args.backend) for _ in range(args.repeat))
+            baseline = baseline or best
+            print(f"workers={workers:<3} {best:8.3f} s  speedup {baseline / best:5.2f}x")
+
+
+def _run(paths, workers: int, backend: str) -> float:
+    start = time.perf_counter()
+    for _ in extract_metadata(paths, workers=workers, backend=backend):
+        pass
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
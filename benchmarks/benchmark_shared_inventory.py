@@ -0,0 +1,68 @@
+"""
+Compare a worker process that builds its own FontsInventory with a worker that maps the one published by the parent.
+
+    python benchmarks/benchmark_shared_inventory.py --fonts 50000
+
+The private memory of a worker is the memory that isn't shared with the other workers, from /proc/self/smaps_rollup (Linux only).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmark_inventory_memory import _build_fonts_filename
+from find_system_fonts_filename import FontsInventory, publish_fonts_inventory, SharedFontsInventory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fonts", type=int, default=50000)
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_run_worker(*args.worker, args.fonts)))
+        return
+
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        path = os.path.join(directory, "fonts.inventory")
+        publish_fonts_inventory(path, FontsInventory(_build_fonts_filename(args.fonts)))
+
+        for mode in ("build", "attach"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--fonts", str(args.fonts), "--worker", mode, path],
+                check=True, stdout=subprocess.PIPE, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(f"{mode:<7} {result['seconds'] * 1000:8.2f} ms  {result['private_kib'] / 1024:8.2f} MiB private  (iteration {result['iterate_seconds'] * 1000:.2f} ms)")
+
+
+def _run_worker(mode: str, path: str, fonts: int) -> dict:
+    private_before = _get_private_kib()
+    start = time.perf_counter()
+    if mode == "build":
+        inventory = FontsInventory(_build_fonts_filename(fonts))
+    else:
+        inventory = SharedFontsInventory(path).get()
+    seconds = time.perf_counter() - start
+    private = _get_private_kib() - private_before
+
+    # Touch all the pages of the inventory, like a worker that used it for a while.
+    start = time.perf_counter()
+    assert sum(1 for _ in inventory) == fonts
+    return {"seconds": seconds, "private_kib": private, "iterate_seconds": time.perf_counter() - start}
+
+
+def _get_private_kib() -> int:
+    private = 0
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                private += int(line.split()[1])
+    return private
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure the import time of the package, in a new process for each measurement.
+
+    python benchmarks/benchmark_startup.py --repeat 20
+
+    import: import find_system_fonts_filename
+    import_api: from find_system_fonts_filename import get_system_fonts_filename
+    first_call: the import and the first get_system_fonts_filename(), which imports the backend of the OS
+
+The times come from python -X importtime, so they don't include the startup of the interpreter.
+The test suite checks the same budget in tests/test_startup.py.
+"""
+import argparse
+import subprocess
+import sys
+from statistics import median
+from typing import List
+
+STATEMENTS = {
+    "import": "import find_system_fonts_filename",
+    "import_api": "from find_system_fonts_filename import get_system_fonts_filename",
+    "first_call": "from find_system_fonts_filename import get_system_fonts_filename; get_system_fonts_filename()",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for name, statement in STATEMENTS.items():
+        times = [measure_import_time(statement) for _ in range(args.repeat)]
+        print(f"{name:<11} median {median(times) * 1000:7.2f} ms  min {min(times) * 1000:7.2f} ms")
+
+
+def measure_import_time(statement: str) -> float:
+    """
+    Returns:
+        The time, in seconds, spent importing the modules that the statement imports, excluding the interpreter startup.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    ).stderr
+    return sum(_get_top_level_times(stderr, after="find_system_fonts_filename")) / 1_000_000
+
+
+def _get_top_level_times(importtime_output: str, after: str) -> List[int]:
+    """
+    Returns:
+        The cumulative time, in microseconds, of the top level imports, starting at the first import of the module "after".
+    """
+    times = []
+    started = False
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # The imports done by a module are printed before it, indented, so the top level ones have no indentation.
+        if module.startswith(" ") and not module.startswith("  "):
+            if module.strip().startswith(after):
+                started = True
+            if started:
+                times.append(int(cumulative))
+    return times
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Measure the enumeration, install and uninstall of fonts on synthetic font trees (Linux only).
+
+    python benchmarks/benchmark_suite.py --sizes 100 1000 10000 100000 --output results.json
+    python benchmarks/benchmark_suite.py --sizes 100 1000 --compare results.json
+
+For each size, a temporary tree of minimal .ttf/.otf/.ttc fonts is generated with a private fonts.conf,
+and FONTCONFIG_FILE points to it. Each measurement runs in a new process, so nothing is cached
+in memory between them:
+    cold_s: the first enumeration, without any fontconfig cache.
+    warm_start_s: the first enumeration of a new process, with the fontconfig caches.
+    warm_s: an enumeration when the snapshot of the process is up to date (median).
+    rebuild_s: an enumeration after invalidate_system_fonts_cache, with the fontconfig caches.
+    peak_rss_kib: the peak resident memory of the process that did the cold enumeration.
+    install_per_s, uninstall_per_s: the throughput of install_font and uninstall_font.
+    install_batch_per_s, uninstall_batch_per_s: the throughput of install_fonts and uninstall_fonts.
+
+The 100k fonts tree uses about 200 MB and its cold enumeration takes minutes.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from statistics import median
+from typing import Dict, List
+
+from synthetic_fonts import build_font, generate_fonts_tree
+
+TIMINGS = ("cold_s", "warm_start_s", "warm_s", "rebuild_s")
+THROUGHPUTS = ("install_per_s", "uninstall_per_s", "install_batch_per_s", "uninstall_batch_per_s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--output", default="-", help="The JSON file where the results are written. - for stdout.")
+    parser.add_argument("--compare", help="A JSON file written by a previous run. The ratios are printed and the exit code is 1 on a regression.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="The ratio above which a result is a regression.")
+    parser.add_argument("--install-count", type=int, default=50)
+    parser.add_argument("--warm-repeat", type=int, default=20)
+    parser.add_argument("--worker", nargs=2, metavar=("PHASE", "DIRECTORY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        phase, directory = args.worker
+        print(json.dumps(_run_worker(phase, Path(directory), args.install_count, args.warm_repeat)))
+        return
+
+    results = {
+        "commit": _get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [_benchmark_size(size, args.install_count, args.warm_repeat) for size in args.sizes],
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        Path(args.output).write_text(output + "\n")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if not _compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+def _benchmark_size(size: int, install_count: int, warm_repeat: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        start = time.perf_counter()
+        generate_fonts_tree(directory / "fonts", size)
+        print(f"{size} fonts generated in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+        (directory / "fonts.conf").write_text(
+            "<?xml version=\"1.0\"?>\n"
+            "<fontconfig>\n"
+            f"    <dir>{directory / 'fonts'}</dir>\n"
+            f"    <cachedir>{directory / 'cache'}</cachedir>\n"
+            "</fontconfig>\n"
+        )
+        (directory / "install").mkdir()
+        for i in range(install_count):
+            (directory / "install" / f"installed-{i:04d}.ttf").write_bytes(build_font(f"Installed {i:04d}"))
+
+        result = {"fonts": size}
+        for phase in ("cold", "warm_start", "install"):
+            result.update(_run_phase(phase, directory, install_count, warm_repeat))
+
+        print(json.dumps(result), file=sys.stderr)
+        return result
+
+
+def _run_phase(phase: str, directory: Path, install_count: int, warm_repeat: int) -> Dict[str, float]:
+    environment = dict(
+        os.environ,
+        FONTCONFIG_FILE=str(directory / "fonts.conf"),
+        # The persistent caches of the package are also private to the benchmark.
+        XDG_CACHE_HOME=str(directory / "xdg-cache"),
+    )
+    output = subprocess.run(
+        [sys.executable, __file__, "--install-count", str(install_count), "--warm-repeat", str(warm_repeat), "--worker", phase, str(directory)],
+        env=environment, check=True, stdout=subprocess.PIPE, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def _run_worker(phase: str, directory: Path, install_count: int, warm_repeat: int) -> Dict[str, float]:
+    import resource
+    from find_system_fonts_filename import get_system_fonts_filename, install_font, install_fonts, invalidate_system_fonts_cache, uninstall_font, uninstall_fonts
+
+    if phase == "cold":
+        start = time.perf_counter()
+        fonts_count = len(get_system_fonts_filename())
+        cold = time.perf_counter() - start
+
+        warm = []
+        for _ in range(warm_repeat):
+            start = time.perf_counter()
+            get_system_fonts_filename()
+            warm.append(time.perf_counter() - start)
+
+        invalidate_system_fonts_cache()
+        start = time.perf_counter()
+        get_system_fonts_filename()
+        rebuild = time.perf_counter() - start
+
+        # On Linux, ru_maxrss is in KiB.
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"fonts_filename": fonts_count, "cold_s": cold, "warm_s": median(warm), "rebuild_s": rebuild, "peak_rss_kib": peak_rss}
+
+    if phase == "warm_start":
+        start = time.perf_counter()
+        get_system_fonts_filename()
+        return {"warm_start_s": time.perf_counter() - start}
+
+    if phase == "install":
+        fonts = sorted((directory / "install").iterdir())[:install_count]
+
+        start = time.perf_counter()
+        for font in fonts:
+            install_font(font)
+        install = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for font in fonts:
+            uninstall_font(font)
+        uninstall = time.perf_counter() - start
+
+        start = time.perf_counter()
+        install_fonts(fonts)
+        install_batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        uninstall_fonts(fonts)
+        uninstall_batch = time.perf_counter() - start
+
+        return {
+            "install_per_s": len(fonts) / install,
+            "uninstall_per_s": len(fonts) / uninstall,
+            "install_batch_per_s": len(fonts) / install_batch,
+            "uninstall_batch_per_s": len(fonts) / uninstall_batch,
+        }
+
+    raise ValueError(f"Unknown phase \"{phase}\"")
+
+
+def _compare(baseline: dict, results: dict, threshold: float) -> bool:
+    """
+    Print the ratio between the results and the baseline of each size.
+
+    Returns:
+        False if a result regressed more than the threshold.
+    """
+    baseline_by_size = {result["fonts"]: result for result in baseline["results"]}
+    print(f"Compared to {baseline.get('commit')} (ratio > 1 is slower)")
+
+    ok = True
+    for result in results["results"]:
+        previous = baseline_by_size.get(result["fonts"])
+        if previous is None:
+            continue
+
+        ratios: List[str] = []
+        for key in (*TIMINGS, "peak_rss_kib", *THROUGHPUTS):
+            if not previous.get(key) or not result.get(key):
+                continue
+            # For a throughput, a higher value is better.
+            ratio = previous[key] / result[key] if key in THROUGHPUTS else result[key] / previous[key]
+            regressed = ratio > threshold
+            ok = ok and not regressed
+            ratios.append(f"{key}={ratio:.2f}{' REGRESSION' if regressed else ''}")
+
+        print(f"{result['fonts']:>7} fonts: {', '.join(ratios)}")
+
+    return ok
+
+
+def _get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+if __name__ == "__main__":
+    main()
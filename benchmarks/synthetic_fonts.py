@@ -0,0 +1,197 @@
+"""
+Generate minimal valid fonts: TrueType (.ttf), CFF-flavored OpenType (.otf) and collections (.ttc).
+
+Each font only has one empty glyph, so it is about 1 KB, but it has all the tables
+that FreeType and fontconfig need to index it, with a unique family name.
+"""
+from pathlib import Path
+from struct import pack
+from typing import Dict, List, Tuple
+
+__all__ = [
+    "build_collection",
+    "build_font",
+    "build_font_tables",
+    "generate_fonts_tree",
+]
+
+FONTS_PER_DIRECTORY = 1000
+
+
+def build_font_tables(family: str, style: str = "Regular", weight: int = 400, cff: bool = False) -> Dict[bytes, bytes]:
+    """
+    Returns:
+        The tables of a font with one empty glyph, by tag.
+    """
+    postscript_name = f"{family}-{style}".replace(" ", "")
+    tables = {
+        b"head": pack(">IIIIHHqqhhhhHHhhh", 0x00010000, 0x00010000, 0, 0x5F0F3CF5, 0x000B, 1000, 0, 0, 0, 0, 0, 0, 0, 8, 2, 0, 0),
+        b"hhea": pack(">I3hH6h4hhH", 0x00010000, 800, -200, 0, 500, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1),
+        b"hmtx": pack(">Hh", 500, 0),
+        # A format 4 subtable with only the final 0xFFFF segment.
+        b"cmap": pack(">HHHHI", 0, 1, 3, 1, 12) + pack(">HHHHHHHHHHH", 4, 24, 0, 2, 2, 0, 0, 0xFFFF, 0, 0xFFFF, 1) + pack(">H", 0),
+        b"name": _build_name_table({1: family, 2: style, 4: f"{family} {style}", 6: postscript_name}),
+        b"OS/2": _build_os2_table(weight, style),
+        b"post": pack(">IiHhIIIII", 0x00030000, 0, 0, 0, 0, 0, 0, 0, 0),
+    }
+
+    if cff:
+        tables[b"maxp"] = pack(">IH", 0x00005000, 1)
+        tables[b"CFF "] = _build_cff_table(postscript_name)
+    else:
+        tables[b"maxp"] = pack(">IH13H", 0x00010000, 1, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0)
+        # A glyph without any contour.
+        tables[b"glyf"] = pack(">hhhhhH", 0, 0, 0, 0, 0, 0)
+        tables[b"loca"] = pack(">HH", 0, len(tables[b"glyf"]) // 2)
+
+    return tables
+
+
+def build_font(family: str, style: str = "Regular", weight: int = 400, cff: bool = False) -> bytes:
+    """
+    Returns:
+        A .ttf font, or a .otf font if cff is True.
+    """
+    tables = build_font_tables(family, style, weight, cff)
+    directory, data = _build_table_directory(tables, b"OTTO" if cff else b"\x00\x01\x00\x00", 0)
+    return directory + data
+
+
+def build_collection(fonts_tables: List[Dict[bytes, bytes]]) -> bytes:
+    """
+    Returns:
+        A .ttc collection with the fonts.
+    """
+    header_size = 12 + 4 * len(fonts_tables)
+    directories_size = sum(12 + 16 * len(tables) for tables in fonts_tables)
+
+    directories = []
+    offsets = []
+    data = b""
+    for tables in fonts_tables:
+        offsets.append(header_size + sum(len(directory) for directory in directories))
+        sfnt_version = b"OTTO" if b"CFF " in tables else b"\x00\x01\x00\x00"
+        directory, font_data = _build_table_directory(tables, sfnt_version, header_size + directories_size + len(data))
+        directories.append(directory)
+        data += font_data
+
+    header = b"ttcf" + pack(">HHI", 1, 0, len(fonts_tables)) + b"".join(pack(">I", offset) for offset in offsets)
+    return header + b"".join(directories) + data
+
+
+def generate_fonts_tree(directory: Path, count: int) -> List[Path]:
+    """
+    Write count font files in subdirectories of FONTS_PER_DIRECTORY files.
+    A third of them are .ttf, a third .otf and a third .ttc collections of two fonts.
+
+    Returns:
+        The fonts filename.
+    """
+    fonts_filename = []
+    for i in range(count):
+        sub_directory = directory / f"{i // FONTS_PER_DIRECTORY:04d}"
+        if i % FONTS_PER_DIRECTORY == 0:
+            sub_directory.mkdir(parents=True, exist_ok=True)
+
+        family = f"Synthetic {i:06d}"
+        kind = i % 3
+        if kind == 0:
+            font_filename = sub_directory / f"synthetic-{i:06d}.ttf"
+            font_filename.write_bytes(build_font(family))
+        elif kind == 1:
+            font_filename = sub_directory / f"synthetic-{i:06d}.otf"
+            font_filename.write_bytes(build_font(family, cff=True))
+        else:
+            font_filename = sub_directory / f"synthetic-{i:06d}.ttc"
+            font_filename.write_bytes(build_collection([build_font_tables(family), build_font_tables(family, "Bold", 700)]))
+
+        fonts_filename.append(font_filename)
+
+    return fonts_filename
+
+
+def _build_table_directory(tables: Dict[bytes, bytes], sfnt_version: bytes, data_offset: int) -> Tuple[bytes, bytes]:
+    """
+    Returns:
+        The table directory and the tables. The tables start at data_offset in the file.
+    """
+    num_tables = len(tables)
+    entry_selector = num_tables.bit_length() - 1
+    search_range = 16 * (1 << entry_selector)
+    directory = sfnt_version + pack(">HHHH", num_tables, search_range, entry_selector, num_tables * 16 - search_range)
+
+    if data_offset == 0:
+        data_offset = len(directory) + 16 * num_tables
+
+    data = b""
+    for tag in sorted(tables):
+        table = tables[tag]
+        directory += pack(">4sIII", tag, _get_checksum(table), data_offset + len(data), len(table))
+        # The tables are aligned on 4 bytes.
+        data += table + b"\0" * (-len(table) % 4)
+
+    return directory, data
+
+
+def _get_checksum(table: bytes) -> int:
+    padded = table + b"\0" * (-len(table) % 4)
+    return sum(int.from_bytes(padded[i:i + 4], "big") for i in range(0, len(padded), 4)) & 0xFFFFFFFF
+
+
+def _build_name_table(names: Dict[int, str]) -> bytes:
+    records = b""
+    strings = b""
+    for name_id, name in sorted(names.items()):
+        encoded = name.encode("utf-16-be")
+        # Windows, Unicode BMP, English (United States)
+        records += pack(">HHHHHH", 3, 1, 0x0409, name_id, len(encoded), len(strings))
+        strings += encoded
+
+    return pack(">HHH", 0, len(names), 6 + len(records)) + records + strings
+
+
+def _build_os2_table(weight: int, style: str) -> bytes:
+    fs_selection = 0x0040 if style == "Regular" else (0x0020 if style == "Bold" else 0)
+    return pack(
+        ">HhHHHhhhhhhhhhhh10s4I4sHHHhhhHHIIhhHHH",
+        4, 500, weight, 5, 0,
+        0, 0, 0, 0, 0, 0, 0, 0, 50, 250, 0,
+        b"\0" * 10,
+        1, 0, 0, 0,
+        b"NONE",
+        fs_selection, 0x20, 0xFFFF,
+        800, -200, 0, 800, 200,
+        1, 0,
+        0, 0, 0, 0x20, 0,
+    )
+
+
+def _build_cff_table(postscript_name: str) -> bytes:
+    def index(items: List[bytes]) -> bytes:
+        if not items:
+            return pack(">H", 0)
+        offsets = [1]
+        for item in items:
+            offsets.append(offsets[-1] + len(item))
+        return pack(">HB", len(items), 4) + b"".join(pack(">I", offset) for offset in offsets) + b"".join(items)
+
+    def integer(value: int) -> bytes:
+        # The 5 bytes encoding, so the size of the Top DICT doesn't depend on the offsets.
+        return b"\x1d" + pack(">i", value)
+
+    header = bytes([1, 0, 4, 1])
+    name_index = index([postscript_name.encode("ascii")])
+    string_index = index([])
+    global_subrs_index = index([])
+    # One charstring with only endchar.
+    charstrings_index = index([b"\x0e"])
+    # defaultWidthX 0
+    private_dict = b"\x8b\x14"
+
+    top_dict_size = len(index([b"\0" * 17]))
+    charstrings_offset = len(header) + len(name_index) + top_dict_size + len(string_index) + len(global_subrs_index)
+    private_offset = charstrings_offset + len(charstrings_index)
+    # CharStrings (17) and Private (18)
+    top_dict = integer(charstrings_offset) + b"\x11" + integer(len(private_dict)) + integer(private_offset) + b"\x12"
+
+    return header + name_index + index([top_dict]) + string_index + global_subrs_index + charstrings_index + private_dict
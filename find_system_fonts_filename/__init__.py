@@ -1,4 +1,92 @@
-from .fonts_filename import *
-from .exceptions import *
+from importlib import import_module
+
+# The public API is imported when it is first accessed, so importing the package is fast,
+# and a CLI only pays for the modules it uses. The backend of the OS is only loaded by the first call that needs it.
+# https://peps.python.org/pep-0562/
+# It doesn't import typing either, since it is the slowest module to import.
+_ATTRIBUTES_MODULE = {
+    **dict.fromkeys([
+        "count_system_fonts",
+        "create_fonts_watcher",
+        "find_font_file",
+        "find_installed_copies",
+        "get_system_fonts",
+        "get_system_fonts_changes",
+        "get_system_fonts_duplicates",
+        "get_system_fonts_faces",
+        "get_system_fonts_filename",
+        "get_system_fonts_inventory",
+        "get_system_fonts_snapshot",
+        "install_font",
+        "install_fonts",
+        "invalidate_system_fonts_cache",
+        "iter_system_fonts_filename",
+        "uninstall_font",
+        "uninstall_fonts",
+        "warm_up_system_fonts_cache",
+    ], "fonts_filename"),
+    **dict.fromkeys([
+        "async_get_system_fonts_filename",
+        "async_get_system_fonts_snapshot",
+        "async_install_font",
+        "async_uninstall_font",
+    ], "async_fonts_filename"),
+    **dict.fromkeys([
+        "get_backends",
+        "register_backend",
+        "SystemFontsBackend",
+        "unregister_backend",
+    ], "backends"),
+    "FontDuplicatesFinder": "duplicates",
+    **dict.fromkeys([
+        "AndroidLibraryNotFound",
+        "FindSystemFontsFilenameException",
+        "FontConfigNotFound",
+        "NotSupportedFontFile",
+        "OSNotSupported",
+        "SystemApiError",
+    ], "exceptions"),
+    "FontFilter": "font_filter",
+    "SPACING": "font_filter",
+    "FontNameIndex": "font_index",
+    "FontInfo": "font_info",
+    "FontMetadataCache": "font_metadata_cache",
+    "InstallMode": "install_mode",
+    **dict.fromkeys([
+        "add_observer",
+        "remove_observer",
+        "reset_stats",
+        "Span",
+        "stats",
+    ], "instrumentation"),
+    "FontsInventory": "inventory",
+    "extract_metadata": "metadata_extraction",
+    "FontMetadata": "metadata_extraction",
+    "publish_fonts_inventory": "shared_inventory",
+    "SharedFontsInventory": "shared_inventory",
+    **dict.fromkeys([
+        "FontsChanges",
+        "FontsChangeToken",
+        "FontsSnapshot",
+        "FontsSnapshotCache",
+    ], "snapshot"),
+}
+
+__all__ = list(_ATTRIBUTES_MODULE)
 
 __version__ = "0.3.3"
+
+
+def __getattr__(name: str) -> object:
+    module_name = _ATTRIBUTES_MODULE.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    # The next accesses don't call __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> "list[str]":
+    return sorted({*globals(), *__all__})
@@ -5,6 +5,7 @@ from os import close, devnull, dup, dup2, O_WRONLY, open
 from sys import stderr, stdout
 from typing import Set
 from ..exceptions import OSNotSupported
+from ..install_mode import InstallMode
 from ..system_fonts import SystemFonts
 
 __all__ = ["AndroidFonts"]
@@ -37,7 +38,7 @@ class AndroidFonts(SystemFonts):
         return fonts_filename
 
 
-    def install_font(font_filename: Path, windows_flags: bool) -> None:
+    def install_font(font_filename: Path, windows_flags: bool, install_mode: InstallMode) -> None:
         raise OSNotSupported("You cannot install font on android.")
 
 
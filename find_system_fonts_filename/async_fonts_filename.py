@@ -0,0 +1,85 @@
+from asyncio import AbstractEventLoop, Future, get_running_loop, shield
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+from typing import Optional, Set
+from weakref import WeakKeyDictionary
+from .fonts_filename import get_system_fonts_snapshot, install_font, uninstall_font
+from .install_mode import InstallMode
+from .snapshot import FontsSnapshot
+
+__all__ = [
+    "async_get_system_fonts_filename",
+    "async_get_system_fonts_snapshot",
+    "async_install_font",
+    "async_uninstall_font",
+]
+
+# The snapshot being built for each event loop, so the concurrent awaiters share it.
+_pending_snapshots: "WeakKeyDictionary[AbstractEventLoop, Future]" = WeakKeyDictionary()
+
+
+async def async_get_system_fonts_snapshot(executor: Optional[Executor] = None) -> FontsSnapshot:
+    """Like get_system_fonts_snapshot, but the fonts are enumerated in an executor, so the event loop isn't blocked
+
+    The coroutines that await it while the snapshot is revalidated or built share the same call,
+    so a burst of requests only enumerates the fonts once.
+
+    Args:
+        executor: The executor used by loop.run_in_executor. If None, the default executor of the loop.
+    Returns:
+        The process-wide snapshot of the installed fonts.
+    """
+    loop = get_running_loop()
+
+    future = _pending_snapshots.get(loop)
+    if future is None:
+        future = loop.run_in_executor(executor, get_system_fonts_snapshot)
+        _pending_snapshots[loop] = future
+        future.add_done_callback(partial(_forget_pending_snapshot, loop))
+
+    # The shield prevents a cancelled awaiter from cancelling the call shared with the other awaiters.
+    return await shield(future)
+
+
+async def async_get_system_fonts_filename(executor: Optional[Executor] = None) -> Set[str]:
+    """
+    Args:
+        executor: The executor used by loop.run_in_executor. If None, the default executor of the loop.
+    Returns:
+        A new set of all the installed fonts filename. See get_system_fonts_filename.
+    """
+    return set((await async_get_system_fonts_snapshot(executor)).fonts_filename)
+
+
+async def async_install_font(
+    font_filename: Path,
+    add_font_to_registry: bool = False,
+    install_mode: InstallMode = InstallMode.AUTO,
+    executor: Optional[Executor] = None
+) -> None:
+    """
+    Like install_font, but run in an executor.
+    """
+    await _run_and_forget_pending_snapshot(executor, partial(install_font, font_filename, add_font_to_registry, install_mode))
+
+
+async def async_uninstall_font(font_filename: Path, remove_font_in_registry: bool = False, executor: Optional[Executor] = None) -> None:
+    """
+    Like uninstall_font, but run in an executor.
+    """
+    await _run_and_forget_pending_snapshot(executor, partial(uninstall_font, font_filename, remove_font_in_registry))
+
+
+async def _run_and_forget_pending_snapshot(executor: Optional[Executor], function: partial) -> None:
+    loop = get_running_loop()
+    try:
+        await loop.run_in_executor(executor, function)
+    finally:
+        # A snapshot that was being built may not contain the change, so the next awaiters must not join it.
+        _pending_snapshots.pop(loop, None)
+
+
+def _forget_pending_snapshot(loop: AbstractEventLoop, future: Future) -> None:
+    if _pending_snapshots.get(loop) is future:
+        del _pending_snapshots[loop]
@@ -0,0 +1,203 @@
+import os
+import sys
+from .exceptions import OSNotSupported
+from threading import RLock
+from typing import Callable, Dict, List, NamedTuple, Optional, Type, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .system_fonts import SystemFonts
+
+__all__ = [
+    "get_backends",
+    "register_backend",
+    "SystemFontsBackend",
+    "unregister_backend",
+]
+
+ENTRY_POINT_GROUP = "find_system_fonts_filename.backends"
+
+
+class SystemFontsBackend(NamedTuple):
+    """
+    Attributes:
+        name (str): The unique name of the backend.
+        load (Callable[[], Type[SystemFonts]]): Import the backend. It is only called when the backend is selected.
+        priority (int): The backends with the highest priority are probed first. On a tie, the built-in backends
+            are probed last, and the other backends are probed in the order they were registered.
+        probe (Callable[[], bool]): Return True if the backend can run in this process. It is called at most once per process,
+            and only if no backend with a higher priority is available. The probe of an entry point imports its module.
+    """
+    name: str
+    load: Callable[[], Type["SystemFonts"]]
+    priority: int
+    probe: Callable[[], bool]
+
+
+def _load_windows_fonts() -> Type["SystemFonts"]:
+    from .windows import WindowsFonts
+    return WindowsFonts
+
+
+def _load_mac_fonts() -> Type["SystemFonts"]:
+    from .mac import MacFonts
+    return MacFonts
+
+
+def _load_android_fonts() -> Type["SystemFonts"]:
+    from .android import AndroidFonts
+    return AndroidFonts
+
+
+def _load_unix_fonts() -> Type["SystemFonts"]:
+    from .unix import UnixFonts
+    return UnixFonts
+
+
+def _is_android() -> bool:
+    return os.name == "posix" and hasattr(sys, "getandroidapilevel")
+
+
+_BUILTIN_BACKENDS = (
+    SystemFontsBackend("windows", _load_windows_fonts, 0, lambda: sys.platform == "win32"),
+    SystemFontsBackend("mac", _load_mac_fonts, 0, lambda: sys.platform == "darwin"),
+    SystemFontsBackend("android", _load_android_fonts, 0, _is_android),
+    SystemFontsBackend("unix", _load_unix_fonts, 0, lambda: os.name == "posix" and sys.platform != "darwin" and not _is_android()),
+)
+_backends: Dict[str, SystemFontsBackend] = {backend.name: backend for backend in _BUILTIN_BACKENDS}
+_probe_results: Dict[str, bool] = {}
+_entry_points_loaded = False
+_system_fonts_class: Optional[Type["SystemFonts"]] = None
+_generation = 0
+# Reentrant, since a backend module may register a backend when it is loaded.
+_lock = RLock()
+
+
+def register_backend(name: str, load: Callable[[], Type["SystemFonts"]], priority: int = 0, probe: Optional[Callable[[], bool]] = None) -> None:
+    """
+    Register a backend, or replace the backend that has the same name.
+    The backend is selected by the next call that needs the installed fonts if it is available
+    and if no available backend has a higher priority.
+
+    Parameters:
+        name (str): The unique name of the backend.
+        load (Callable[[], Type[SystemFonts]]): Import the backend. It is only called when the backend is selected.
+        priority (int): The backends with the highest priority are probed first.
+            The built-in backends have a priority of 0, and they are probed after the other backends with the same priority.
+        probe (Optional[Callable[[], bool]]): Return True if the backend can run in this process.
+            If None, the backend is always available.
+    """
+    global _system_fonts_class, _generation
+
+    with _lock:
+        _backends.pop(name, None)
+        _backends[name] = SystemFontsBackend(name, load, priority, probe if probe is not None else lambda: True)
+        _probe_results.pop(name, None)
+        _system_fonts_class = None
+        _generation += 1
+
+
+def unregister_backend(name: str) -> None:
+    """
+    Parameters:
+        name (str): The name of a registered backend.
+    """
+    global _system_fonts_class, _generation
+
+    with _lock:
+        _load_entry_points()
+        if _backends.pop(name, None) is None:
+            raise ValueError(f"There isn't any backend named \"{name}\".")
+        _probe_results.pop(name, None)
+        _system_fonts_class = None
+        _generation += 1
+
+
+def get_backends() -> List[SystemFontsBackend]:
+    """
+    Returns:
+        The registered backends, including the ones of the entry points, in the order they are probed.
+    """
+    with _lock:
+        _load_entry_points()
+        # sorted is stable, so the backends with the same priority stay in registration order.
+        return sorted(_backends.values(), key=lambda backend: (-backend.priority, backend in _BUILTIN_BACKENDS))
+
+
+def get_system_fonts_class() -> Type["SystemFonts"]:
+    """
+    Returns:
+        The available backend with the highest priority. It is only selected by the first call, and then cached
+        until a backend is registered or unregistered.
+    """
+    system_fonts_class = _system_fonts_class
+    if system_fonts_class is None:
+        system_fonts_class = _select_system_fonts_class()
+    return system_fonts_class
+
+
+def _select_system_fonts_class() -> Type["SystemFonts"]:
+    global _system_fonts_class
+
+    with _lock:
+        if _system_fonts_class is not None:
+            return _system_fonts_class
+
+        generation = _generation
+        for backend in get_backends():
+            if _is_available(backend):
+                system_fonts_class = backend.load()
+                # If a backend module has registered a backend while it was probed or loaded, the next call selects the backend again.
+                if generation == _generation:
+                    _system_fonts_class = system_fonts_class
+                return system_fonts_class
+
+    from platform import system
+    raise OSNotSupported(f"FindSystemFontsFilename only works on Windows, Mac, Unix and Android. You are currently on \"{system()}\".")
+
+
+def _is_available(backend: SystemFontsBackend) -> bool:
+    available = _probe_results.get(backend.name)
+    if available is None:
+        try:
+            available = bool(backend.probe())
+        except Exception:
+            # A broken third-party backend shouldn't prevent the other backends from being used.
+            import logging
+            logging.getLogger(__name__).exception("The probe of the backend \"%s\" failed", backend.name)
+            available = False
+        _probe_results[backend.name] = available
+    return available
+
+
+def _load_entry_points() -> None:
+    """
+    Register the SystemFonts subclasses that the installed distributions declare in the
+    "find_system_fonts_filename.backends" entry point group. It is done once per process.
+    A backend that has been registered with the same name by register_backend is kept.
+
+    The entry points aren't imported here: a backend is only imported when it is probed,
+    and its probe is the is_available classmethod of the class. Their priority is 0,
+    so they are probed before the built-in backends. Call register_backend to use another priority.
+    """
+    global _entry_points_loaded
+
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    # Imported here since it is slow to import, and it is only needed to select the backend.
+    from importlib.metadata import entry_points
+    if sys.version_info >= (3, 10):
+        backend_entry_points = entry_points(group=ENTRY_POINT_GROUP)
+    else:
+        backend_entry_points = entry_points().get(ENTRY_POINT_GROUP, ())
+
+    for entry_point in backend_entry_points:
+        if entry_point.name not in _backends:
+            # EntryPoint.load imports the module only once, so the probe and the load share it.
+            _backends[entry_point.name] = SystemFontsBackend(
+                entry_point.name,
+                entry_point.load,
+                0,
+                lambda entry_point=entry_point: entry_point.load().is_available()
+            )
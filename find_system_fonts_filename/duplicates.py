@@ -0,0 +1,180 @@
+import hashlib
+import os
+from .sfnt import Sfnt
+from mmap import mmap, ACCESS_READ
+from threading import Lock
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .font_metadata_cache import FileKey
+
+__all__ = ["FontDuplicatesFinder"]
+
+
+class _CachedFile():
+    __slots__ = ("key", "fingerprint", "digest")
+
+    def __init__(self, key: "FileKey") -> None:
+        self.key = key
+        self.fingerprint: Optional[bytes] = None
+        self.digest: Optional[bytes] = None
+
+
+class FontDuplicatesFinder():
+    """
+    Find the font files that have the same content, without reading all the bytes of all the fonts.
+
+    The files are grouped by size, then the files of a same size by their fingerprint (see Sfnt.read_fingerprint),
+    and only the files which still have the same fingerprint are hashed. The fingerprints and the hashes
+    are cached until the size, the mtime, the inode or the device of the file changes.
+    """
+
+    _default: Optional["FontDuplicatesFinder"] = None
+    _default_lock = Lock()
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, _CachedFile] = {}
+        self._lock = Lock()
+
+
+    @staticmethod
+    def get_default() -> "FontDuplicatesFinder":
+        """
+        Returns:
+            The finder shared by the process, so its cache is reused between the calls.
+        """
+        if FontDuplicatesFinder._default is None:
+            with FontDuplicatesFinder._default_lock:
+                if FontDuplicatesFinder._default is None:
+                    FontDuplicatesFinder._default = FontDuplicatesFinder()
+
+        return FontDuplicatesFinder._default
+
+
+    def find_duplicates(self, fonts_filename: Iterable[str]) -> List[Tuple[str, ...]]:
+        """
+        Parameters:
+            fonts_filename (Iterable[str]): The fonts filename, like a FontsInventory.
+        Returns:
+            The groups of fonts that have the same content. Each group is sorted and contains at least 2 fonts.
+            The groups are sorted by their first font. The files that cannot be read aren't in any group.
+        """
+        files = self._get_files(set(fonts_filename))
+
+        groups = self._split([list(files)], lambda filename: files[filename].key[0])
+        groups = self._split(groups, lambda filename: self._get_fingerprint(filename, files[filename]))
+        groups = self._split(groups, lambda filename: self._get_digest(filename, files[filename]))
+
+        return sorted(tuple(sorted(group)) for group in groups)
+
+
+    def find_copies(self, font_filename: str, fonts_filename: Iterable[str]) -> List[str]:
+        """
+        Parameters:
+            font_filename (str): A font.
+            fonts_filename (Iterable[str]): The fonts filename where the copies are searched.
+        Returns:
+            The sorted fonts of fonts_filename which have the same content as font_filename. It is never in the result.
+        """
+        files = self._get_files({font_filename, *fonts_filename})
+        source = files.pop(font_filename, None)
+        if source is None:
+            return []
+
+        # Only the fonts of the same size are read, and they are only compared with the source.
+        candidates = [filename for filename, cached_file in files.items() if cached_file.key[0] == source.key[0]]
+        for get_key in (self._get_fingerprint, self._get_digest):
+            if not candidates:
+                break
+            source_key = get_key(font_filename, source)
+            if source_key is None:
+                return []
+            candidates = [filename for filename in candidates if get_key(filename, files[filename]) == source_key]
+
+        return sorted(candidates)
+
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+    def _get_files(self, fonts_filename: Iterable[str]) -> Dict[str, _CachedFile]:
+        """
+        Returns:
+            The cache entry of each font that exists. The entries of the files that changed are reset.
+        """
+        files: Dict[str, _CachedFile] = {}
+        with self._lock:
+            for filename in fonts_filename:
+                key = FontDuplicatesFinder._get_file_key(filename)
+                if key is None:
+                    self._cache.pop(filename, None)
+                    continue
+
+                cached_file = self._cache.get(filename)
+                if cached_file is None or cached_file.key != key:
+                    cached_file = self._cache[filename] = _CachedFile(key)
+                files[filename] = cached_file
+
+        return files
+
+
+    @staticmethod
+    def _get_file_key(filename: str) -> Optional["FileKey"]:
+        try:
+            file_stat = os.stat(filename)
+        except OSError:
+            return None
+
+        return file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino, file_stat.st_dev
+
+
+    @staticmethod
+    def _split(groups: List[List[str]], get_key: Callable[[str], Optional[Hashable]]) -> List[List[str]]:
+        """
+        Returns:
+            The groups split by the key of their files, without the groups of 1 file. The files whose key is None are dropped.
+        """
+        new_groups: List[List[str]] = []
+        for group in groups:
+            files_by_key: Dict[Hashable, List[str]] = {}
+            for filename in group:
+                key = get_key(filename)
+                if key is not None:
+                    files_by_key.setdefault(key, []).append(filename)
+            new_groups.extend(new_group for new_group in files_by_key.values() if len(new_group) > 1)
+
+        return new_groups
+
+
+    @staticmethod
+    def _get_fingerprint(filename: str, cached_file: _CachedFile) -> Optional[bytes]:
+        if cached_file.fingerprint is None:
+            cached_file.fingerprint = FontDuplicatesFinder._read_file(filename, Sfnt.read_fingerprint)
+        return cached_file.fingerprint
+
+
+    @staticmethod
+    def _get_digest(filename: str, cached_file: _CachedFile) -> Optional[bytes]:
+        if cached_file.digest is None:
+            # hashlib releases the GIL while it reads the mmap, and the pages are read by the kernel without a copy.
+            cached_file.digest = FontDuplicatesFinder._read_file(filename, lambda buffer: hashlib.sha256(buffer).digest())
+        return cached_file.digest
+
+
+    @staticmethod
+    def _read_file(filename: str, read: Callable[[mmap], bytes]) -> Optional[bytes]:
+        """
+        Returns:
+            The result of read on the content of the file, or None if the file cannot be read.
+        """
+        try:
+            with open(filename, "rb") as file:
+                # An empty file cannot be mapped.
+                if os.fstat(file.fileno()).st_size == 0:
+                    return b""
+                with mmap(file.fileno(), 0, access=ACCESS_READ) as buffer:
+                    return read(buffer)
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,38 @@
+from typing import NamedTuple, Optional
+
+__all__ = [
+    "FontFilter",
+    "SPACING",
+]
+
+
+class SPACING:
+    # https://fontconfig.pages.freedesktop.org/fontconfig/fontconfig-devel/x19.html
+    PROPORTIONAL = 0
+    DUAL = 90
+    MONO = 100
+    CHARCELL = 110
+
+
+class FontFilter(NamedTuple):
+    """
+    The criteria that the fonts must match. A criterion that is None isn't checked.
+
+    The filters are hashable, so the result of each filter is cached with the snapshot of the installed fonts.
+
+    Attributes:
+        family (Optional[str]): A family name. Like fontconfig, the case and the spaces are ignored.
+        style (Optional[str]): A style name, like "Bold Italic".
+        lang (Optional[str]): A language the font supports, like "fr" or "zh-tw".
+        spacing (Optional[int]): A SPACING value, like SPACING.MONO.
+        min_weight (Optional[int]): The minimum weight, like 100 for thin. It uses the OpenType scale, like FontInfo.weight.
+        max_weight (Optional[int]): The maximum weight, like 900 for black.
+        directory (Optional[str]): Only the fonts of this directory and its subdirectories.
+    """
+    family: Optional[str] = None
+    style: Optional[str] = None
+    lang: Optional[str] = None
+    spacing: Optional[int] = None
+    min_weight: Optional[int] = None
+    max_weight: Optional[int] = None
+    directory: Optional[str] = None
@@ -0,0 +1,60 @@
+from .font_info import FontInfo
+from .sfnt import NAME_ID
+from typing import Dict, Iterable, List, Optional
+
+__all__ = ["FontNameIndex"]
+
+
+class FontNameIndex:
+    """
+    A hash index from the names of the fonts to the fonts.
+
+    Every localized variant of the family, typographic family, full and PostScript names is indexed,
+    case-folded, so a lookup is a single dict access whatever the language of the requested name.
+    Building the index reads the name table of every font, so it is built once per snapshot.
+    """
+    __slots__ = ("_fonts_by_name",)
+
+    INDEXED_NAME_IDS = (NAME_ID.FAMILY, NAME_ID.TYPOGRAPHIC_FAMILY, NAME_ID.FULL_NAME, NAME_ID.POSTSCRIPT_NAME)
+    DEFAULT_WEIGHT = 400
+
+    def __init__(self, fonts: Iterable[FontInfo]) -> None:
+        fonts_by_name: Dict[str, List[FontInfo]] = {}
+
+        # The fonts are sorted, so the same font wins between two builds when two fonts are as good.
+        for font in sorted(fonts, key=lambda font: (font.filename, font.face_index)):
+            keys = {FontNameIndex.get_key(name) for name_id in FontNameIndex.INDEXED_NAME_IDS for name in font.get_localized_names(name_id)}
+            for key in keys:
+                fonts_by_name.setdefault(key, []).append(font)
+
+        self._fonts_by_name = fonts_by_name
+
+
+    @staticmethod
+    def get_key(name: str) -> str:
+        return name.strip().casefold()
+
+
+    def find(self, name: str, weight: Optional[int] = None, italic: Optional[bool] = None) -> Optional[FontInfo]:
+        """
+        Parameters:
+            name (str): A family name, a full name or a PostScript name, in any language the font provides.
+            weight (Optional[int]): The preferred weight, like 700 for bold. If None, the regular weight is preferred.
+            italic (Optional[bool]): If an italic font is preferred. If None, a non-italic font is preferred.
+        Returns:
+            The font with this name, or None if no font has this name. The weight and the italic aren't filters:
+            when many fonts have this name, the one with the preferred italic is returned first, then the one with the closest weight.
+        """
+        fonts = self._fonts_by_name.get(FontNameIndex.get_key(name))
+        if not fonts:
+            return None
+        if len(fonts) == 1:
+            return fonts[0]
+
+        target_weight = FontNameIndex.DEFAULT_WEIGHT if weight is None else weight
+        target_italic = bool(italic)
+
+        return min(fonts, key=lambda font: (
+            bool(font.italic) != target_italic,
+            abs((FontNameIndex.DEFAULT_WEIGHT if font.weight is None else font.weight) - target_weight),
+        ))
@@ -0,0 +1,110 @@
+from .sfnt import NAME_ID, Sfnt, SfntInfo
+from typing import Dict, List, Optional
+
+__all__ = ["FontInfo"]
+
+
+class FontInfo:
+    """
+    A font installed on the system.
+
+    Creating a FontInfo doesn't read the font file. The names and the style are read from the
+    name, OS/2 and head tables the first time one of them is accessed, and then kept.
+
+    Attributes:
+        filename (str): The font filename.
+        face_index (int): The index of the font in a collection (.ttc/.otc), otherwise 0.
+    """
+    __slots__ = ("filename", "face_index", "_names", "_weight", "_italic")
+
+    NAME_IDS = (NAME_ID.FAMILY, NAME_ID.SUBFAMILY, NAME_ID.FULL_NAME, NAME_ID.POSTSCRIPT_NAME, NAME_ID.TYPOGRAPHIC_FAMILY)
+
+    def __init__(self, filename: str, face_index: int = 0) -> None:
+        self.filename = filename
+        self.face_index = face_index
+        self._names: Optional[Dict[int, List[str]]] = None
+        self._weight: Optional[int] = None
+        self._italic: Optional[bool] = None
+
+
+    @property
+    def family_name(self) -> Optional[str]:
+        return self._get_name(NAME_ID.FAMILY)
+
+
+    @property
+    def subfamily_name(self) -> Optional[str]:
+        return self._get_name(NAME_ID.SUBFAMILY)
+
+
+    @property
+    def full_name(self) -> Optional[str]:
+        return self._get_name(NAME_ID.FULL_NAME)
+
+
+    @property
+    def postscript_name(self) -> Optional[str]:
+        return self._get_name(NAME_ID.POSTSCRIPT_NAME)
+
+
+    @property
+    def weight(self) -> Optional[int]:
+        """
+        The weight of the font, like 400 for regular and 700 for bold.
+        """
+        self._load()
+        return self._weight
+
+
+    @property
+    def italic(self) -> Optional[bool]:
+        """
+        True if the font is italic or oblique.
+        """
+        self._load()
+        return self._italic
+
+
+    def get_localized_names(self, name_id: int) -> List[str]:
+        """
+        Parameters:
+            name_id (int): A name ID of the name table, like NAME_ID.FAMILY.
+                Only the names of FontInfo.NAME_IDS are read.
+        Returns:
+            All the localized variants of the name, the preferred one first.
+        """
+        self._load()
+        return list(self._names.get(name_id, ()))
+
+
+    def _get_name(self, name_id: int) -> Optional[str]:
+        self._load()
+        names = self._names.get(name_id)
+        return names[0] if names else None
+
+
+    def _load(self) -> None:
+        # The font never changes once read, so reading it twice in a race is harmless.
+        if self._names is None:
+            self._set_info(Sfnt.read_file_info(self.filename, FontInfo.NAME_IDS, self.face_index))
+
+
+    def _set_info(self, info: SfntInfo) -> None:
+        self._weight = info.weight
+        self._italic = info.italic
+        # _names is set last, since it marks the font as read.
+        self._names = info.names
+
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FontInfo):
+            return NotImplemented
+        return self.filename == other.filename and self.face_index == other.face_index
+
+
+    def __hash__(self) -> int:
+        return hash((self.filename, self.face_index))
+
+
+    def __repr__(self) -> str:
+        return f"FontInfo(filename={self.filename!r}, face_index={self.face_index})"
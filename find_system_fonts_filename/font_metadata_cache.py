@@ -0,0 +1,275 @@
+import json
+import logging
+import os
+import sys
+from .font_info import FontInfo
+from .sfnt import Sfnt, SfntInfo
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import sqlite3
+except ImportError:
+    # Some Python builds don't have the sqlite3 module. The metadata is then always read from the fonts.
+    sqlite3 = None
+
+__all__ = ["FontMetadataCache"]
+
+_logger = logging.getLogger(__name__)
+
+FileKey = Tuple[int, int, int, int]  # size, mtime_ns, inode, device
+
+
+def get_user_cache_dir() -> str:
+    """
+    Returns:
+        The directory where the user cache files are stored on this OS.
+    """
+    if sys.platform == "win32":
+        return os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    # https://specifications.freedesktop.org/basedir-spec/latest/
+    return os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+
+class FontMetadataCache:
+    """
+    A persistent SQLite cache of the names and the style of the fonts.
+
+    Each font is keyed by its path and face index, and is only read again when the size,
+    the mtime, the inode or the device of its file changed.
+    The database is in WAL mode, so the processes that read it are never blocked by a process
+    which updates it, and each update is done in one transaction.
+    """
+
+    # Increase it when the stored metadata changes. The cache is then rebuilt.
+    SCHEMA_VERSION = 1
+    # The number of paths of each SELECT, which stays under the oldest default SQLITE_MAX_VARIABLE_NUMBER (999).
+    QUERY_CHUNK_SIZE = 500
+    # The minimum number of seconds between two prunes done by load.
+    PRUNE_INTERVAL = 3600
+
+    _default: Optional["FontMetadataCache"] = None
+    _default_lock = Lock()
+
+    def __init__(self, path: str, timeout: float = 5.0) -> None:
+        """
+        Args:
+            path: The SQLite database filename. Its directory is created if needed.
+            timeout: The number of seconds to wait for another process that is writing to the database.
+        """
+        self.path = path
+        self.timeout = timeout
+        self._last_prune: Optional[float] = None
+
+
+    @staticmethod
+    def get_default() -> "FontMetadataCache":
+        """
+        Returns:
+            The cache stored in the user cache directory, like ~/.cache/find_system_fonts_filename on Linux.
+        """
+        if FontMetadataCache._default is None:
+            with FontMetadataCache._default_lock:
+                if FontMetadataCache._default is None:
+                    path = os.path.join(get_user_cache_dir(), "find_system_fonts_filename", f"fonts-metadata-{FontMetadataCache.SCHEMA_VERSION}.sqlite")
+                    FontMetadataCache._default = FontMetadataCache(path)
+
+        return FontMetadataCache._default
+
+
+    def load(self, fonts: Iterable[FontInfo]) -> int:
+        """
+        Fill the names and the style of the fonts from the cache.
+        The fonts that aren't in the cache or whose file changed are read and stored in the cache.
+
+        If the database cannot be used, the fonts are read without the cache.
+
+        Parameters:
+            fonts (Iterable[FontInfo]): The fonts.
+        Returns:
+            The number of fonts that have been read from their file.
+        """
+        files_key: Dict[FontInfo, Optional[FileKey]] = {font: FontMetadataCache._get_file_key(font.filename) for font in fonts}
+
+        if sqlite3 is None:
+            return FontMetadataCache._read_fonts(files_key)
+
+        try:
+            connection = self._connect()
+        except (OSError, sqlite3.Error) as exception:
+            _logger.warning("The fonts metadata cache \"%s\" cannot be opened: %s", self.path, exception)
+            return FontMetadataCache._read_fonts(files_key)
+
+        try:
+            cached_rows = FontMetadataCache._select_rows(connection, {font.filename for font in files_key})
+
+            new_rows: List[tuple] = []
+            for font, file_key in files_key.items():
+                cached_row = cached_rows.get((font.filename, font.face_index))
+                if file_key is not None and cached_row is not None and cached_row[0] == file_key:
+                    font._set_info(FontMetadataCache._decode_metadata(cached_row[1]))
+                    continue
+
+                font._set_info(Sfnt.read_file_info(font.filename, FontInfo.NAME_IDS, font.face_index))
+                if file_key is not None:
+                    new_rows.append((font.filename, font.face_index, *file_key, FontMetadataCache._encode_metadata(font)))
+
+            if new_rows:
+                with FontMetadataCache._write_transaction(connection):
+                    connection.executemany("INSERT OR REPLACE INTO fonts VALUES (?, ?, ?, ?, ?, ?, ?)", new_rows)
+
+                # The installed fonts changed, so some fonts may have been deleted. Pruning reads the whole table, so it is only done once in a while.
+                if self._last_prune is None or monotonic() - self._last_prune >= FontMetadataCache.PRUNE_INTERVAL:
+                    self._prune(connection)
+
+            return len(new_rows) + sum(1 for file_key in files_key.values() if file_key is None)
+        except sqlite3.Error as exception:
+            _logger.warning("The fonts metadata cache \"%s\" cannot be used: %s", self.path, exception)
+            return FontMetadataCache._read_fonts(files_key)
+        finally:
+            connection.close()
+
+
+    def prune(self) -> int:
+        """
+        Remove the rows of the fonts whose file has been deleted.
+        load already does it at most once per PRUNE_INTERVAL, when it stores new fonts.
+
+        Returns:
+            The number of removed rows.
+        """
+        if sqlite3 is None:
+            return 0
+
+        try:
+            connection = self._connect()
+        except (OSError, sqlite3.Error) as exception:
+            _logger.warning("The fonts metadata cache \"%s\" cannot be opened: %s", self.path, exception)
+            return 0
+
+        try:
+            return self._prune(connection)
+        except sqlite3.Error as exception:
+            _logger.warning("The fonts metadata cache \"%s\" cannot be used: %s", self.path, exception)
+            return 0
+        finally:
+            connection.close()
+
+
+    def clear(self) -> None:
+        """
+        Delete the database.
+        """
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+    @staticmethod
+    def _read_fonts(fonts: Iterable[FontInfo]) -> int:
+        count = 0
+        for font in fonts:
+            font._set_info(Sfnt.read_file_info(font.filename, FontInfo.NAME_IDS, font.face_index))
+            count += 1
+        return count
+
+
+    @staticmethod
+    def _select_rows(connection: "sqlite3.Connection", paths: Set[str]) -> Dict[Tuple[str, int], Tuple[FileKey, str]]:
+        """
+        Returns:
+            The file key and the metadata of each face of the paths that is in the cache.
+        """
+        rows = {}
+        paths_list = list(paths)
+        for start in range(0, len(paths_list), FontMetadataCache.QUERY_CHUNK_SIZE):
+            chunk = paths_list[start:start + FontMetadataCache.QUERY_CHUNK_SIZE]
+            # The primary key starts with the path, so each path is an index lookup.
+            for path, face_index, size, mtime_ns, inode, device, metadata in connection.execute(
+                f"SELECT path, face_index, size, mtime_ns, inode, device, metadata FROM fonts WHERE path IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ):
+                rows[(path, face_index)] = ((size, mtime_ns, inode, device), metadata)
+        return rows
+
+
+    def _prune(self, connection: "sqlite3.Connection") -> int:
+        self._last_prune = monotonic()
+        # The fonts of another inventory can share the database, so only the rows of the deleted files are removed.
+        deleted_paths = [
+            (path,) for path, in connection.execute("SELECT DISTINCT path FROM fonts")
+            if not os.path.exists(path)
+        ]
+        if not deleted_paths:
+            return 0
+
+        with FontMetadataCache._write_transaction(connection):
+            return sum(connection.execute("DELETE FROM fonts WHERE path = ?", deleted_path).rowcount for deleted_path in deleted_paths)
+
+
+    def _connect(self) -> "sqlite3.Connection":
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # The transactions are explicit, so the schema changes are also atomic.
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != FontMetadataCache.SCHEMA_VERSION:
+                with FontMetadataCache._write_transaction(connection):
+                    # Another process may have created the table while we were waiting for the lock.
+                    if connection.execute("PRAGMA user_version").fetchone()[0] == FontMetadataCache.SCHEMA_VERSION:
+                        return connection
+                    connection.execute("DROP TABLE IF EXISTS fonts")
+                    connection.execute(
+                        "CREATE TABLE fonts ("
+                        "path TEXT NOT NULL, face_index INTEGER NOT NULL, "
+                        "size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, inode INTEGER NOT NULL, device INTEGER NOT NULL, "
+                        "metadata TEXT NOT NULL, "
+                        "PRIMARY KEY (path, face_index))"
+                    )
+                    connection.execute(f"PRAGMA user_version = {FontMetadataCache.SCHEMA_VERSION}")
+        except BaseException:
+            connection.close()
+            raise
+
+        return connection
+
+
+    @staticmethod
+    @contextmanager
+    def _write_transaction(connection: "sqlite3.Connection") -> Iterator[None]:
+        # BEGIN IMMEDIATE takes the write lock at the beginning, so two writers never conflict in the middle of a transaction.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+    @staticmethod
+    def _get_file_key(filename: str) -> Optional[FileKey]:
+        try:
+            file_stat = os.stat(filename)
+        except OSError:
+            return None
+        return file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino, file_stat.st_dev
+
+
+    @staticmethod
+    def _encode_metadata(font: FontInfo) -> str:
+        return json.dumps({"names": font._names, "weight": font._weight, "italic": font._italic}, ensure_ascii=False, separators=(",", ":"))
+
+
+    @staticmethod
+    def _decode_metadata(metadata: str) -> SfntInfo:
+        values = json.loads(metadata)
+        # The JSON keys are always strings.
+        names = {int(name_id): variants for name_id, variants in values["names"].items()}
+        return SfntInfo(names, values["weight"], values["italic"])
@@ -1,46 +1,238 @@
-import sys
-from os import name
-from pathlib import Path
-from platform import system
-from typing import Set
+from threading import Lock
+from typing import Callable, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+from .backends import get_system_fonts_class
 from .exceptions import OSNotSupported
-from .system_fonts import SystemFonts
+from .install_mode import InstallMode
+from .snapshot import FontsChanges, FontsChangeToken, FontsSnapshot, FontsSnapshotCache
+
+# Only imported for the annotations, so importing this module doesn't import them.
+if TYPE_CHECKING:
+    from pathlib import Path
+    from .font_filter import FontFilter
+    from .font_info import FontInfo
+    from .inventory import FontsInventory
+    from .unix.fonts_watcher import FontsWatcher
 
 __all__ = [
+    "count_system_fonts",
+    "create_fonts_watcher",
+    "find_font_file",
+    "find_installed_copies",
+    "get_system_fonts",
+    "get_system_fonts_changes",
+    "get_system_fonts_duplicates",
+    "get_system_fonts_faces",
     "get_system_fonts_filename",
+    "get_system_fonts_inventory",
+    "get_system_fonts_snapshot",
     "install_font",
+    "install_fonts",
+    "invalidate_system_fonts_cache",
+    "iter_system_fonts_filename",
     "uninstall_font",
+    "uninstall_fonts",
+    "warm_up_system_fonts_cache",
 ]
 
+_snapshot_cache: Optional[FontsSnapshotCache] = None
+_snapshot_cache_lock = Lock()
+
+
+def _get_snapshot_cache() -> FontsSnapshotCache:
+    global _snapshot_cache
 
-def get_system_fonts_class() -> SystemFonts:
-    system_name = system()
+    system_fonts = get_system_fonts_class()
+    snapshot_cache = _snapshot_cache
+    # When another backend has been registered, the snapshots of the previous one are discarded.
+    if snapshot_cache is None or snapshot_cache.system_fonts is not system_fonts:
+        with _snapshot_cache_lock:
+            if _snapshot_cache is None or _snapshot_cache.system_fonts is not system_fonts:
+                _snapshot_cache = FontsSnapshotCache(system_fonts)
+            snapshot_cache = _snapshot_cache
 
-    if system_name == "Windows":
-        from .windows import WindowsFonts
-        return WindowsFonts
+    return snapshot_cache
 
-    elif system_name == "Darwin":
-        from .mac import MacFonts
-        return MacFonts
 
-    elif name == "posix":
-        if hasattr(sys, "getandroidapilevel"):
-            from .android import AndroidFonts
-            return AndroidFonts
-        else:
-            from .unix import UnixFonts
-            return UnixFonts
+def get_system_fonts_filename(font_filter: Optional["FontFilter"] = None) -> Set[str]:
+    """
+    Args:
+        font_filter: If set, only the fonts that match it are returned. Filtering is only supported on Linux,
+            where fontconfig does it while it lists the fonts.
+    Returns:
+        A new set of all the installed fonts filename. It comes from the process-wide snapshot,
+        so it is only rebuilt when the installed fonts have changed. The result of each filter is also cached with the snapshot.
+    """
+    if font_filter is None:
+        return set(get_system_fonts_snapshot().fonts_filename)
+    return {font_filename for font_filename, _ in _get_filtered_fonts_faces(font_filter)}
 
+
+def iter_system_fonts_filename() -> Iterator[str]:
+    """Yield the installed fonts filename, each one once
+
+    If the process-wide snapshot is up to date, its filenames are yielded. Otherwise, the fonts are
+    yielded while they are enumerated, so the first ones are available before the enumeration ends.
+    Close the generator (or leave the for loop) to stop the enumeration early.
+    """
+    snapshot = _get_snapshot_cache().get_if_up_to_date()
+    if snapshot is not None:
+        yield from snapshot.fonts_filename
     else:
-        raise OSNotSupported(f"FindSystemFontsFilename only works on Windows, Mac, Unix and Android. You are currently on \"{system_name}\".")
+        yield from get_system_fonts_class().iter_system_fonts_filename()
+
+
+def count_system_fonts() -> int:
+    """
+    Returns:
+        The number of installed fonts filename. On Linux, the filenames aren't decoded and no set of str is built.
+    """
+    snapshot = _get_snapshot_cache().get_if_up_to_date()
+    if snapshot is not None:
+        return len(snapshot.fonts_filename)
+    return get_system_fonts_class().count_system_fonts()
+
+
+def get_system_fonts_inventory() -> "FontsInventory":
+    """
+    Returns:
+        The installed fonts filename in a compact immutable set, shared until the installed fonts change.
+        Each font has an integer ID which is stable for a given set of fonts, so an index can store the IDs instead of the filenames.
+        The inventory is stored next to the set of get_system_fonts_filename, it doesn't replace it.
+    """
+    return get_system_fonts_snapshot().get_inventory()
+
+
+def get_system_fonts_duplicates() -> List[Tuple[str, ...]]:
+    """
+    Returns:
+        The groups of installed fonts that have the same content, like a font that is both in /usr/share/fonts and ~/.local/share/fonts.
+        Each group is sorted and contains at least 2 fonts. See FontDuplicatesFinder.
+    """
+    from .duplicates import FontDuplicatesFinder
+    return FontDuplicatesFinder.get_default().find_duplicates(get_system_fonts_inventory())
 
 
-def get_system_fonts_filename() -> Set[str]:
-    return get_system_fonts_class().get_system_fonts_filename()
+def find_installed_copies(font_filename: "Path") -> List[str]:
+    """
+    Returns:
+        The sorted installed fonts filename that have the same content as the font.
+        On Linux, install_font copies the font, so it finds the installed copy.
+    """
+    if not font_filename.is_file():
+        raise FileNotFoundError(f"The file \"{font_filename}\" doesn't exist")
+
+    from .duplicates import FontDuplicatesFinder
+    return FontDuplicatesFinder.get_default().find_copies(str(font_filename.absolute()), get_system_fonts_inventory())
+
+
+def get_system_fonts_faces(font_filter: Optional["FontFilter"] = None) -> Set[Tuple[str, int]]:
+    """
+    Args:
+        font_filter: If set, only the fonts that match it are returned. See get_system_fonts_filename.
+    Returns:
+        A new set with the filename and the face index of each installed font.
+        A collection (.ttc/.otc) has one pair for each of its fonts, so a renderer can open the right face directly.
+    """
+    if font_filter is None:
+        return set(get_system_fonts_snapshot().get_fonts_faces())
+    return set(_get_filtered_fonts_faces(font_filter))
+
 
+def _get_filtered_fonts_faces(font_filter: "FontFilter") -> FrozenSet[Tuple[str, int]]:
+    return get_system_fonts_snapshot().get_filtered_fonts_faces(font_filter, get_system_fonts_class().list_filtered_fonts_faces)
+
+
+def get_system_fonts() -> Set["FontInfo"]:
+    """
+    Returns:
+        A new set with a FontInfo for each installed font, so one for each face of a collection. Listing them costs about the same as
+        get_system_fonts_filename, since a font file is only read when one of its names is accessed.
+    """
+    return set(get_system_fonts_snapshot().get_fonts())
+
+
+def find_font_file(name: str, weight: Optional[int] = None, italic: Optional[bool] = None) -> Optional["FontInfo"]:
+    """Find the installed font with a name
+
+    The first call reads the names of all the installed fonts to build an index.
+    Then, a lookup is a dict access until the installed fonts change.
+
+    Args:
+        name: A family name, a full name or a PostScript name, in any language the font provides. The case is ignored.
+        weight: The preferred weight, like 700 for bold. If None, the regular weight is preferred.
+        italic: If an italic font is preferred. If None, a non-italic font is preferred.
+    Returns:
+        The font (its filename and, for a collection, its face index), or None if no installed font has this name.
+        The weight and the italic are preferences, not filters: if no font with this name is italic, a lookup for an italic font returns a non-italic one.
+    """
+    return get_system_fonts_snapshot().get_name_index().find(name, weight, italic)
 
-def install_font(font_filename: Path, add_font_to_registry: bool = False) -> None:
+
+def get_system_fonts_snapshot() -> FontsSnapshot:
+    """
+    Returns:
+        The process-wide snapshot of the installed fonts. It is revalidated on each call
+        and rebuilt only if it is stale.
+    """
+    return _get_snapshot_cache().get()
+
+
+def get_system_fonts_changes(since: Optional[FontsChangeToken] = None) -> FontsChanges:
+    """Return the fonts that have been installed or uninstalled since a token
+
+    Args:
+        since: A token returned by a previous call. If None, all the installed fonts are reported as added.
+    Returns:
+        The new token with the added and removed fonts filename.
+        When nothing changed, the returned sets are empty and no new set of all the fonts is built.
+    """
+    snapshot = get_system_fonts_snapshot()
+
+    if since is None:
+        return FontsChanges(FontsChangeToken(snapshot), snapshot.fonts_filename, frozenset())
+
+    if since._snapshot is snapshot:
+        return FontsChanges(since, frozenset(), frozenset())
+
+    added, removed = snapshot.get_changes_since(since._snapshot)
+    return FontsChanges(FontsChangeToken(snapshot), added, removed)
+
+
+def create_fonts_watcher(callback: Callable[[FrozenSet[str], FrozenSet[str]], None], debounce_delay: float = 0.1) -> "FontsWatcher":
+    """Create a watcher that calls a callback when fonts are installed or uninstalled
+
+    It is only supported on Linux, since it uses inotify.
+    Call start() on the returned watcher to watch in a thread or start_asyncio() to watch in the running event loop.
+
+    Args:
+        callback: Called with the added and removed fonts filename.
+            It can be a coroutine function only if the watcher is started with start_asyncio().
+        debounce_delay: The number of seconds without any change before the fonts are enumerated again.
+    """
+    from .unix import UnixFonts
+
+    if not issubclass(get_system_fonts_class(), UnixFonts):
+        raise OSNotSupported("Watching the fonts is only supported on Linux.")
+
+    from .unix.fonts_watcher import FontsWatcher
+    return FontsWatcher(callback, debounce_delay)
+
+
+def warm_up_system_fonts_cache() -> None:
+    """
+    Build the process-wide snapshot ahead of time, so the next calls to get_system_fonts_filename are cheap.
+    """
+    _get_snapshot_cache().warm_up()
+
+
+def invalidate_system_fonts_cache() -> None:
+    """
+    Discard the process-wide snapshot. The next call to get_system_fonts_filename will enumerate the fonts again.
+    """
+    _get_snapshot_cache().invalidate()
+
+
+def install_font(font_filename: "Path", add_font_to_registry: bool = False, install_mode: InstallMode = InstallMode.AUTO) -> None:
     """Install a font from its filename
 
     Args:
@@ -48,14 +240,20 @@ def install_font(font_filename: Path, add_font_to_registry: bool = False) -> Non
             This argument is Windows Only.
             It adds the font to the Windows Registry only if the Windows version is 10.0.17083 (also known as version 1803) or later.
             Prior to this version, Windows did not support font registration in the registry.
+        install_mode: How the font is copied in the font directory. See InstallMode.
+            This argument is Linux Only.
+            If a font with the same name and content is already in the install directory, the font isn't copied again.
     """
     if not font_filename.is_file():
         raise FileNotFoundError(f"The file \"{font_filename}\" doesn't exist")
 
-    return get_system_fonts_class().install_font(font_filename, add_font_to_registry)
+    try:
+        return get_system_fonts_class().install_font(font_filename, add_font_to_registry, install_mode)
+    finally:
+        invalidate_system_fonts_cache()
 
 
-def uninstall_font(font_filename: Path, remove_font_in_registry: bool = False) -> None:
+def uninstall_font(font_filename: "Path", remove_font_in_registry: bool = False) -> None:
     """Uninstall a font from its filename
 
     Args:
@@ -68,4 +266,43 @@ def uninstall_font(font_filename: Path, remove_font_in_registry: bool = False) -
     if not font_filename.is_file():
         raise FileNotFoundError(f"The file \"{font_filename}\" doesn't exist")
 
-    return get_system_fonts_class().uninstall_font(font_filename, remove_font_in_registry)
+    try:
+        return get_system_fonts_class().uninstall_font(font_filename, remove_font_in_registry)
+    finally:
+        invalidate_system_fonts_cache()
+
+
+def install_fonts(fonts_filename: Iterable["Path"], add_font_to_registry: bool = False, install_mode: InstallMode = InstallMode.AUTO) -> None:
+    """Install many fonts at once. It is faster than calling install_font for each font.
+    If a font cannot be installed, none of them are.
+
+    Args:
+        add_font_to_registry: Same as in install_font.
+        install_mode: Same as in install_font.
+    """
+    fonts_filename = list(fonts_filename)
+    for font_filename in fonts_filename:
+        if not font_filename.is_file():
+            raise FileNotFoundError(f"The file \"{font_filename}\" doesn't exist")
+
+    try:
+        return get_system_fonts_class().install_fonts(fonts_filename, add_font_to_registry, install_mode)
+    finally:
+        invalidate_system_fonts_cache()
+
+
+def uninstall_fonts(fonts_filename: Iterable["Path"], remove_font_in_registry: bool = False) -> None:
+    """Uninstall many fonts at once. It is faster than calling uninstall_font for each font.
+
+    Args:
+        remove_font_in_registry: Same as in uninstall_font.
+    """
+    fonts_filename = list(fonts_filename)
+    for font_filename in fonts_filename:
+        if not font_filename.is_file():
+            raise FileNotFoundError(f"The file \"{font_filename}\" doesn't exist")
+
+    try:
+        return get_system_fonts_class().uninstall_fonts(fonts_filename, remove_font_in_registry)
+    finally:
+        invalidate_system_fonts_cache()
@@ -0,0 +1,23 @@
+from enum import Enum
+
+__all__ = ["InstallMode"]
+
+
+class InstallMode(Enum):
+    """
+    How install_font puts the font in the font directory. It is only used on Linux.
+
+    AUTO: Try REFLINK, then COPY_FILE_RANGE, then COPY. A mode that the filesystem doesn't support is skipped.
+    REFLINK: Clone the file with the FICLONE ioctl. The installed font shares the blocks of the file until one of them is modified.
+        It needs a filesystem that supports it, like Btrfs, XFS or bcachefs, and both files must be on the same filesystem.
+    HARDLINK: Link the file. The installed font IS the file, so modifying the file also modifies the installed font.
+        It is never chosen by AUTO. Both files must be on the same filesystem.
+    COPY_FILE_RANGE: Copy the file with os.copy_file_range, so the kernel copies the data without passing it through Python.
+        Some filesystems, like NFS, do a server-side copy.
+    COPY: Copy the file with shutil.copyfile.
+    """
+    AUTO = "auto"
+    REFLINK = "reflink"
+    HARDLINK = "hardlink"
+    COPY_FILE_RANGE = "copy_file_range"
+    COPY = "copy"
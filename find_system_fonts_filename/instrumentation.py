@@ -0,0 +1,122 @@
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+
+__all__ = [
+    "add_observer",
+    "remove_observer",
+    "reset_stats",
+    "Span",
+    "stats",
+]
+
+
+class Span(NamedTuple):
+    """
+    A timed phase of an operation, like the FcFontList call of an enumeration.
+
+    Attributes:
+        name (str): The phase, like "unix.font_list". See the README for the list of the phases.
+        start (float): The time.perf_counter() value when the phase started.
+        duration (float): The duration of the phase in seconds.
+        attributes (Dict[str, Any]): Details about the phase, like the number of fonts it returned.
+        failed (bool): True if the phase raised an exception.
+    """
+    name: str
+    start: float
+    duration: float
+    attributes: Dict[str, Any]
+    failed: bool
+
+
+SpanObserver = Callable[[Span], None]
+
+# A tuple replaced on each change, so the spans can iterate the observers without a lock.
+_observers: Tuple[SpanObserver, ...] = ()
+_observers_lock = Lock()
+
+_stats: Dict[str, float] = {}
+_stats_lock = Lock()
+
+
+def add_observer(observer: SpanObserver) -> None:
+    """
+    Call a function with each Span. It is called in the thread that ran the phase,
+    so it should be fast. The exceptions it raises are logged and ignored.
+    """
+    global _observers
+    with _observers_lock:
+        _observers = (*_observers, observer)
+
+
+def remove_observer(observer: SpanObserver) -> None:
+    global _observers
+    with _observers_lock:
+        observers = list(_observers)
+        observers.remove(observer)
+        _observers = tuple(observers)
+
+
+def stats() -> Dict[str, float]:
+    """
+    Returns:
+        A copy of the cumulative counters since the start of the process or the last reset_stats().
+        Each phase has a "span.<name>.count" and a "span.<name>.seconds" counter.
+        All the counters only increase, so they can be exported as Prometheus or OpenTelemetry counters.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def increment(name: str, value: float = 1) -> None:
+    with _stats_lock:
+        _stats[name] = _stats.get(name, 0) + value
+
+
+def span(name: str) -> "_SpanTimer":
+    """
+    Time a phase. Its attributes can be set in the with block:
+
+        with span("unix.font_list") as current_span:
+            ...
+            current_span.attributes["fonts"] = fonts_count
+    """
+    return _SpanTimer(name)
+
+
+class _SpanTimer():
+    __slots__ = ("name", "attributes", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.attributes: Dict[str, Any] = {}
+        self.start = 0.0
+
+
+    def __enter__(self) -> "_SpanTimer":
+        self.start = perf_counter()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        duration = perf_counter() - self.start
+
+        with _stats_lock:
+            _stats[f"span.{self.name}.count"] = _stats.get(f"span.{self.name}.count", 0) + 1
+            _stats[f"span.{self.name}.seconds"] = _stats.get(f"span.{self.name}.seconds", 0) + duration
+
+        observers = _observers
+        if observers:
+            completed_span = Span(self.name, self.start, duration, self.attributes, exc_type is not None)
+            for observer in observers:
+                try:
+                    observer(completed_span)
+                except Exception:
+                    # Imported here since logging is slow to import, and this module is imported by the enumeration.
+                    import logging
+                    logging.getLogger(__name__).exception("The observer %r failed", observer)
@@ -0,0 +1,286 @@
+import os
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Set
+from mmap import mmap
+from struct import Struct
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from .exceptions import FindSystemFontsFilenameException
+
+__all__ = ["FontsInventory"]
+
+Buffer = Union[bytes, mmap]
+
+
+class FontsInventory(Set):
+    """
+    An immutable set of fonts filename stored compactly.
+
+    The directories are stored once in a table, and the filenames (without their directory) are
+    encoded in utf-8 in a single bytes buffer, so a font costs a few bytes more than the length
+    of its filename instead of a str object and a set entry.
+
+    The fonts are sorted by directory and filename, and each one has an ID: its position in this order.
+    So the same fonts always have the same IDs, and an index can store the IDs instead of the filenames.
+
+    It supports the operations of a read-only set, like `in`, `len`, iteration and the comparisons with other sets.
+    """
+    __slots__ = ("_directories", "_directory_offsets", "_directory_starts", "_names", "_name_offsets", "_buffer")
+
+    # The utf-8 error handler that can encode and decode any str, like the lone surrogates of os.fsdecode.
+    ENCODING_ERRORS = "surrogatepass"
+
+    # The binary layout written by write: the header, then the 5 tables, each one padded to a multiple of 8 bytes.
+    # The offsets are stored in the native byte order, so the file is only read on the machine that wrote it.
+    MAGIC = b"FSFI"
+    FORMAT_VERSION = 1
+    HEADER = Struct("<4sHBBQ5Q")  # magic, format version, byte order, offset size, generation, length of each table
+    BYTE_ORDERS = {"little": 0, "big": 1}
+    ALIGNMENT = 8
+
+    def __init__(self, fonts_filename: Iterable[str] = ()) -> None:
+        names_by_directory: Dict[bytes, set] = {}
+        for font_filename in fonts_filename:
+            name = os.path.basename(font_filename)
+            # The directory keeps its trailing separator, so the filename is always directory + name.
+            directory = font_filename[:len(font_filename) - len(name)]
+            names_by_directory.setdefault(FontsInventory._encode(directory), set()).add(FontsInventory._encode(name))
+
+        # The utf-8 bytes are in the same order as the code points, so the IDs follow the order of the filenames.
+        # The directory i is _directories[_directory_offsets[i]:_directory_offsets[i + 1]].
+        self._directory_offsets = array("I", [0])
+        # The fonts of the directory i have the IDs from _directory_starts[i] to _directory_starts[i + 1] - 1.
+        self._directory_starts = array("I", [0])
+        # The name of the font i is _names[_name_offsets[i]:_name_offsets[i + 1]].
+        self._name_offsets = array("I", [0])
+
+        directories = bytearray()
+        names = bytearray()
+        for directory in sorted(names_by_directory):
+            directories += directory
+            self._directory_offsets.append(len(directories))
+            for name in sorted(names_by_directory[directory]):
+                names += name
+                self._name_offsets.append(len(names))
+            self._directory_starts.append(len(self._name_offsets) - 1)
+
+        self._directories = bytes(directories)
+        self._names = bytes(names)
+        self._buffer: Optional[Buffer] = None
+
+
+    def write(self, file: BinaryIO, generation: int = 0) -> None:
+        """
+        Write the tables of the inventory, so another process can load it with from_buffer without rebuilding it.
+
+        Parameters:
+            file (BinaryIO): A file opened in binary mode.
+            generation (int): A number stored with the tables, like a counter increased each time the fonts changed.
+        """
+        tables = [memoryview(table) for table in self._get_tables()]
+        file.write(FontsInventory.HEADER.pack(
+            FontsInventory.MAGIC, FontsInventory.FORMAT_VERSION, FontsInventory.BYTE_ORDERS[sys.byteorder],
+            tables[1].itemsize, generation, *(table.nbytes for table in tables)
+        ))
+        for table in tables:
+            file.write(table)
+            file.write(b"\0" * (-table.nbytes % FontsInventory.ALIGNMENT))
+
+
+    @staticmethod
+    def from_buffer(buffer: Buffer) -> Tuple["FontsInventory", int]:
+        """
+        Load an inventory written by write. The inventory reads its tables directly from the buffer,
+        so loading it from an mmap doesn't copy them, and the processes that map the same file share its memory.
+
+        Parameters:
+            buffer (Union[bytes, mmap]): The content written by write. It must not change while the inventory is used.
+        Returns:
+            The inventory and its generation.
+        """
+        generation, tables_length = FontsInventory._read_header(buffer)
+
+        view = memoryview(buffer)
+        tables = []
+        offset = FontsInventory.HEADER.size
+        for table_length in tables_length:
+            if offset + table_length > len(buffer):
+                raise FindSystemFontsFilenameException("The inventory buffer is truncated.")
+            tables.append(view[offset:offset + table_length])
+            offset += table_length + (-table_length % FontsInventory.ALIGNMENT)
+
+        inventory = FontsInventory.__new__(FontsInventory)
+        directories, directory_offsets, directory_starts, names, name_offsets = tables
+        inventory._directories = directories
+        inventory._directory_offsets = directory_offsets.cast("I")
+        inventory._directory_starts = directory_starts.cast("I")
+        inventory._names = names
+        inventory._name_offsets = name_offsets.cast("I")
+        # The memoryviews already keep the buffer alive, but an mmap is only closed when the inventory is collected.
+        inventory._buffer = buffer
+        return inventory, generation
+
+
+    @staticmethod
+    def read_generation(buffer: Buffer) -> int:
+        """
+        Parameters:
+            buffer (Union[bytes, mmap]): The content written by write, or only its first HEADER.size bytes.
+        Returns:
+            The generation of the inventory.
+        """
+        return FontsInventory._read_header(buffer)[0]
+
+
+    @staticmethod
+    def _read_header(buffer: Buffer) -> Tuple[int, List[int]]:
+        """
+        Returns:
+            The generation and the length of each table.
+        """
+        if len(buffer) < FontsInventory.HEADER.size:
+            raise FindSystemFontsFilenameException("The inventory buffer is truncated.")
+
+        magic, format_version, byte_order, offset_size, generation, *tables_length = FontsInventory.HEADER.unpack_from(buffer, 0)
+        if magic != FontsInventory.MAGIC or format_version != FontsInventory.FORMAT_VERSION:
+            raise FindSystemFontsFilenameException(f"The buffer isn't an inventory of the version {FontsInventory.FORMAT_VERSION}.")
+        if byte_order != FontsInventory.BYTE_ORDERS[sys.byteorder] or offset_size != array("I").itemsize:
+            raise FindSystemFontsFilenameException("The inventory has been written on another architecture.")
+
+        return generation, tables_length
+
+
+    def _get_tables(self) -> Tuple[Union[bytes, array, memoryview], ...]:
+        return (self._directories, self._directory_offsets, self._directory_starts, self._names, self._name_offsets)
+
+
+    @property
+    def directories(self) -> Tuple[str, ...]:
+        """
+        The directories of the fonts, sorted, with their trailing separator.
+        """
+        return tuple(self._get_directory(directory_id) for directory_id in range(len(self._directory_starts) - 1))
+
+
+    def get_id(self, font_filename: str) -> Optional[int]:
+        """
+        Returns:
+            The ID of the font, or None if it isn't in the inventory.
+        """
+        if not isinstance(font_filename, str):
+            return None
+
+        name = os.path.basename(font_filename)
+        directory_id = FontsInventory._search(
+            self._directories, self._directory_offsets,
+            FontsInventory._encode(font_filename[:len(font_filename) - len(name)]),
+            0, len(self._directory_starts) - 1
+        )
+        if directory_id is None:
+            return None
+
+        return FontsInventory._search(
+            self._names, self._name_offsets,
+            FontsInventory._encode(name),
+            self._directory_starts[directory_id], self._directory_starts[directory_id + 1]
+        )
+
+
+    def get_filename(self, font_id: int) -> str:
+        """
+        Returns:
+            The filename of the font with this ID.
+        """
+        if not 0 <= font_id < len(self):
+            raise IndexError(f"The font ID {font_id} isn't in the inventory.")
+
+        directory_id = bisect_right(self._directory_starts, font_id) - 1
+        return self._get_directory(directory_id) + FontsInventory._decode(self._get_name(font_id))
+
+
+    def get_directory_fonts(self, directory: str) -> List[str]:
+        """
+        Parameters:
+            directory (str): A directory, with its trailing separator like in directories.
+        Returns:
+            The filename of the fonts directly in this directory.
+        """
+        directory_id = FontsInventory._search(self._directories, self._directory_offsets, FontsInventory._encode(directory), 0, len(self._directory_starts) - 1)
+        if directory_id is None:
+            return []
+        return [
+            directory + FontsInventory._decode(self._get_name(font_id))
+            for font_id in range(self._directory_starts[directory_id], self._directory_starts[directory_id + 1])
+        ]
+
+
+    @staticmethod
+    def _search(buffer: Union[bytes, memoryview], offsets: Sequence[int], value: bytes, low: int, high: int) -> Optional[int]:
+        """
+        Returns:
+            The index of the value between low and high in a buffer of sorted values, or None if it isn't there.
+        """
+        while low < high:
+            middle = (low + high) // 2
+            middle_value = bytes(buffer[offsets[middle]:offsets[middle + 1]])
+            if middle_value < value:
+                low = middle + 1
+            elif middle_value > value:
+                high = middle
+            else:
+                return middle
+
+        return None
+
+
+    @staticmethod
+    def _encode(string: str) -> bytes:
+        return string.encode("utf-8", FontsInventory.ENCODING_ERRORS)
+
+
+    @staticmethod
+    def _decode(encoded: bytes) -> str:
+        return encoded.decode("utf-8", FontsInventory.ENCODING_ERRORS)
+
+
+    def _get_directory(self, directory_id: int) -> str:
+        return FontsInventory._decode(bytes(self._directories[self._directory_offsets[directory_id]:self._directory_offsets[directory_id + 1]]))
+
+
+    def _get_name(self, font_id: int) -> bytes:
+        return bytes(self._names[self._name_offsets[font_id]:self._name_offsets[font_id + 1]])
+
+
+    def __contains__(self, font_filename: object) -> bool:
+        return self.get_id(font_filename) is not None
+
+
+    def __iter__(self) -> Iterator[str]:
+        for directory_id in range(len(self._directory_starts) - 1):
+            directory = self._get_directory(directory_id)
+            for font_id in range(self._directory_starts[directory_id], self._directory_starts[directory_id + 1]):
+                yield directory + FontsInventory._decode(self._get_name(font_id))
+
+
+    def __len__(self) -> int:
+        return len(self._name_offsets) - 1
+
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FontsInventory):
+            # Two inventories of the same fonts have the same tables.
+            # The tables are compared as memoryviews, since the ones loaded by from_buffer are memoryviews.
+            return all(
+                memoryview(table) == memoryview(other_table)
+                for table, other_table in zip(self._get_tables(), other._get_tables())
+            )
+        return super().__eq__(other)
+
+
+    def __hash__(self) -> int:
+        return self._hash()
+
+
+    def __repr__(self) -> str:
+        return f"FontsInventory({len(self)} fonts in {len(self._directory_starts) - 1} directories)"
@@ -5,6 +5,7 @@ from ctypes import byref, c_uint32, c_void_p, create_string_buffer
 from pathlib import Path
 from typing import Set
 from ..exceptions import FindSystemFontsFilenameException, OSNotSupported, SystemApiError
+from ..install_mode import InstallMode
 from ..system_fonts import SystemFonts
 
 __all__ = ["MacFonts"]
@@ -60,7 +61,7 @@ class MacFonts(SystemFonts):
         return fonts_filename
 
 
-    def install_font(font_filename: Path, windows_flags: bool) -> None:
+    def install_font(font_filename: Path, windows_flags: bool, install_mode: InstallMode) -> None:
         if not MacVersionHelpers.is_mac_version_or_greater(10, 6):
             raise OSNotSupported("FindSystemFontsFilename only works on Mac 10.6 or more")
 
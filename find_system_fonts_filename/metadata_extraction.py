@@ -0,0 +1,126 @@
+import os
+import sys
+from .exceptions import OSNotSupported
+from .font_info import FontInfo
+from .sfnt import Sfnt
+from concurrent.futures import Executor, FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from mmap import mmap, ACCESS_READ
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+__all__ = [
+    "extract_metadata",
+    "FontMetadata",
+]
+
+
+class FontMetadata(NamedTuple):
+    """
+    Attributes:
+        filename (str): The font filename.
+        face_index (int): The index of the font in a collection (.ttc/.otc), otherwise 0.
+        names (Dict[int, List[str]]): All the variants of each name of FontInfo.NAME_IDS, the preferred one first.
+        weight (Optional[int]): The weight of the font, like 400 for regular and 700 for bold.
+        italic (Optional[bool]): True if the font is italic or oblique.
+        error (Optional[str]): If the file or the face couldn't be read, the reason. The other fields are then empty.
+    """
+    filename: str
+    face_index: int
+    names: Dict[int, List[str]]
+    weight: Optional[int]
+    italic: Optional[bool]
+    error: Optional[str] = None
+
+
+def extract_metadata(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    backend: str = "thread",
+    chunk_size: int = 32
+) -> Iterator[FontMetadata]:
+    """Read the names and the style of many fonts in parallel
+
+    The paths are consumed lazily and sent to the workers by chunks. At most 2 chunks per worker
+    are in flight, so the memory stays bounded whatever the number of fonts, and each worker
+    only has one font file open at a time.
+
+    Args:
+        paths: The fonts filename, like the result of get_system_fonts_filename().
+        workers: The number of threads or processes. If None, the number of CPUs.
+        backend: "thread" or "process". The threads are enough when the files are slow to read
+            (like on a network share), the processes also parallelize the parsing.
+            On Android, the "process" backend raises OSNotSupported, since multiprocessing doesn't work there.
+        chunk_size: The number of files sent to a worker at once.
+    Returns:
+        An iterator of the metadata of each face, in the order the chunks complete.
+        A file that cannot be read yields one FontMetadata with its error instead of raising,
+        and so does each face of a collection that cannot be read.
+    """
+    if backend == "thread":
+        executor_class = ThreadPoolExecutor
+    elif backend == "process":
+        if hasattr(sys, "getandroidapilevel"):
+            raise OSNotSupported("The \"process\" backend isn't supported on Android, use the \"thread\" backend.")
+        executor_class = ProcessPoolExecutor
+    else:
+        raise ValueError(f"The backend must be \"thread\" or \"process\", not \"{backend}\".")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("The number of workers and the chunk size must be at least 1.")
+
+    paths_iterator = iter(paths)
+    max_pending_chunks = 2 * workers
+
+    with executor_class(max_workers=workers) as executor:
+        pending: Set[Future] = set()
+        try:
+            _submit_chunks(executor, paths_iterator, chunk_size, max_pending_chunks, pending)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+                _submit_chunks(executor, paths_iterator, chunk_size, max_pending_chunks, pending)
+        finally:
+            # When the caller stops iterating, don't wait for the chunks that haven't started.
+            for future in pending:
+                future.cancel()
+
+
+def _submit_chunks(executor: Executor, paths: Iterator[str], chunk_size: int, max_pending_chunks: int, pending: Set[Future]) -> None:
+    while len(pending) < max_pending_chunks:
+        chunk = list(islice(paths, chunk_size))
+        if not chunk:
+            return
+        pending.add(executor.submit(_extract_chunk, chunk))
+
+
+def _extract_chunk(paths: List[str]) -> List[FontMetadata]:
+    # It is a module function, so it can be pickled for the process pool.
+    results = []
+    for path in paths:
+        results.extend(_extract_file(path))
+    return results
+
+
+def _extract_file(filename: str) -> List[FontMetadata]:
+    try:
+        with open(filename, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as buffer:
+            return [_extract_face(filename, buffer, face_index) for face_index in range(Sfnt.get_faces_count(buffer))]
+    except Sfnt.READ_ERRORS as exception:
+        return [_get_error_metadata(filename, 0, exception)]
+
+
+def _extract_face(filename: str, buffer: mmap, face_index: int) -> FontMetadata:
+    # A broken face of a collection doesn't prevent the other faces from being read.
+    try:
+        names = Sfnt.read_names(buffer, FontInfo.NAME_IDS, face_index)
+        weight, italic = Sfnt.read_style(buffer, face_index)
+    except Sfnt.READ_ERRORS as exception:
+        return _get_error_metadata(filename, face_index, exception)
+    return FontMetadata(filename, face_index, names, weight, italic)
+
+
+def _get_error_metadata(filename: str, face_index: int, exception: Exception) -> FontMetadata:
+    return FontMetadata(filename, face_index, {}, None, None, f"{type(exception).__name__}: {exception}")
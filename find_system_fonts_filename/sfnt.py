@@ -0,0 +1,300 @@
+import zlib
+from mmap import mmap, ACCESS_READ
+from struct import error as StructError, Struct
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+__all__ = [
+    "NAME_ID",
+    "Sfnt",
+    "SfntInfo",
+]
+
+Buffer = Union[bytes, mmap]
+
+
+class NAME_ID:
+    # https://learn.microsoft.com/en-us/typography/opentype/spec/name#name-ids
+    FAMILY = 1
+    SUBFAMILY = 2
+    FULL_NAME = 4
+    POSTSCRIPT_NAME = 6
+    TYPOGRAPHIC_FAMILY = 16
+
+
+class SfntInfo(NamedTuple):
+    """
+    Attributes:
+        names (Dict[int, List[str]]): All the variants of each name, the preferred one first.
+        weight (Optional[int]): The weight (usWeightClass) of the font, like 400 for regular and 700 for bold.
+        italic (Optional[bool]): True if the font is italic or oblique.
+    """
+    names: Dict[int, List[str]]
+    weight: Optional[int]
+    italic: Optional[bool]
+
+
+class Sfnt():
+    """
+    Read the tables of the TrueType/OpenType fonts, the collections (.ttc/.otc) and the WOFF fonts
+    directly from a buffer, so only the bytes that are needed are read from an mmap.
+    """
+
+    COLLECTION_SIGNATURE = b"ttcf"
+    # https://learn.microsoft.com/en-us/typography/opentype/spec/otff#organization-of-an-opentype-font
+    SFNT_VERSIONS = (b"\x00\x01\x00\x00", b"true", b"OTTO", b"typ1")
+    WOFF_SIGNATURE = b"wOFF"
+    # The WOFF2 tables are compressed together with Brotli, which isn't in the standard library.
+    WOFF2_SIGNATURE = b"wOF2"
+
+    # https://learn.microsoft.com/en-us/typography/opentype/spec/otff#table-directory
+    OFFSET_TABLE = Struct(">4sH")  # sfntVersion, numTables
+    TABLE_RECORD = Struct(">4sIII")  # tableTag, checksum, offset, length
+    # https://learn.microsoft.com/en-us/typography/opentype/spec/otff#ttc-header
+    TTC_HEADER = Struct(">4sHHI")  # ttcTag, majorVersion, minorVersion, numFonts
+    TTC_OFFSET = Struct(">I")
+    # https://www.w3.org/TR/WOFF/#WOFFHeader
+    WOFF_HEADER = Struct(">4s4sIH")  # signature, flavor, length, numTables
+    WOFF_TABLE_RECORD = Struct(">4sIIII")  # tag, offset, compLength, origLength, origChecksum
+    # https://learn.microsoft.com/en-us/typography/opentype/spec/name
+    NAME_HEADER = Struct(">HHH")  # version, count, storageOffset
+    NAME_RECORD = Struct(">HHHHHH")  # platformID, encodingID, languageID, nameID, length, stringOffset
+    # https://learn.microsoft.com/en-us/typography/opentype/spec/os2
+    OS2_WEIGHT_CLASS = Struct(">4xH")
+    OS2_FS_SELECTION = Struct(">62xH")
+    FS_SELECTION_ITALIC = 1 << 0
+    FS_SELECTION_OBLIQUE = 1 << 9
+    # https://learn.microsoft.com/en-us/typography/opentype/spec/head
+    HEAD_MAC_STYLE = Struct(">44xH")
+    MAC_STYLE_BOLD = 1 << 0
+    MAC_STYLE_ITALIC = 1 << 1
+
+    # The number of bytes of the fingerprint of a file which isn't a font.
+    FINGERPRINT_FALLBACK_SIZE = 4096
+
+    # The exceptions raised when a file cannot be read or isn't a valid font.
+    READ_ERRORS = (OSError, ValueError, StructError, zlib.error)
+
+    PLATFORM_UNICODE = 0
+    PLATFORM_MACINTOSH = 1
+    PLATFORM_WINDOWS = 3
+    WINDOWS_ENGLISH_US = 0x0409
+
+    @staticmethod
+    def get_faces_count(buffer: Buffer) -> int:
+        """
+        Returns:
+            The number of fonts in a collection, otherwise 1.
+        """
+        if buffer[:4] == Sfnt.COLLECTION_SIGNATURE:
+            return Sfnt.TTC_HEADER.unpack_from(buffer, 0)[3]
+        return 1
+
+
+    @staticmethod
+    def read_file_faces_count(filename: str) -> int:
+        """
+        Like get_faces_count, but only the collection header of the file is read.
+
+        Returns:
+            The number of fonts in a collection, otherwise 1. If the file cannot be read, 1.
+        """
+        try:
+            with open(filename, "rb") as file:
+                header = file.read(Sfnt.TTC_HEADER.size)
+        except OSError:
+            return 1
+
+        if len(header) == Sfnt.TTC_HEADER.size and header[:4] == Sfnt.COLLECTION_SIGNATURE:
+            return max(Sfnt.TTC_HEADER.unpack(header)[3], 1)
+        return 1
+
+
+    @staticmethod
+    def read_fingerprint(buffer: Buffer) -> bytes:
+        """
+        Two fonts that have the same content have the same fingerprint, and two fonts that have a different content
+        almost always have a different fingerprint, since it contains the checksum of each table.
+
+        Parameters:
+            buffer (Union[bytes, mmap]): The content of the font file.
+        Returns:
+            The table directories of the fonts and their head.checkSumAdjustment.
+            If the buffer isn't a sfnt font, a collection or a WOFF font, its first bytes.
+        """
+        signature = buffer[:4]
+        try:
+            if signature in (Sfnt.WOFF_SIGNATURE, Sfnt.WOFF2_SIGNATURE):
+                # The WOFF2 header is 48 bytes long and its table directory has a variable size,
+                # so only the header, which contains the total length and the sfnt size, is kept.
+                if signature == Sfnt.WOFF2_SIGNATURE:
+                    return bytes(buffer[:48])
+                num_tables = Sfnt.WOFF_HEADER.unpack_from(buffer, 0)[3]
+                return bytes(buffer[:44 + num_tables * Sfnt.WOFF_TABLE_RECORD.size])
+
+            if signature not in Sfnt.SFNT_VERSIONS and signature != Sfnt.COLLECTION_SIGNATURE:
+                return bytes(buffer[:Sfnt.FINGERPRINT_FALLBACK_SIZE])
+
+            offset_tables = [0]
+            fingerprint = bytearray()
+            if signature == Sfnt.COLLECTION_SIGNATURE:
+                faces_count = Sfnt.get_faces_count(buffer)
+                header_end = Sfnt.TTC_HEADER.size + faces_count * Sfnt.TTC_OFFSET.size
+                fingerprint += buffer[:header_end]
+                offset_tables = [offset for offset, in Sfnt.TTC_OFFSET.iter_unpack(buffer[Sfnt.TTC_HEADER.size:header_end])]
+
+            for offset_table in offset_tables:
+                _, num_tables = Sfnt.OFFSET_TABLE.unpack_from(buffer, offset_table)
+                directory_end = offset_table + 12 + num_tables * Sfnt.TABLE_RECORD.size
+                fingerprint += buffer[offset_table:directory_end]
+
+                for i in range(num_tables):
+                    table_tag, _, offset, _ = Sfnt.TABLE_RECORD.unpack_from(buffer, offset_table + 12 + i * Sfnt.TABLE_RECORD.size)
+                    if table_tag == b"head":
+                        # https://learn.microsoft.com/en-us/typography/opentype/spec/head
+                        fingerprint += buffer[offset + 8:offset + 12]
+        except StructError:
+            return bytes(buffer[:Sfnt.FINGERPRINT_FALLBACK_SIZE])
+
+        return bytes(fingerprint)
+
+
+    @staticmethod
+    def read_table(buffer: Buffer, tag: bytes, face_index: int = 0) -> Optional[bytes]:
+        """
+        Parameters:
+            buffer (Union[bytes, mmap]): The content of the font file.
+            tag (bytes): The table tag, like b"name".
+            face_index (int): The index of the font in a collection.
+        Returns:
+            The table, or None if the font doesn't have it.
+        """
+        signature = buffer[:4]
+        if signature == Sfnt.WOFF_SIGNATURE:
+            return Sfnt._read_woff_table(buffer, tag)
+        if signature == Sfnt.WOFF2_SIGNATURE:
+            return None
+
+        offset_table = 0
+        if signature == Sfnt.COLLECTION_SIGNATURE:
+            if not 0 <= face_index < Sfnt.get_faces_count(buffer):
+                return None
+            offset_table, = Sfnt.TTC_OFFSET.unpack_from(buffer, Sfnt.TTC_HEADER.size + face_index * Sfnt.TTC_OFFSET.size)
+
+        _, num_tables = Sfnt.OFFSET_TABLE.unpack_from(buffer, offset_table)
+        # The offset table is 12 bytes long: sfntVersion, numTables, searchRange, entrySelector, rangeShift
+        for i in range(num_tables):
+            table_tag, _, offset, length = Sfnt.TABLE_RECORD.unpack_from(buffer, offset_table + 12 + i * Sfnt.TABLE_RECORD.size)
+            if table_tag == tag:
+                return bytes(buffer[offset:offset + length])
+
+        return None
+
+
+    @staticmethod
+    def _read_woff_table(buffer: Buffer, tag: bytes) -> Optional[bytes]:
+        _, _, _, num_tables = Sfnt.WOFF_HEADER.unpack_from(buffer, 0)
+        # The WOFF header is 44 bytes long.
+        for i in range(num_tables):
+            table_tag, offset, comp_length, orig_length, _ = Sfnt.WOFF_TABLE_RECORD.unpack_from(buffer, 44 + i * Sfnt.WOFF_TABLE_RECORD.size)
+            if table_tag == tag:
+                table = bytes(buffer[offset:offset + comp_length])
+                return zlib.decompress(table) if comp_length < orig_length else table
+
+        return None
+
+
+    @staticmethod
+    def read_names(buffer: Buffer, name_ids: Iterable[int], face_index: int = 0) -> Dict[int, List[str]]:
+        """
+        Parameters:
+            buffer (Union[bytes, mmap]): The content of the font file.
+            name_ids (Iterable[int]): The requested name IDs.
+            face_index (int): The index of the font in a collection.
+        Returns:
+            All the distinct localized variants of each name. The preferred variant is the first one:
+            the english Windows name, then the other Windows names, then the Unicode names and finally the Macintosh Roman names.
+            A name that the font doesn't contain isn't in the result.
+        """
+        table = Sfnt.read_table(buffer, b"name", face_index)
+        if table is None:
+            return {}
+
+        requested_ids = set(name_ids)
+        records: Dict[int, List[Tuple[int, int, int, int]]] = {}  # name ID -> [(priority, platformID, offset, length)]
+
+        _, count, storage_offset = Sfnt.NAME_HEADER.unpack_from(table, 0)
+        for i in range(count):
+            platform_id, encoding_id, language_id, name_id, length, string_offset = Sfnt.NAME_RECORD.unpack_from(table, Sfnt.NAME_HEADER.size + i * Sfnt.NAME_RECORD.size)
+            if name_id not in requested_ids:
+                continue
+
+            priority = Sfnt._get_record_priority(platform_id, encoding_id, language_id)
+            if priority is not None:
+                records.setdefault(name_id, []).append((priority, platform_id, storage_offset + string_offset, length))
+
+        names = {}
+        for name_id, name_records in records.items():
+            # The sort is stable, so the records of a same priority keep the order of the table.
+            name_records.sort(key=lambda record: record[0])
+            variants: Dict[str, None] = {}
+            for _, platform_id, offset, length in name_records:
+                encoding = "mac_roman" if platform_id == Sfnt.PLATFORM_MACINTOSH else "utf-16-be"
+                variants[table[offset:offset + length].decode(encoding, "replace")] = None
+            names[name_id] = list(variants)
+
+        return names
+
+
+    @staticmethod
+    def read_style(buffer: Buffer, face_index: int = 0) -> Tuple[Optional[int], Optional[bool]]:
+        """
+        Parameters:
+            buffer (Union[bytes, mmap]): The content of the font file.
+            face_index (int): The index of the font in a collection.
+        Returns:
+            The weight and if the font is italic. They come from the OS/2 table or, if the font doesn't have one, from the head table.
+        """
+        os2 = Sfnt.read_table(buffer, b"OS/2", face_index)
+        if os2 is not None and len(os2) >= Sfnt.OS2_FS_SELECTION.size:
+            weight, = Sfnt.OS2_WEIGHT_CLASS.unpack_from(os2)
+            fs_selection, = Sfnt.OS2_FS_SELECTION.unpack_from(os2)
+            return weight, bool(fs_selection & (Sfnt.FS_SELECTION_ITALIC | Sfnt.FS_SELECTION_OBLIQUE))
+
+        head = Sfnt.read_table(buffer, b"head", face_index)
+        if head is not None and len(head) >= Sfnt.HEAD_MAC_STYLE.size:
+            mac_style, = Sfnt.HEAD_MAC_STYLE.unpack_from(head)
+            return 700 if mac_style & Sfnt.MAC_STYLE_BOLD else 400, bool(mac_style & Sfnt.MAC_STYLE_ITALIC)
+
+        return None, None
+
+
+    @staticmethod
+    def _get_record_priority(platform_id: int, encoding_id: int, language_id: int) -> Optional[int]:
+        """
+        Returns:
+            The priority of a name record (lower is better), or None if its encoding isn't supported.
+        """
+        if platform_id == Sfnt.PLATFORM_WINDOWS and encoding_id in (0, 1, 10):
+            return 0 if language_id == Sfnt.WINDOWS_ENGLISH_US else 1
+        if platform_id == Sfnt.PLATFORM_UNICODE:
+            return 2
+        if platform_id == Sfnt.PLATFORM_MACINTOSH and encoding_id == 0:
+            return 3 if language_id == 0 else 4
+        return None
+
+
+    @staticmethod
+    def read_file_info(filename: str, name_ids: Iterable[int], face_index: int = 0) -> SfntInfo:
+        """
+        Read the names and the style of a font file. Only the pages that contain the headers and the tables are read.
+
+        Returns:
+            The names and the style. If the file cannot be read or isn't a font, the names are empty and the style is None.
+        """
+        try:
+            with open(filename, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as buffer:
+                names = Sfnt.read_names(buffer, name_ids, face_index)
+                weight, italic = Sfnt.read_style(buffer, face_index)
+                return SfntInfo(names, weight, italic)
+        except Sfnt.READ_ERRORS:
+            return SfntInfo({}, None, None)
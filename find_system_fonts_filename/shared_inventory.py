@@ -0,0 +1,108 @@
+import os
+from .exceptions import FindSystemFontsFilenameException
+from .fonts_filename import get_system_fonts_inventory
+from .inventory import FontsInventory
+from mmap import mmap, ACCESS_READ
+from threading import Lock
+from typing import Optional, Tuple
+from uuid import uuid4
+
+__all__ = [
+    "publish_fonts_inventory",
+    "SharedFontsInventory",
+]
+
+
+def publish_fonts_inventory(path: str, inventory: Optional[FontsInventory] = None) -> int:
+    """
+    Write an inventory in a file that the other processes can map with SharedFontsInventory.
+    The file is replaced atomically, so the processes never see a partial inventory,
+    and the ones that mapped the previous generation keep it until they call SharedFontsInventory.get again.
+
+    On Linux, a file in /dev/shm stays in memory, and all the processes that map it share the same pages.
+
+    Parameters:
+        path (str): The file of the inventory.
+        inventory (Optional[FontsInventory]): The inventory to publish. If None, the inventory of the installed fonts.
+    Returns:
+        The generation of the published inventory: the generation of the previous file plus one, or 1.
+    """
+    if inventory is None:
+        inventory = get_system_fonts_inventory()
+
+    generation = 1
+    try:
+        with open(path, "rb") as file:
+            generation = FontsInventory.read_generation(file.read(FontsInventory.HEADER.size)) + 1
+    except (OSError, FindSystemFontsFilenameException):
+        pass
+
+    temporary_path = f"{path}.{uuid4().hex}.tmp"
+    try:
+        with open(temporary_path, "wb") as file:
+            inventory.write(file, generation)
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
+
+    return generation
+
+
+class SharedFontsInventory():
+    """
+    The inventory published in a file by publish_fonts_inventory, mapped in memory.
+
+    It doesn't load fontconfig or any other system API, and the inventory isn't copied in the process,
+    so the workers of a pre-fork server can share the inventory that the parent published:
+
+        # In the parent, before forking the workers
+        publish_fonts_inventory("/dev/shm/fonts.inventory")
+
+        # In each worker
+        shared_inventory = SharedFontsInventory("/dev/shm/fonts.inventory")
+        fonts_filename = shared_inventory.get()
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._inventory: Optional[FontsInventory] = None
+        self._generation = 0
+        self._file_id: Optional[Tuple[int, int, int]] = None
+        self._lock = Lock()
+
+
+    def get(self) -> FontsInventory:
+        """
+        Returns:
+            The last published inventory. The file is mapped again only when a new generation has been published.
+        """
+        try:
+            with self._lock:
+                if self._inventory is None or self._file_id != SharedFontsInventory._get_file_id(os.stat(self.path)):
+                    with open(self.path, "rb") as file:
+                        file_id = SharedFontsInventory._get_file_id(os.fstat(file.fileno()))
+                        # The mapping stays valid after the file is closed, and after the file is replaced by a new generation.
+                        buffer = mmap(file.fileno(), 0, access=ACCESS_READ)
+                    self._inventory, self._generation = FontsInventory.from_buffer(buffer)
+                    self._file_id = file_id
+
+                return self._inventory
+        except FileNotFoundError:
+            raise FindSystemFontsFilenameException(f"No inventory has been published in \"{self.path}\".")
+
+
+    @staticmethod
+    def _get_file_id(file_stat: os.stat_result) -> Tuple[int, int, int]:
+        return file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns
+
+
+    @property
+    def generation(self) -> int:
+        """
+        The generation of the inventory returned by the last call to get, or 0 if get hasn't been called.
+        """
+        return self._generation
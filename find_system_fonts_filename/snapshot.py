@@ -0,0 +1,345 @@
+from .font_filter import FontFilter
+from .instrumentation import increment
+from os import environ, stat
+from os.path import dirname
+from threading import Lock
+from typing import Callable, Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple, Type, TYPE_CHECKING
+
+# The fonts metadata and the inventory are only imported when they are first used, so importing the package stays fast.
+if TYPE_CHECKING:
+    from .font_index import FontNameIndex
+    from .font_info import FontInfo
+    from .inventory import FontsInventory
+    from .system_fonts import SystemFonts
+
+__all__ = [
+    "FontsChanges",
+    "FontsChangeToken",
+    "FontsSnapshot",
+    "FontsSnapshotCache",
+]
+
+_NO_FONTS: FrozenSet[str] = frozenset()
+
+
+def get_environment(names: Iterable[str]) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Parameters:
+        names (Iterable[str]): The environment variables names.
+    Returns:
+        The value of each environment variable. The value is None when the variable isn't set.
+    """
+    return tuple((name, environ.get(name)) for name in names)
+
+
+def get_paths_mtime(paths: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+    """
+    Parameters:
+        paths (Iterable[str]): Files or directories path.
+    Returns:
+        The modification time (in nanoseconds) of each path. The value is -1 when the path doesn't exist.
+    """
+    paths_mtime = []
+    for path in paths:
+        try:
+            mtime = stat(path).st_mtime_ns
+        except OSError:
+            mtime = -1
+        paths_mtime.append((path, mtime))
+    return tuple(paths_mtime)
+
+
+class FontsSnapshot:
+    """
+    An immutable view of the installed fonts at a given time.
+
+    Attributes:
+        fonts_filename (FrozenSet[str]): The installed fonts filename.
+        environment (Tuple[Tuple[str, Optional[str]], ...]): The environment variables
+            that were used to find the fonts.
+        paths_mtime (Optional[Tuple[Tuple[str, int], ...]]): The files and directories
+            that were used to find the fonts with their modification time.
+            If None, the backend cannot cheaply detect font changes, so the snapshot is never considered up to date.
+        font_dirs (FrozenSet[str]): The directories, including their subdirectories, that contain the fonts.
+            When only some of them changed between two snapshots, only their fonts are compared.
+        fonts_faces (Optional[FrozenSet[Tuple[str, int]]]): The filename and the face index of each font,
+            if the backend knows them. Otherwise, get_fonts_faces reads them from the collection header of the fonts.
+    """
+    __slots__ = ("fonts_filename", "environment", "paths_mtime", "font_dirs", "_fonts_faces", "_fonts_by_directory", "_fonts", "_name_index", "_filtered_fonts_faces", "_inventory")
+
+    def __init__(
+        self,
+        fonts_filename: FrozenSet[str],
+        environment: Tuple[Tuple[str, Optional[str]], ...] = (),
+        paths_mtime: Optional[Tuple[Tuple[str, int], ...]] = None,
+        font_dirs: FrozenSet[str] = frozenset(),
+        fonts_faces: Optional[FrozenSet[Tuple[str, int]]] = None
+    ) -> None:
+        self.fonts_filename = fonts_filename
+        self.environment = environment
+        self.paths_mtime = paths_mtime
+        self.font_dirs = font_dirs
+        self._fonts_faces = fonts_faces
+        self._fonts_by_directory: Optional[Dict[str, FrozenSet[str]]] = None
+        self._fonts: Optional[FrozenSet["FontInfo"]] = None
+        self._name_index: Optional["FontNameIndex"] = None
+        self._filtered_fonts_faces: Dict[FontFilter, FrozenSet[Tuple[str, int]]] = {}
+        self._inventory: Optional["FontsInventory"] = None
+
+
+    def get_fonts_faces(self) -> FrozenSet[Tuple[str, int]]:
+        """
+        Returns:
+            The filename and the face index of each font. A collection (.ttc/.otc) has one pair for each of its fonts.
+        """
+        # The snapshot is immutable, so computing it twice in a race is harmless.
+        if self._fonts_faces is None:
+            from .sfnt import Sfnt
+            self._fonts_faces = frozenset(
+                (font_filename, face_index)
+                for font_filename in self.fonts_filename
+                for face_index in range(Sfnt.read_file_faces_count(font_filename))
+            )
+
+        return self._fonts_faces
+
+
+    def get_filtered_fonts_faces(
+        self,
+        font_filter: FontFilter,
+        list_fonts_faces: Callable[[FontFilter], FrozenSet[Tuple[str, int]]]
+    ) -> FrozenSet[Tuple[str, int]]:
+        """
+        Parameters:
+            font_filter (FontFilter): The criteria that the fonts must match.
+            list_fonts_faces (Callable[[FontFilter], FrozenSet[Tuple[str, int]]]): Called to list the fonts
+                that match the filter when the result isn't cached yet.
+        Returns:
+            The filename and the face index of each font that match the filter. The result is kept with the snapshot.
+        """
+        # The snapshot is immutable, so computing it twice in a race is harmless.
+        fonts_faces = self._filtered_fonts_faces.get(font_filter)
+        if fonts_faces is None:
+            fonts_faces = list_fonts_faces(font_filter)
+            self._filtered_fonts_faces[font_filter] = fonts_faces
+
+        return fonts_faces
+
+
+    def get_inventory(self) -> "FontsInventory":
+        """
+        Returns:
+            The fonts filename in a compact set, where each font has an ID. It is built on the first call.
+            It is an extra copy: the snapshot still keeps fonts_filename, which get_system_fonts_filename returns,
+            so the inventory only saves memory if you drop your own sets of filenames for it.
+        """
+        # The snapshot is immutable, so computing it twice in a race is harmless.
+        if self._inventory is None:
+            from .inventory import FontsInventory
+            self._inventory = FontsInventory(self.fonts_filename)
+
+        return self._inventory
+
+
+    def get_fonts(self) -> FrozenSet["FontInfo"]:
+        """
+        Returns:
+            A FontInfo for each face of the fonts. The FontInfo are created once per snapshot,
+            so the names that have already been read are kept between calls.
+        """
+        # The snapshot is immutable, so computing it twice in a race is harmless.
+        if self._fonts is None:
+            from .font_info import FontInfo
+            self._fonts = frozenset(FontInfo(font_filename, face_index) for font_filename, face_index in self.get_fonts_faces())
+
+        return self._fonts
+
+
+    def get_name_index(self) -> "FontNameIndex":
+        """
+        Returns:
+            The index of the fonts by name. It is built on the first call.
+            The names come from the persistent metadata cache, so only the fonts that changed since the last build are read.
+        """
+        # The snapshot is immutable, so computing it twice in a race is harmless.
+        if self._name_index is None:
+            fonts = self.get_fonts()
+            from .font_index import FontNameIndex
+            from .font_metadata_cache import FontMetadataCache
+            FontMetadataCache.get_default().load(fonts)
+            self._name_index = FontNameIndex(fonts)
+
+        return self._name_index
+
+
+    def is_up_to_date(self) -> bool:
+        """
+        Returns:
+            True if none of the environment variables, files and directories
+            that were used to find the fonts have changed, False otherwise.
+        """
+        if self.paths_mtime is None:
+            return False
+
+        if get_environment(name for name, _ in self.environment) != self.environment:
+            return False
+
+        return get_paths_mtime(path for path, _ in self.paths_mtime) == self.paths_mtime
+
+
+    def get_changes_since(self, previous: "FontsSnapshot") -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Parameters:
+            previous (FontsSnapshot): An older snapshot.
+        Returns:
+            The fonts filename that have been added and removed since the previous snapshot.
+        """
+        if previous is self:
+            return _NO_FONTS, _NO_FONTS
+
+        changed_dirs = self._get_changed_font_dirs(previous)
+        if changed_dirs is None:
+            return self.fonts_filename - previous.fonts_filename, previous.fonts_filename - self.fonts_filename
+
+        added = set()
+        removed = set()
+        for changed_dir in changed_dirs:
+            fonts_filename = self._get_fonts_by_directory().get(changed_dir, _NO_FONTS)
+            previous_fonts_filename = previous._get_fonts_by_directory().get(changed_dir, _NO_FONTS)
+            added.update(fonts_filename - previous_fonts_filename)
+            removed.update(previous_fonts_filename - fonts_filename)
+
+        return frozenset(added), frozenset(removed)
+
+
+    def _get_changed_font_dirs(self, previous: "FontsSnapshot") -> Optional[FrozenSet[str]]:
+        """
+        Returns:
+            The font directories that changed since the previous snapshot.
+            None if something else changed, like the configuration, so all the fonts need to be compared.
+        """
+        if self.paths_mtime is None or previous.paths_mtime is None or self.environment != previous.environment:
+            return None
+
+        changed_paths = frozenset(path for path, _ in set(self.paths_mtime).symmetric_difference(previous.paths_mtime))
+        if not changed_paths <= (self.font_dirs | previous.font_dirs):
+            return None
+
+        return changed_paths
+
+
+    def _get_fonts_by_directory(self) -> Dict[str, FrozenSet[str]]:
+        # The snapshot is immutable, so computing it twice in a race is harmless.
+        if self._fonts_by_directory is None:
+            fonts_by_directory: Dict[str, set] = {}
+            for font_filename in self.fonts_filename:
+                fonts_by_directory.setdefault(dirname(font_filename), set()).add(font_filename)
+            self._fonts_by_directory = {directory: frozenset(fonts) for directory, fonts in fonts_by_directory.items()}
+
+        return self._fonts_by_directory
+
+
+class FontsChangeToken:
+    """
+    An opaque token which represents the installed fonts at a given time.
+    Pass it to get_system_fonts_changes to get the fonts that changed since then.
+    """
+    __slots__ = ("_snapshot",)
+
+    def __init__(self, snapshot: FontsSnapshot) -> None:
+        self._snapshot = snapshot
+
+
+class FontsChanges(NamedTuple):
+    """
+    Attributes:
+        token (FontsChangeToken): The token of the current installed fonts.
+        added (FrozenSet[str]): The fonts filename that have been installed since the previous token.
+        removed (FrozenSet[str]): The fonts filename that have been uninstalled since the previous token.
+    """
+    token: FontsChangeToken
+    added: FrozenSet[str]
+    removed: FrozenSet[str]
+
+
+class FontsSnapshotCache:
+    """
+    A process-wide cache of the installed fonts.
+
+    Reading an up to date snapshot never takes a lock. When the snapshot is stale,
+    a new one is built and swapped in, so the readers always see a complete snapshot.
+    """
+
+    def __init__(self, system_fonts: Type["SystemFonts"]) -> None:
+        self._system_fonts = system_fonts
+        self._snapshot: Optional[FontsSnapshot] = None
+        self._generation = 0
+        self._refresh_lock = Lock()
+
+
+    @property
+    def system_fonts(self) -> Type["SystemFonts"]:
+        """
+        The backend that builds the snapshots.
+        """
+        return self._system_fonts
+
+
+    def get(self) -> FontsSnapshot:
+        """
+        Returns:
+            The cached snapshot if it is still up to date, otherwise a newly built snapshot.
+        """
+        increment("calls")
+        snapshot = self._snapshot
+        if snapshot is not None and self._system_fonts.is_snapshot_up_to_date(snapshot):
+            increment("snapshot_cache_hits")
+            return snapshot
+
+        with self._refresh_lock:
+            # Another thread may have refreshed the snapshot while we were waiting for the lock.
+            if self._snapshot is not None and self._snapshot is not snapshot and self._system_fonts.is_snapshot_up_to_date(self._snapshot):
+                increment("snapshot_cache_hits")
+                return self._snapshot
+            increment("snapshot_cache_misses")
+            return self._refresh()
+
+
+    def get_if_up_to_date(self) -> Optional[FontsSnapshot]:
+        """
+        Returns:
+            The cached snapshot if it is still up to date, otherwise None. A stale snapshot isn't rebuilt.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and self._system_fonts.is_snapshot_up_to_date(snapshot):
+            return snapshot
+        return None
+
+
+    def warm_up(self) -> FontsSnapshot:
+        """
+        Build the snapshot if there isn't one yet or if it is stale.
+
+        Returns:
+            The up to date snapshot.
+        """
+        return self.get()
+
+
+    def invalidate(self) -> None:
+        """
+        Discard the cached snapshot. The next call to get will rebuild it.
+        """
+        self._generation += 1
+        self._snapshot = None
+
+
+    def _refresh(self) -> FontsSnapshot:
+        generation = self._generation
+        snapshot = self._system_fonts.get_system_fonts_snapshot()
+
+        # If the cache has been invalidated while the snapshot was built, the snapshot may already be stale.
+        if generation == self._generation:
+            self._snapshot = snapshot
+
+        return snapshot
@@ -1,9 +1,22 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Set
+from typing import FrozenSet, Iterator, List, Set, Tuple
+from .exceptions import OSNotSupported
+from .font_filter import FontFilter
+from .install_mode import InstallMode
+from .snapshot import FontsSnapshot
 
 
 class SystemFonts(ABC):
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        Return True if the backend can run in this process.
+        It is the probe of the backends registered through the "find_system_fonts_filename.backends" entry point,
+        so it is called at most once per process.
+        """
+        return True
+
     @staticmethod
     @abstractmethod
     def get_system_fonts_filename() -> Set[str]:
@@ -14,7 +27,7 @@ class SystemFonts(ABC):
 
     @staticmethod
     @abstractmethod
-    def install_font(font_filename: Path, add_font_to_registry: bool = False) -> None:
+    def install_font(font_filename: Path, add_font_to_registry: bool = False, install_mode: InstallMode = InstallMode.AUTO) -> None:
         """
         Install a font from it's filename.
         """
@@ -27,3 +40,70 @@ class SystemFonts(ABC):
         Uninstall a font from it's filename.
         """
         pass
+
+    @classmethod
+    def install_fonts(cls, fonts_filename: List[Path], add_font_to_registry: bool = False, install_mode: InstallMode = InstallMode.AUTO) -> None:
+        """
+        Install many fonts. If a font cannot be installed, the fonts installed before it are uninstalled.
+        Backends that can install the fonts at once should override it.
+        """
+        installed: List[Path] = []
+        try:
+            for font_filename in fonts_filename:
+                cls.install_font(font_filename, add_font_to_registry, install_mode)
+                installed.append(font_filename)
+        except BaseException:
+            for font_filename in reversed(installed):
+                try:
+                    cls.uninstall_font(font_filename, add_font_to_registry)
+                except Exception:
+                    pass
+            raise
+
+    @classmethod
+    def uninstall_fonts(cls, fonts_filename: List[Path], remove_font_in_registry: bool = False) -> None:
+        """
+        Uninstall many fonts.
+        Backends that can uninstall the fonts at once should override it.
+        """
+        for font_filename in fonts_filename:
+            cls.uninstall_font(font_filename, remove_font_in_registry)
+
+    @classmethod
+    def iter_system_fonts_filename(cls) -> Iterator[str]:
+        """
+        Yield the installed fonts filename, each one once.
+        Backends that enumerate the fonts one by one should override it to yield them as they are found.
+        """
+        yield from cls.get_system_fonts_filename()
+
+    @classmethod
+    def count_system_fonts(cls) -> int:
+        """
+        Return the number of installed fonts filename.
+        """
+        return len(cls.get_system_fonts_filename())
+
+    @staticmethod
+    def list_filtered_fonts_faces(font_filter: FontFilter) -> FrozenSet[Tuple[str, int]]:
+        """
+        Return the filename and the face index of the installed fonts that match the filter.
+        Only the backends whose API can filter the fonts implement it.
+        """
+        raise OSNotSupported("Filtering the fonts is only supported on Linux.")
+
+    @classmethod
+    def get_system_fonts_snapshot(cls) -> FontsSnapshot:
+        """
+        Return a snapshot of all the installed fonts filename.
+        Backends that can cheaply detect font changes should override it to
+        record what the snapshot depends on.
+        """
+        return FontsSnapshot(frozenset(cls.get_system_fonts_filename()))
+
+    @staticmethod
+    def is_snapshot_up_to_date(snapshot: FontsSnapshot) -> bool:
+        """
+        Return True if the snapshot still represents the installed fonts.
+        """
+        return snapshot.is_up_to_date()
@@ -0,0 +1,198 @@
+import os
+from .fontconfig import FC_FONT_FORMAT
+from .fontconfig_config import FontConfigConfig
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from ..snapshot import FontsSnapshot, get_paths_mtime
+
+__all__ = [
+    "FontDirectoryScanner",
+    "ScannedDirectory",
+]
+
+
+class ScannedDirectory(NamedTuple):
+    """
+    Attributes:
+        directory (str): The scanned directory.
+        file_id (Tuple[int, int]): The device and inode of the directory.
+        mtime_ns (int): The modification time of the directory when it has been scanned.
+        subdirs (List[str]): The subdirectories of the directory.
+        fonts_filename (List[str]): The TrueType and CFF fonts filename of the directory.
+    """
+    directory: str
+    file_id: Tuple[int, int]
+    mtime_ns: int
+    subdirs: List[str]
+    fonts_filename: List[str]
+
+
+class FontDirectoryScanner():
+    """
+    Find the fonts by walking the font directories, for the systems without fontconfig.
+
+    The directories are read in parallel with os.scandir and the fonts are recognized by their signature.
+    The result of each directory is kept with its mtime, so a new scan only reads the directories that changed.
+    """
+
+    # FreeType reports the sfnt fonts as TrueType or CFF depending on their outlines,
+    # which is what UnixFonts.VALID_FONT_FORMATS keeps.
+    # https://learn.microsoft.com/en-us/typography/opentype/spec/otff#organization-of-an-opentype-font
+    SFNT_FONT_FORMATS = {
+        b"\x00\x01\x00\x00": FC_FONT_FORMAT.FT_FONT_FORMAT_TRUETYPE,
+        b"true": FC_FONT_FORMAT.FT_FONT_FORMAT_TRUETYPE,
+        b"OTTO": FC_FONT_FORMAT.FT_FONT_FORMAT_CFF,
+    }
+    COLLECTION_SIGNATURE = b"ttcf"
+    # The WOFF and WOFF2 files store the sfnt version of the font they wrap at the offset 4.
+    # https://www.w3.org/TR/WOFF/#WOFFHeader
+    WOFF_SIGNATURES = (b"wOFF", b"wOF2")
+
+    _instance: Optional["FontDirectoryScanner"] = None
+    _instance_lock = Lock()
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """
+        Args:
+            max_workers: The number of threads that read the directories. If None, ThreadPoolExecutor chooses it.
+        """
+        self.max_workers = max_workers
+        self._scanned_dirs: Dict[str, ScannedDirectory] = {}
+        self._selection_globs: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+        self._config: Optional[FontConfigConfig] = None
+        self._lock = Lock()
+
+
+    @staticmethod
+    def get() -> "FontDirectoryScanner":
+        """
+        Returns:
+            The process-wide scanner. It is created on the first call.
+        """
+        if FontDirectoryScanner._instance is None:
+            with FontDirectoryScanner._instance_lock:
+                if FontDirectoryScanner._instance is None:
+                    FontDirectoryScanner._instance = FontDirectoryScanner()
+
+        return FontDirectoryScanner._instance
+
+
+    def get_system_fonts_snapshot(self) -> FontsSnapshot:
+        """
+        Returns:
+            A snapshot of the fonts of the fontconfig directories.
+        """
+        config = FontConfigConfig.get()
+        font_dirs = config.font_dirs
+        scanned_dirs = self.scan(font_dirs, config)
+
+        fonts_filename = frozenset(font_filename for scanned_dir in scanned_dirs.values() for font_filename in scanned_dir.fonts_filename)
+        # The missing font directories are also watched, since creating one of them adds fonts.
+        missing_dirs_mtime = get_paths_mtime(font_dir for font_dir in font_dirs if font_dir not in scanned_dirs)
+        scanned_dirs_mtime = tuple((font_dir, scanned_dir.mtime_ns) for font_dir, scanned_dir in scanned_dirs.items())
+
+        return FontsSnapshot(
+            fonts_filename,
+            config.environment,
+            config.paths_mtime + missing_dirs_mtime + scanned_dirs_mtime,
+            frozenset(scanned_dirs)
+        )
+
+
+    def scan(self, font_dirs: Iterable[str], config: Optional[FontConfigConfig] = None) -> Dict[str, ScannedDirectory]:
+        """
+        Parameters:
+            font_dirs (Iterable[str]): The font directories. Their subdirectories are also scanned.
+            config (Optional[FontConfigConfig]): If specified, the files and directories rejected by its <selectfont> globs are skipped.
+                The <pattern> selectors need the font properties, so they are ignored.
+        Returns:
+            The result of each existing directory.
+        """
+        with self._lock:
+            scanned_dirs: Dict[str, ScannedDirectory] = {}
+            scanned_file_ids: Set[Tuple[int, int]] = set()
+            pending_dirs = list(dict.fromkeys(font_dirs))
+
+            # The previous results are only reused if they were filtered by the same globs.
+            selection_globs = (config.accept_globs, config.reject_globs) if config is not None else None
+            if selection_globs != self._selection_globs:
+                self._scanned_dirs = {}
+                self._selection_globs = selection_globs
+            self._config = config
+
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                # Each iteration reads one level of the directory trees.
+                while pending_dirs:
+                    next_pending_dirs = []
+
+                    for scanned_dir in executor.map(self._scan_directory, pending_dirs):
+                        # A symbolic link may point to a directory that has already been scanned.
+                        if scanned_dir is None or scanned_dir.file_id in scanned_file_ids:
+                            continue
+
+                        scanned_dirs[scanned_dir.directory] = scanned_dir
+                        scanned_file_ids.add(scanned_dir.file_id)
+                        next_pending_dirs.extend(subdir for subdir in scanned_dir.subdirs if subdir not in scanned_dirs)
+
+                    pending_dirs = next_pending_dirs
+
+            self._scanned_dirs = scanned_dirs
+            return scanned_dirs
+
+
+    def _scan_directory(self, directory: str) -> Optional[ScannedDirectory]:
+        try:
+            dir_stat = os.stat(directory)
+        except OSError:
+            return None
+
+        previous_scanned_dir = self._scanned_dirs.get(directory)
+        if previous_scanned_dir is not None and previous_scanned_dir.mtime_ns == dir_stat.st_mtime_ns:
+            return previous_scanned_dir
+
+        subdirs = []
+        fonts_filename = []
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Like fontconfig, ignore the hidden files and directories.
+                    if entry.name.startswith(".") or (self._config is not None and not self._config.accepts_filename(entry.path)):
+                        continue
+
+                    try:
+                        if entry.is_dir():
+                            subdirs.append(entry.path)
+                        elif entry.is_file() and FontDirectoryScanner.get_font_format(entry.path) is not None:
+                            fonts_filename.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        return ScannedDirectory(directory, (dir_stat.st_dev, dir_stat.st_ino), dir_stat.st_mtime_ns, subdirs, fonts_filename)
+
+
+    @staticmethod
+    def get_font_format(font_filename: str) -> Optional[FC_FONT_FORMAT]:
+        """
+        Parameters:
+            font_filename (str): A file path.
+        Returns:
+            The format FreeType would report for the file if it is a TrueType or CFF font, otherwise None.
+            For a collection, it is the format of its first font.
+        """
+        with open(font_filename, "rb") as font_file:
+            header = font_file.read(16)
+            signature = header[:4]
+
+            if signature == FontDirectoryScanner.COLLECTION_SIGNATURE and len(header) == 16:
+                # https://learn.microsoft.com/en-us/typography/opentype/spec/otff#ttc-header
+                first_font_offset = int.from_bytes(header[12:16], "big")
+                font_file.seek(first_font_offset)
+                signature = font_file.read(4)
+            elif signature in FontDirectoryScanner.WOFF_SIGNATURES:
+                signature = header[4:8]
+
+        return FontDirectoryScanner.SFNT_FONT_FORMATS.get(signature)
@@ -0,0 +1,78 @@
+import errno
+import os
+from pathlib import Path
+from shutil import copyfile
+from ..install_mode import InstallMode
+
+__all__ = ["FontFileCopier"]
+
+
+class FontFileCopier():
+    """
+    Put a font in a font directory with an InstallMode.
+    """
+
+    # https://man7.org/linux/man-pages/man2/ioctl_ficlone.2.html
+    # _IOW(0x94, 9, int)
+    FICLONE = 0x40049409
+
+    # The errors of a reflink or a copy_file_range that the filesystem doesn't support.
+    # https://man7.org/linux/man-pages/man2/copy_file_range.2.html
+    UNSUPPORTED_ERRORS = frozenset((errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY, errno.ENOSYS, errno.EBADF))
+
+    AUTO_MODES = (InstallMode.REFLINK, InstallMode.COPY_FILE_RANGE, InstallMode.COPY)
+
+    @staticmethod
+    def copy(source: Path, destination: str, install_mode: InstallMode = InstallMode.AUTO) -> InstallMode:
+        """
+        Parameters:
+            source (Path): The font to copy.
+            destination (str): The path of the copy. It must not exist.
+            install_mode (InstallMode): How the font is copied.
+        Returns:
+            The mode used. With InstallMode.AUTO, it is the first mode that the filesystem supports.
+        """
+        if install_mode != InstallMode.AUTO:
+            FontFileCopier._copy_with_mode(source, destination, install_mode)
+            return install_mode
+
+        for mode in FontFileCopier.AUTO_MODES:
+            try:
+                FontFileCopier._copy_with_mode(source, destination, mode)
+                return mode
+            except OSError as exception:
+                if mode == InstallMode.COPY or exception.errno not in FontFileCopier.UNSUPPORTED_ERRORS:
+                    raise
+                # The next mode overwrites what has been written.
+
+
+    @staticmethod
+    def _copy_with_mode(source: Path, destination: str, install_mode: InstallMode) -> None:
+        if install_mode == InstallMode.HARDLINK:
+            os.link(source, destination)
+        elif install_mode == InstallMode.COPY:
+            copyfile(source, destination)
+        elif install_mode in (InstallMode.REFLINK, InstallMode.COPY_FILE_RANGE):
+            with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+                if install_mode == InstallMode.REFLINK:
+                    # Imported here since fcntl only exists on Unix
+                    from fcntl import ioctl
+                    ioctl(destination_file.fileno(), FontFileCopier.FICLONE, source_file.fileno())
+                else:
+                    FontFileCopier._copy_file_range(source_file.fileno(), destination_file.fileno())
+        else:
+            raise ValueError(f"Unknown install mode {install_mode}")
+
+
+    @staticmethod
+    def _copy_file_range(source_fd: int, destination_fd: int) -> None:
+        if not hasattr(os, "copy_file_range"):
+            raise OSError(errno.ENOSYS, "os.copy_file_range isn't available")
+
+        size = os.fstat(source_fd).st_size
+        copied = 0
+        while copied < size:
+            count = os.copy_file_range(source_fd, destination_fd, size - copied)
+            if count == 0:
+                break
+            copied += count
@@ -0,0 +1,148 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from shutil import copyfile
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from uuid import uuid4
+from ..exceptions import FindSystemFontsFilenameException
+
+__all__ = ["FontFilesTransaction"]
+
+_logger = logging.getLogger(__name__)
+
+
+class FontFilesTransaction():
+    """
+    Add or remove many font files in a directory, all or nothing.
+
+    The files are first staged under temporary names which start with a dot, so fontconfig ignores them,
+    then renamed to their final name. If a file cannot be staged or renamed, the directory is restored as it was.
+    """
+
+    MAX_WORKERS = 8
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+
+    def install(self, fonts_filename: Sequence[Path], copy: Callable[[Path, str], None] = copyfile) -> List[str]:
+        """
+        Copy the fonts in the directory. The fonts that already exist in the directory are replaced.
+
+        Parameters:
+            fonts_filename (Sequence[Path]): The fonts to copy.
+            copy (Callable[[Path, str], None]): Copies a font to a path.
+        Returns:
+            The installed fonts filename.
+        """
+        targets = self._get_targets(font_filename.name for font_filename in fonts_filename)
+        staged = {target: self._get_temporary_filename(target) for target in targets}
+
+        # The copies are the slow part, so they run in parallel.
+        try:
+            self._run_parallel(copy, fonts_filename, list(staged.values()))
+        except BaseException:
+            self._remove_quietly(staged.values())
+            raise
+
+        backups: Dict[str, str] = {}
+        renamed: List[str] = []
+        try:
+            for target, temporary in staged.items():
+                if os.path.lexists(target):
+                    backup = self._get_temporary_filename(target)
+                    os.replace(target, backup)
+                    # Only recorded once it exists, so the rollback doesn't restore a missing backup.
+                    backups[target] = backup
+                os.replace(temporary, target)
+                renamed.append(target)
+        except BaseException:
+            self._remove_quietly(renamed)
+            self._restore_quietly(backups)
+            self._remove_quietly(temporary for target, temporary in staged.items() if target not in renamed)
+            raise
+
+        self._remove_quietly(backups.values())
+        return targets
+
+
+    def uninstall(self, fonts_filename: Sequence[Path]) -> List[str]:
+        """
+        Remove the fonts with the same name from the directory.
+
+        Parameters:
+            fonts_filename (Sequence[Path]): The fonts to remove. Only their name is used.
+        Returns:
+            The removed fonts filename.
+        """
+        targets = self._get_targets(font_filename.name for font_filename in fonts_filename)
+        missing = [target for target in targets if not os.path.isfile(target)]
+        if missing:
+            raise FindSystemFontsFilenameException(f"Couldn't delete the fonts {missing}, they aren't installed.")
+
+        # A rename is atomic, so the fonts are moved away before being deleted.
+        staged: Dict[str, str] = {}
+        try:
+            for target in targets:
+                temporary = self._get_temporary_filename(target)
+                os.replace(target, temporary)
+                staged[target] = temporary
+        except BaseException:
+            self._restore_quietly(staged)
+            raise
+
+        self._run_parallel(lambda temporary: self._remove_quietly([temporary]), staged.values())
+        return targets
+
+
+    def _get_targets(self, names: Iterable[str]) -> List[str]:
+        targets = [os.path.join(self.directory, name) for name in names]
+        if len(set(targets)) != len(targets):
+            raise ValueError("Two fonts have the same name.")
+        return targets
+
+
+    @staticmethod
+    def _get_temporary_filename(target: str) -> str:
+        directory, name = os.path.split(target)
+        return os.path.join(directory, f".{name}.{uuid4().hex}.tmp")
+
+
+    @staticmethod
+    def _run_parallel(function: Callable, *arguments: Iterable) -> None:
+        """
+        Call the function on each tuple of arguments, and raise the first exception once all the calls are done.
+        """
+        with ThreadPoolExecutor(FontFilesTransaction.MAX_WORKERS) as executor:
+            futures = [executor.submit(function, *call_arguments) for call_arguments in zip(*arguments)]
+
+        error: Optional[BaseException] = None
+        for future in futures:
+            if future.exception() is not None and error is None:
+                error = future.exception()
+        if error is not None:
+            raise error
+
+
+    @staticmethod
+    def _restore_quietly(moved: Dict[str, str]) -> None:
+        """
+        Move back each file to its original name. A file that cannot be moved back doesn't prevent the others from being restored.
+        """
+        for target, temporary in moved.items():
+            try:
+                os.replace(temporary, target)
+            except OSError as exception:
+                _logger.warning("Couldn't restore \"%s\" from \"%s\": %s", target, temporary, exception)
+
+
+    @staticmethod
+    def _remove_quietly(filenames: Iterable[str]) -> None:
+        for filename in filenames:
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+            except OSError as exception:
+                _logger.warning("Couldn't remove \"%s\": %s", filename, exception)
@@ -1,4 +1,4 @@
-from ctypes import c_char_p, c_int, c_void_p, CDLL, POINTER, Structure, util
+from ctypes import c_char_p, c_double, c_int, c_void_p, CDLL, POINTER, Structure, util
 from enum import Enum, IntEnum
 from ..exceptions import FontConfigNotFound
 
@@ -43,17 +43,30 @@ class FcFontSet(Structure):
 
 
 class FontConfig():
+    # The soname hasn't changed since fontconfig 2.0
+    LIBRARY_SONAME = "libfontconfig.so.1"
+
     def __init__(self) -> None:
 
-        font_config_library_name = util.find_library("fontconfig")
+        try:
+            # find_library spawns ldconfig or gcc, so try the soname first.
+            font_config = CDLL(FontConfig.LIBRARY_SONAME)
+        except OSError:
+            font_config_library_name = util.find_library("fontconfig")
 
-        if font_config_library_name is None:
-            raise FontConfigNotFound("You need to install FontConfig to get the fonts filename")
+            if font_config_library_name is None:
+                raise FontConfigNotFound("You need to install FontConfig to get the fonts filename")
 
-        font_config = CDLL(font_config_library_name)
+            font_config = CDLL(font_config_library_name)
 
         self.FC_FONTFORMAT = FontConfig.string_to_cstring("fontformat")
         self.FC_FILE = FontConfig.string_to_cstring("file")
+        self.FC_INDEX = FontConfig.string_to_cstring("index")
+        self.FC_FAMILY = FontConfig.string_to_cstring("family")
+        self.FC_STYLE = FontConfig.string_to_cstring("style")
+        self.FC_LANG = FontConfig.string_to_cstring("lang")
+        self.FC_SPACING = FontConfig.string_to_cstring("spacing")
+        self.FC_WEIGHT = FontConfig.string_to_cstring("weight")
 
         # https://www.freedesktop.org/software/fontconfig/fontconfig-devel/fcinitloadconfigandfonts.html
         self.FcInitLoadConfigAndFonts = font_config.FcInitLoadConfigAndFonts
@@ -80,6 +93,43 @@ class FontConfig():
         self.FcPatternGetString.restype = FC_RESULT
         self.FcPatternGetString.argtypes = [c_void_p, c_char_p, c_int, POINTER(c_char_p)]
 
+        # https://www.freedesktop.org/software/fontconfig/fontconfig-devel/fcpatternget-type.html
+        self.FcPatternGetInteger = font_config.FcPatternGetInteger
+        self.FcPatternGetInteger.restype = FC_RESULT
+        self.FcPatternGetInteger.argtypes = [c_void_p, c_char_p, c_int, POINTER(c_int)]
+
+        # https://www.freedesktop.org/software/fontconfig/fontconfig-devel/fcpatternadd-type.html
+        self.FcPatternAddString = font_config.FcPatternAddString
+        self.FcPatternAddString.restype = c_int
+        self.FcPatternAddString.argtypes = [c_void_p, c_char_p, c_char_p]
+
+        # https://www.freedesktop.org/software/fontconfig/fontconfig-devel/fcpatternadd-type.html
+        self.FcPatternAddInteger = font_config.FcPatternAddInteger
+        self.FcPatternAddInteger.restype = c_int
+        self.FcPatternAddInteger.argtypes = [c_void_p, c_char_p, c_int]
+
+        # Introduced in 2.12.92
+        if hasattr(font_config, "FcWeightFromOpenTypeDouble"):
+            # https://www.freedesktop.org/software/fontconfig/fontconfig-devel/fcrangecreatedouble.html
+            self.FcRangeCreateDouble = font_config.FcRangeCreateDouble
+            self.FcRangeCreateDouble.restype = c_void_p
+            self.FcRangeCreateDouble.argtypes = [c_double, c_double]
+
+            # https://www.freedesktop.org/software/fontconfig/fontconfig-devel/fcrangedestroy.html
+            self.FcRangeDestroy = font_config.FcRangeDestroy
+            self.FcRangeDestroy.restype = None
+            self.FcRangeDestroy.argtypes = [c_void_p]
+
+            # https://www.freedesktop.org/software/fontconfig/fontconfig-devel/fcpatternadd-type.html
+            self.FcPatternAddRange = font_config.FcPatternAddRange
+            self.FcPatternAddRange.restype = c_int
+            self.FcPatternAddRange.argtypes = [c_void_p, c_char_p, c_void_p]
+
+            # https://www.freedesktop.org/software/fontconfig/fontconfig-devel/fcweightfromopentypedouble.html
+            self.FcWeightFromOpenTypeDouble = font_config.FcWeightFromOpenTypeDouble
+            self.FcWeightFromOpenTypeDouble.restype = c_double
+            self.FcWeightFromOpenTypeDouble.argtypes = [c_double]
+
         # https://www.freedesktop.org/software/fontconfig/fontconfig-devel/fcconfigdestroy.html
         self.FcConfigDestroy = font_config.FcConfigDestroy
         self.FcConfigDestroy.restype = None
@@ -105,6 +155,11 @@ class FontConfig():
         self.FcConfigGetFontDirs.restype = c_void_p
         self.FcConfigGetFontDirs.argtypes = [c_void_p]
 
+        # https://fontconfig.pages.freedesktop.org/fontconfig/fontconfig-devel/fcconfiggetconfigfiles.html
+        self.FcConfigGetConfigFiles = font_config.FcConfigGetConfigFiles
+        self.FcConfigGetConfigFiles.restype = c_void_p
+        self.FcConfigGetConfigFiles.argtypes = [c_void_p]
+
         # Introduced in 2.11.0
         if hasattr(font_config, "FcStrListFirst"):
             # https://fontconfig.pages.freedesktop.org/fontconfig/fontconfig-devel/fcstrlistfirst.html
@@ -122,6 +177,11 @@ class FontConfig():
         self.FcStrListDone.restype = None
         self.FcStrListDone.argtypes = [c_void_p]
 
+        # https://fontconfig.pages.freedesktop.org/fontconfig/fontconfig-devel/fcconfiguptodate.html
+        self.FcConfigUptoDate = font_config.FcConfigUptoDate
+        self.FcConfigUptoDate.restype = c_int
+        self.FcConfigUptoDate.argtypes = [c_void_p]
+
         # https://fontconfig.pages.freedesktop.org/fontconfig/fontconfig-devel/fcconfiggetcurrent.html
         self.FcConfigGetCurrent = font_config.FcConfigGetCurrent
         self.FcConfigGetCurrent.restype = c_void_p
@@ -0,0 +1,443 @@
+import os
+import sys
+from .fontconfig import FC_FONT_FORMAT
+from .fontconfig_config import FontConfigConfig, FontPattern
+from .fontconfig_session import FontConfigSession
+from hashlib import md5
+from mmap import mmap, ACCESS_READ
+from struct import calcsize, error as StructError, Struct
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+from ..snapshot import FontsSnapshot, get_paths_mtime
+
+__all__ = [
+    "CachePattern",
+    "CacheValue",
+    "FcCacheContent",
+    "FontConfigCache",
+]
+
+CacheValue = Union[bool, bytes, int]
+# The object id and the values of each element of a <selectfont> pattern
+CachePattern = Tuple[Tuple[int, Tuple[CacheValue, ...]], ...]
+
+
+class FcCacheContent(NamedTuple):
+    """
+    Attributes:
+        directory (str): The directory described by the cache.
+        subdirs (List[str]): The subdirectories of the directory.
+        fonts_filename (List[str]): The TrueType and CFF fonts filename of the directory.
+        fonts_faces (List[Tuple[str, int]]): The filename and the face index of each TrueType and CFF font of the directory.
+        mtime_ns (int): The modification time of the directory for which the cache is valid.
+    """
+    directory: str
+    subdirs: List[str]
+    fonts_filename: List[str]
+    fonts_faces: List[Tuple[str, int]]
+    mtime_ns: int
+
+
+class FontConfigCache():
+    """
+    Read the fontconfig binary cache files (the *-le64.cache-8 files) without libfontconfig.
+
+    The caches are only trusted when they are still valid for the current mtime of their directory,
+    exactly like fontconfig does. If one directory doesn't have a valid cache, the reader gives up and
+    the caller has to load the fonts with libfontconfig.
+    """
+
+    # https://gitlab.freedesktop.org/fontconfig/fontconfig/-/blob/2.14.1/src/fcint.h
+    FC_CACHE_MAGIC_MMAP = 0xFC02FC04
+    # Only the layout of the version 8 has been checked. Other versions are loaded with libfontconfig.
+    SUPPORTED_CACHE_VERSIONS = (8,)
+    # Those structures use the native alignment of the machine that wrote the cache.
+    # The name of the cache contains the architecture, so only caches written by this architecture are read.
+    FC_CACHE = Struct("@Iinnniniq")  # magic, version, size, dir, dirs, dirs_count, set, checksum, checksum_nano
+    FC_FONT_SET = Struct("@iin")  # nfont, sfont, fonts
+    FC_PATTERN = Struct("@iin")  # num, size, elts_offset
+    FC_PATTERN_ELT = Struct("@in")  # object, values
+    FC_VALUE_LIST = Struct("@nin")  # next, value.type, value.u
+    FC_INTPTR = Struct("@n")
+
+    # https://gitlab.freedesktop.org/fontconfig/fontconfig/-/blob/2.14.1/src/fcobjs.h
+    FC_FILE_OBJECT = 21
+    FC_INDEX_OBJECT = 22
+    FC_FONTFORMAT_OBJECT = 37
+    # The objects with a string, integer or bool value that a <selectfont> pattern can test.
+    FC_OBJECTS = {
+        "family": 1,
+        "style": 3,
+        "fullname": 5,
+        "slant": 7,
+        "spacing": 13,
+        "foundry": 14,
+        "file": FC_FILE_OBJECT,
+        "index": FC_INDEX_OBJECT,
+        "outline": 24,
+        "scalable": 25,
+        "fontformat": FC_FONTFORMAT_OBJECT,
+        "decorative": 40,
+        "postscriptname": 46,
+        "color": 47,
+        "symbol": 48,
+        "variable": 50,
+        "fonthashint": 51,
+    }
+    # https://gitlab.freedesktop.org/fontconfig/fontconfig/-/blob/2.14.1/fontconfig/fontconfig.h
+    FC_TYPE_INTEGER = 1
+    FC_TYPE_STRING = 3
+    FC_TYPE_BOOL = 4
+
+    VALID_FONT_FORMATS = frozenset(font_format.value for font_format in (FC_FONT_FORMAT.FT_FONT_FORMAT_TRUETYPE, FC_FONT_FORMAT.FT_FONT_FORMAT_CFF))
+
+    @staticmethod
+    def get_architecture() -> Optional[str]:
+        """
+        Returns:
+            The architecture name fontconfig uses in the cache filename, or None if the layout isn't supported.
+        """
+        if calcsize("P") != 8:
+            return None
+        return ("le" if sys.byteorder == "little" else "be") + "64"
+
+
+    @staticmethod
+    def get_system_fonts_snapshot() -> Optional[FontsSnapshot]:
+        """
+        Returns:
+            A snapshot of the fonts built from the fontconfig caches.
+            None if a cache is missing or stale, if the configuration selects the fonts with a pattern that cannot be evaluated,
+            or if the parsed configuration may not be the one libfontconfig loads.
+        """
+        config = FontConfigConfig.get()
+        if not FontConfigCache.is_config_loaded_by_fontconfig(config):
+            return None
+        # With a sysroot, fontconfig names the caches after the directories without the sysroot.
+        if dict(config.environment).get("FONTCONFIG_SYSROOT"):
+            return None
+
+        accept_patterns = FontConfigCache.get_cache_patterns(config.accept_patterns)
+        reject_patterns = FontConfigCache.get_cache_patterns(config.reject_patterns)
+        if accept_patterns is None or reject_patterns is None:
+            return None
+
+        font_dirs = config.font_dirs
+        scanned_dirs = FontConfigCache.read_font_dirs(font_dirs, list(config.cache_dirs), accept_patterns, reject_patterns, config)
+        if scanned_dirs is None:
+            return None
+
+        fonts_filename = frozenset(font_filename for content in scanned_dirs.values() for font_filename in content.fonts_filename)
+        fonts_faces = frozenset(font_face for content in scanned_dirs.values() for font_face in content.fonts_faces)
+        # The missing font directories are also watched, since creating one of them adds fonts.
+        missing_dirs_mtime = get_paths_mtime(font_dir for font_dir in font_dirs if font_dir not in scanned_dirs)
+        scanned_dirs_mtime = tuple((font_dir, content.mtime_ns) for font_dir, content in scanned_dirs.items())
+
+        return FontsSnapshot(
+            fonts_filename,
+            config.environment,
+            config.paths_mtime + missing_dirs_mtime + scanned_dirs_mtime,
+            frozenset(scanned_dirs),
+            fonts_faces
+        )
+
+
+    @staticmethod
+    def is_config_loaded_by_fontconfig(config: FontConfigConfig) -> bool:
+        """
+        Parameters:
+            config (FontConfigConfig): The parsed configuration.
+        Returns:
+            False if the main configuration file wasn't found, since libfontconfig may have been built with
+            another configuration directory than /etc/fonts (FreeBSD, conda, Nix, Homebrew), or if libfontconfig
+            has already been loaded and it didn't load this file. True otherwise.
+        """
+        if config.config_filename is None:
+            return False
+
+        session = FontConfigSession.get_if_loaded()
+        if session is not None and session.config_files:
+            config_files = {os.path.normpath(config_file) for config_file in session.config_files}
+            return os.path.normpath(config.config_filename) in config_files
+
+        return True
+
+
+    @staticmethod
+    def get_cache_patterns(patterns: Iterable[FontPattern]) -> Optional[Tuple[CachePattern, ...]]:
+        """
+        Parameters:
+            patterns (Iterable[FontPattern]): The <selectfont> patterns of the configuration.
+        Returns:
+            The patterns with the object id of each <patelt> and with their values normalized for the comparison.
+            None if a pattern tests an object or a value type that the reader doesn't support.
+        """
+        cache_patterns = []
+
+        for pattern in patterns:
+            cache_pattern = []
+            for name, values in pattern:
+                fc_object = FontConfigCache.FC_OBJECTS.get(name.lower())
+                if fc_object is None or not values or any(value is None for value in values):
+                    return None
+                cache_pattern.append((fc_object, tuple(FontConfigCache._normalize_value(value) for value in values)))
+            cache_patterns.append(tuple(cache_pattern))
+
+        return tuple(cache_patterns)
+
+
+    @staticmethod
+    def read_font_dirs(
+        font_dirs: Iterable[str],
+        cache_dirs: List[str],
+        accept_patterns: Tuple[CachePattern, ...] = (),
+        reject_patterns: Tuple[CachePattern, ...] = (),
+        config: Optional[FontConfigConfig] = None
+    ) -> Optional[Dict[str, FcCacheContent]]:
+        """
+        Parameters:
+            font_dirs (Iterable[str]): The font directories. Their subdirectories are also read.
+            cache_dirs (List[str]): The fontconfig cache directories, by order of priority.
+            accept_patterns (Tuple[CachePattern, ...]): The fonts that match one of those patterns are always kept.
+            reject_patterns (Tuple[CachePattern, ...]): The other fonts that match one of those patterns are skipped.
+            config (Optional[FontConfigConfig]): If specified, the fonts and the subdirectories rejected by its <selectfont> globs are skipped,
+                like FcConfigAddCache does.
+        Returns:
+            The content of the cache of each existing directory.
+            None if one of the directories doesn't have a valid cache.
+        """
+        scanned_dirs: Dict[str, FcCacheContent] = {}
+        pending_dirs = list(font_dirs)
+
+        while pending_dirs:
+            font_dir = pending_dirs.pop()
+            if font_dir in scanned_dirs or not os.path.isdir(font_dir):
+                continue
+
+            content = FontConfigCache.read_font_dir(font_dir, cache_dirs, accept_patterns, reject_patterns, config)
+            if content is None:
+                return None
+
+            scanned_dirs[font_dir] = content
+            pending_dirs.extend(content.subdirs)
+
+        return scanned_dirs
+
+
+    @staticmethod
+    def read_font_dir(
+        font_dir: str,
+        cache_dirs: List[str],
+        accept_patterns: Tuple[CachePattern, ...] = (),
+        reject_patterns: Tuple[CachePattern, ...] = (),
+        config: Optional[FontConfigConfig] = None
+    ) -> Optional[FcCacheContent]:
+        """
+        Parameters:
+            font_dir (str): A font directory.
+            cache_dirs (List[str]): The fontconfig cache directories, by order of priority.
+            accept_patterns (Tuple[CachePattern, ...]): The fonts that match one of those patterns are always kept.
+            reject_patterns (Tuple[CachePattern, ...]): The other fonts that match one of those patterns are skipped.
+            config (Optional[FontConfigConfig]): If specified, the fonts and the subdirectories rejected by its <selectfont> globs are skipped,
+                like FcConfigAddCache does.
+        Returns:
+            The content of the first valid cache of the directory, or None if there isn't any.
+        """
+        architecture = FontConfigCache.get_architecture()
+        if architecture is None:
+            return None
+
+        try:
+            dir_stat = os.stat(font_dir)
+        except OSError:
+            return None
+
+        # https://gitlab.freedesktop.org/fontconfig/fontconfig/-/blob/2.14.1/src/fccache.c
+        cache_basename = md5(os.fsencode(font_dir)).hexdigest()
+        for cache_dir in cache_dirs:
+            for version in FontConfigCache.SUPPORTED_CACHE_VERSIONS:
+                cache_filename = os.path.join(cache_dir, f"{cache_basename}-{architecture}.cache-{version}")
+                content = FontConfigCache._read_cache_file(cache_filename, font_dir, dir_stat, accept_patterns, reject_patterns, config)
+                if content is not None:
+                    return content
+
+        return None
+
+
+    @staticmethod
+    def _read_cache_file(
+        cache_filename: str,
+        font_dir: str,
+        dir_stat: os.stat_result,
+        accept_patterns: Tuple[CachePattern, ...],
+        reject_patterns: Tuple[CachePattern, ...],
+        config: Optional[FontConfigConfig]
+    ) -> Optional[FcCacheContent]:
+        try:
+            with open(cache_filename, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as buffer:
+                return FontConfigCache._parse_cache(buffer, font_dir, dir_stat, accept_patterns, reject_patterns, config)
+        except (OSError, ValueError, StructError, UnicodeDecodeError):
+            # Missing, empty or corrupted cache
+            return None
+
+
+    @staticmethod
+    def _parse_cache(
+        buffer: mmap,
+        font_dir: str,
+        dir_stat: os.stat_result,
+        accept_patterns: Tuple[CachePattern, ...],
+        reject_patterns: Tuple[CachePattern, ...],
+        config: Optional[FontConfigConfig]
+    ) -> Optional[FcCacheContent]:
+        magic, version, size, dir_offset, dirs_offset, dirs_count, set_offset, checksum, checksum_nano = FontConfigCache.FC_CACHE.unpack_from(buffer, 0)
+
+        if magic != FontConfigCache.FC_CACHE_MAGIC_MMAP or version not in FontConfigCache.SUPPORTED_CACHE_VERSIONS or size != len(buffer):
+            return None
+
+        if FontConfigCache._read_string(buffer, dir_offset) != font_dir:
+            return None
+
+        # Same check as FcCacheTimeValid. The checksum is the mtime stored in a C int.
+        # https://gitlab.freedesktop.org/fontconfig/fontconfig/-/blob/2.14.1/src/fccache.c
+        mtime = ((dir_stat.st_mtime_ns // 1_000_000_000 + 2**31) % 2**32) - 2**31
+        if checksum != mtime or checksum_nano != dir_stat.st_mtime_ns % 1_000_000_000:
+            return None
+
+        subdirs = []
+        for i in range(dirs_count):
+            # The subdirectories are offset from the beginning of the dirs array.
+            subdir_offset, = FontConfigCache.FC_INTPTR.unpack_from(buffer, dirs_offset + i * FontConfigCache.FC_INTPTR.size)
+            subdir = FontConfigCache._read_string(buffer, dirs_offset + subdir_offset)
+            # Like FcConfigAddCache, the fonts of a rejected subdirectory aren't listed.
+            if config is None or config.accepts_filename(subdir):
+                subdirs.append(subdir)
+
+        fonts_filename: Dict[str, None] = {}
+        fonts_faces: Dict[Tuple[str, int], None] = {}
+        nfont, _, fonts_offset = FontConfigCache.FC_FONT_SET.unpack_from(buffer, set_offset)
+        fonts_array_offset = set_offset + FontConfigCache._decode_offset(fonts_offset)
+
+        objects = {FontConfigCache.FC_FILE_OBJECT, FontConfigCache.FC_INDEX_OBJECT, FontConfigCache.FC_FONTFORMAT_OBJECT}
+        objects.update(fc_object for pattern in accept_patterns + reject_patterns for fc_object, _ in pattern)
+
+        for i in range(nfont):
+            pattern_offset, = FontConfigCache.FC_INTPTR.unpack_from(buffer, fonts_array_offset + i * FontConfigCache.FC_INTPTR.size)
+            values = FontConfigCache._read_pattern_values(buffer, set_offset + FontConfigCache._decode_offset(pattern_offset), objects)
+
+            font_format = values.get(FontConfigCache.FC_FONTFORMAT_OBJECT, [None])[0]
+            font_filename = values.get(FontConfigCache.FC_FILE_OBJECT, [None])[0]
+            if not isinstance(font_format, bytes) or not isinstance(font_filename, bytes) or font_format not in FontConfigCache.VALID_FONT_FORMATS:
+                continue
+
+            # Decode with utf-8 since FcChar8
+            font_filename = os.path.join(font_dir, font_filename.decode())
+            # Like FcConfigAddCache, the globs are tested on the filename before the patterns are tested on the font.
+            if config is not None and not config.accepts_filename(font_filename):
+                continue
+
+            # Like FcConfigAcceptFont, the accept patterns have priority over the reject patterns.
+            if (
+                any(FontConfigCache._pattern_matches(pattern, values) for pattern in accept_patterns)
+                or not any(FontConfigCache._pattern_matches(pattern, values) for pattern in reject_patterns)
+            ):
+                index = values.get(FontConfigCache.FC_INDEX_OBJECT, [0])[0]
+                fonts_filename[font_filename] = None
+                # The high bits of the index are the named instance of a variable font, which is the same face.
+                fonts_faces[(font_filename, index & 0xFFFF if isinstance(index, int) else 0)] = None
+
+        return FcCacheContent(font_dir, subdirs, list(fonts_filename), list(fonts_faces), dir_stat.st_mtime_ns)
+
+
+    @staticmethod
+    def _read_pattern_values(buffer: mmap, pattern_offset: int, objects: Set[int]) -> Dict[int, List[CacheValue]]:
+        """
+        Returns:
+            The string, integer and bool values of the requested objects of a serialized FcPattern.
+        """
+        values: Dict[int, List[CacheValue]] = {}
+        num, _, elts_offset = FontConfigCache.FC_PATTERN.unpack_from(buffer, pattern_offset)
+
+        for i in range(num):
+            elt_offset = pattern_offset + elts_offset + i * FontConfigCache.FC_PATTERN_ELT.size
+            fc_object, values_offset = FontConfigCache.FC_PATTERN_ELT.unpack_from(buffer, elt_offset)
+
+            if fc_object not in objects:
+                continue
+
+            object_values = values[fc_object] = []
+            value_list_offset = elt_offset + FontConfigCache._decode_offset(values_offset)
+            while True:
+                next_offset, value_type, value = FontConfigCache.FC_VALUE_LIST.unpack_from(buffer, value_list_offset)
+
+                if value_type == FontConfigCache.FC_TYPE_STRING:
+                    # The string is an encoded offset from the FcValue, which is after the next pointer.
+                    value_offset = value_list_offset + FontConfigCache.FC_INTPTR.size
+                    object_values.append(FontConfigCache._read_bytes(buffer, value_offset + FontConfigCache._decode_offset(value)))
+                elif value_type in (FontConfigCache.FC_TYPE_INTEGER, FontConfigCache.FC_TYPE_BOOL):
+                    # The union is bigger than the int it contains.
+                    integer = ((value & 0xFFFFFFFF) ^ 0x80000000) - 0x80000000
+                    object_values.append(bool(integer) if value_type == FontConfigCache.FC_TYPE_BOOL else integer)
+
+                # The next value is an encoded offset from the current one.
+                if next_offset == 0:
+                    break
+                value_list_offset += FontConfigCache._decode_offset(next_offset)
+
+        return values
+
+
+    @staticmethod
+    def _pattern_matches(pattern: CachePattern, values: Dict[int, List[CacheValue]]) -> bool:
+        """
+        Like FcListPatternMatchAny, each object of the pattern must have one value in common with the font.
+        """
+        for fc_object, pattern_values in pattern:
+            font_values = values.get(fc_object)
+            if not font_values:
+                return False
+
+            font_values = [FontConfigCache._normalize_value(font_value) for font_value in font_values]
+            if not any(
+                pattern_value == font_value and type(pattern_value) is type(font_value)
+                for pattern_value in pattern_values
+                for font_value in font_values
+            ):
+                return False
+        return True
+
+
+    @staticmethod
+    def _normalize_value(value: Union[bool, bytes, int, str]) -> CacheValue:
+        """
+        Like FcListValueListMatchAny, the strings are compared without the case and the spaces.
+        """
+        if isinstance(value, str):
+            # Encode with utf-8 since FcChar8
+            value = value.encode()
+        if isinstance(value, bytes):
+            return value.replace(b" ", b"").lower()
+        return value
+
+
+    @staticmethod
+    def _decode_offset(encoded_offset: int) -> int:
+        # https://gitlab.freedesktop.org/fontconfig/fontconfig/-/blob/2.14.1/src/fcint.h
+        if not encoded_offset & 1:
+            raise ValueError("The pointer isn't an encoded offset.")
+        return encoded_offset & ~1
+
+
+    @staticmethod
+    def _read_bytes(buffer: Union[bytes, mmap], offset: int) -> bytes:
+        if offset < 0:
+            raise ValueError("Invalid offset")
+        end = buffer.find(b"\0", offset)
+        if end == -1:
+            raise ValueError("Unterminated string")
+        return buffer[offset:end]
+
+
+    @staticmethod
+    def _read_string(buffer: mmap, offset: int) -> str:
+        # Decode with utf-8 since FcChar8
+        return FontConfigCache._read_bytes(buffer, offset).decode()
@@ -0,0 +1,368 @@
+import os
+import re
+from .fontconfig_defaults import DEFAULT_CONFIG_FILE, DEFAULT_CONFIG_PATH, FALLBACK_CONFIG
+from .fontconfig_session import FontConfigSession
+from threading import Lock
+from typing import Dict, List, Optional, Pattern, Set, Tuple, Union
+from xml.etree import ElementTree
+from ..snapshot import get_environment, get_paths_mtime
+
+__all__ = [
+    "FontConfigConfig",
+    "FontPattern",
+    "FontPatternValue",
+]
+
+FontPatternValue = Union[bool, int, str, None]
+# The name and the values of each <patelt> of a <pattern>
+FontPattern = Tuple[Tuple[str, Tuple[FontPatternValue, ...]], ...]
+
+
+class FontConfigConfig():
+    """
+    The directories and the font selection rules of the fontconfig configuration, read without libfontconfig.
+
+    Only the elements that decide which files are fonts are interpreted:
+    <dir>, <cachedir>, <include>, <reset-dirs/> and <selectfont>.
+    Use FontConfigConfig.get() to get the configuration. It is only parsed again when
+    the environment or one of the configuration files and directories changed.
+
+    Attributes:
+        font_dirs (Tuple[str, ...]): The font directories, without their subdirectories.
+        cache_dirs (Tuple[str, ...]): The cache directories, by order of priority.
+        accept_globs (Tuple[str, ...]): The <acceptfont> globs.
+        reject_globs (Tuple[str, ...]): The <rejectfont> globs.
+        accept_patterns (Tuple[FontPattern, ...]): The <acceptfont> patterns.
+        reject_patterns (Tuple[FontPattern, ...]): The <rejectfont> patterns.
+            The patterns match the font properties, so they cannot be applied to a filename.
+            A value is None when its type isn't supported.
+        environment (Tuple[Tuple[str, Optional[str]], ...]): The environment variables used to read the configuration.
+        paths_mtime (Tuple[Tuple[str, int], ...]): The configuration files and directories that were read
+            or that would have been read if they existed, with their modification time.
+        config_filename (Optional[str]): The main configuration file. None if it couldn't be found or loaded,
+            so the configuration is the fallback one of fontconfig. Since the configuration directory libfontconfig
+            was built with isn't always /etc/fonts, a fallback configuration may not be the one libfontconfig uses.
+    """
+    __slots__ = (
+        "font_dirs",
+        "cache_dirs",
+        "accept_globs",
+        "reject_globs",
+        "accept_patterns",
+        "reject_patterns",
+        "environment",
+        "paths_mtime",
+        "config_filename",
+        "_accept_regex",
+        "_reject_regex",
+    )
+
+    _cached_config: Optional["FontConfigConfig"] = None
+    _cached_config_lock = Lock()
+
+    def __init__(
+        self,
+        font_dirs: Tuple[str, ...],
+        cache_dirs: Tuple[str, ...],
+        accept_globs: Tuple[str, ...],
+        reject_globs: Tuple[str, ...],
+        accept_patterns: Tuple[FontPattern, ...],
+        reject_patterns: Tuple[FontPattern, ...],
+        environment: Tuple[Tuple[str, Optional[str]], ...],
+        paths_mtime: Tuple[Tuple[str, int], ...],
+        config_filename: Optional[str] = None
+    ) -> None:
+        self.font_dirs = font_dirs
+        self.cache_dirs = cache_dirs
+        self.accept_globs = accept_globs
+        self.reject_globs = reject_globs
+        self.accept_patterns = accept_patterns
+        self.reject_patterns = reject_patterns
+        self.environment = environment
+        self.paths_mtime = paths_mtime
+        self.config_filename = config_filename
+        self._accept_regex = FontConfigConfig._compile_globs(accept_globs)
+        self._reject_regex = FontConfigConfig._compile_globs(reject_globs)
+
+
+    @staticmethod
+    def get() -> "FontConfigConfig":
+        """
+        Returns:
+            The current configuration. The previous one is reused if it is still up to date.
+        """
+        config = FontConfigConfig._cached_config
+        if config is not None and config.is_up_to_date():
+            return config
+
+        with FontConfigConfig._cached_config_lock:
+            config = FontConfigConfig._cached_config
+            if config is not None and config.is_up_to_date():
+                return config
+
+            config = FontConfigConfig.load()
+            FontConfigConfig._cached_config = config
+            return config
+
+
+    @staticmethod
+    def load() -> "FontConfigConfig":
+        """
+        Returns:
+            The configuration parsed from the configuration files, like FcInitLoadConfig does.
+        """
+        return _FontConfigParser().parse()
+
+
+    def is_up_to_date(self) -> bool:
+        """
+        Returns:
+            True if none of the environment variables, files and directories
+            that were used to read the configuration have changed, False otherwise.
+        """
+        if get_environment(FontConfigSession.ENVIRONMENT_VARIABLES) != self.environment:
+            return False
+
+        return get_paths_mtime(path for path, _ in self.paths_mtime) == self.paths_mtime
+
+
+    def accepts_filename(self, filename: str) -> bool:
+        """
+        Like FcConfigAcceptFilename, the <acceptfont> globs have priority over the <rejectfont> globs.
+
+        Parameters:
+            filename (str): A font file or a font directory.
+        Returns:
+            True if fontconfig would scan the file, False otherwise.
+        """
+        if self._accept_regex is not None and self._accept_regex.match(filename):
+            return True
+        return self._reject_regex is None or not self._reject_regex.match(filename)
+
+
+    @staticmethod
+    def _compile_globs(globs: Tuple[str, ...]) -> Optional[Pattern[str]]:
+        """
+        FcStrGlobMatch only knows * and ?, and * also matches the directory separators.
+        """
+        if not globs:
+            return None
+
+        regexes = (re.escape(glob).replace(r"\*", ".*").replace(r"\?", ".") for glob in globs)
+        return re.compile("|".join(f"(?:{regex})" for regex in regexes) + r"\Z", re.DOTALL)
+
+
+class _FontConfigParser():
+    """
+    Parse the fontconfig configuration files.
+    https://www.freedesktop.org/software/fontconfig/fontconfig-user.html
+    """
+
+    def __init__(self) -> None:
+        self.environment = get_environment(FontConfigSession.ENVIRONMENT_VARIABLES)
+        self.sysroot = os.environ.get("FONTCONFIG_SYSROOT") or None
+
+        self.font_dirs: Dict[str, None] = {}
+        self.cache_dirs: Dict[str, None] = {}
+        self.accept_globs: List[str] = []
+        self.reject_globs: List[str] = []
+        self.accept_patterns: List[FontPattern] = []
+        self.reject_patterns: List[FontPattern] = []
+        self.paths_mtime: Dict[str, int] = {}
+        self.loaded_paths: Set[str] = set()
+
+
+    def parse(self) -> FontConfigConfig:
+        config_filename = self._find_config_filename(os.environ.get("FONTCONFIG_FILE") or DEFAULT_CONFIG_FILE)
+
+        # Like FcInitLoadOwnConfig, a missing main configuration file also loads the fallback configuration.
+        if config_filename is None or not self._load(config_filename, False):
+            # Discard what a broken main configuration may have added, like fontconfig does.
+            self.font_dirs.clear()
+            self.cache_dirs.clear()
+            self.accept_globs.clear()
+            self.reject_globs.clear()
+            self.accept_patterns.clear()
+            self.reject_patterns.clear()
+            self._parse_element(ElementTree.fromstring(FALLBACK_CONFIG), DEFAULT_CONFIG_PATH)
+            config_filename = None
+
+        return FontConfigConfig(
+            tuple(self.font_dirs),
+            tuple(self.cache_dirs),
+            tuple(self.accept_globs),
+            tuple(self.reject_globs),
+            tuple(self.accept_patterns),
+            tuple(self.reject_patterns),
+            self.environment,
+            tuple(self.paths_mtime.items()),
+            config_filename
+        )
+
+
+    def _find_config_filename(self, name: str) -> Optional[str]:
+        """
+        Like FcConfigGetFilename, resolve a configuration name to a path.
+        A relative name is searched in the FONTCONFIG_PATH directories and then in the default configuration directory.
+        """
+        if name.startswith("~"):
+            return os.path.expanduser(name)
+
+        if os.path.isabs(name):
+            return self._add_sysroot(name)
+
+        config_dirs = [config_dir for config_dir in os.environ.get("FONTCONFIG_PATH", "").split(os.pathsep) if config_dir]
+        config_dirs.append(DEFAULT_CONFIG_PATH)
+
+        for config_dir in config_dirs:
+            filename = self._add_sysroot(os.path.join(config_dir, name))
+            if self._stat(filename) != -1:
+                return filename
+
+        return None
+
+
+    def _add_sysroot(self, path: str) -> str:
+        if self.sysroot is None or path.startswith(self.sysroot):
+            return path
+        return os.path.join(self.sysroot, path.lstrip(os.sep))
+
+
+    def _stat(self, path: str) -> int:
+        """
+        Record the modification time of a path before it is read, so a change made while it is read makes the configuration stale.
+        """
+        if path not in self.paths_mtime:
+            self.paths_mtime[path] = get_paths_mtime((path,))[0][1]
+        return self.paths_mtime[path]
+
+
+    def _load(self, filename: str, ignore_missing: bool) -> bool:
+        """
+        Returns:
+            True if the file or the directory has been loaded, False otherwise.
+        """
+        if self._stat(filename) == -1:
+            return ignore_missing
+        # A configuration is only loaded once, which also stops the inclusion cycles.
+        if filename in self.loaded_paths:
+            return True
+        self.loaded_paths.add(filename)
+
+        if os.path.isdir(filename):
+            # Only the files that start with a digit and end with .conf are loaded, sorted by name.
+            try:
+                names = sorted(name for name in os.listdir(filename) if name[:1].isdigit() and name.endswith(".conf"))
+            except OSError:
+                return False
+
+            for name in names:
+                self._load(os.path.join(filename, name), True)
+            return True
+
+        try:
+            root = ElementTree.parse(filename).getroot()
+        except (OSError, ElementTree.ParseError):
+            return False
+
+        if root.tag != "fontconfig":
+            return False
+
+        self._parse_element(root, os.path.dirname(filename))
+        return True
+
+
+    def _parse_element(self, root: ElementTree.Element, config_dir: str) -> None:
+        for element in root:
+            if element.tag == "dir":
+                path = self._get_path(element, "XDG_DATA_HOME", os.path.join(".local", "share"), config_dir)
+                if path is not None:
+                    self.font_dirs[self._add_sysroot(path)] = None
+            elif element.tag == "cachedir":
+                path = self._get_path(element, "XDG_CACHE_HOME", ".cache", config_dir)
+                if path is not None:
+                    self.cache_dirs[self._add_sysroot(path)] = None
+            elif element.tag == "reset-dirs":
+                self.font_dirs.clear()
+            elif element.tag == "include":
+                self._parse_include(element)
+            elif element.tag == "selectfont":
+                self._parse_selectfont(element)
+
+
+    def _parse_include(self, element: ElementTree.Element) -> None:
+        name = (element.text or "").strip()
+        if not name:
+            return
+
+        if element.get("prefix") == "xdg":
+            name = os.path.join(self._get_xdg_dir("XDG_CONFIG_HOME", ".config"), name)
+
+        filename = self._find_config_filename(name)
+        if filename is not None:
+            self._load(filename, element.get("ignore_missing") == "yes")
+
+
+    def _parse_selectfont(self, element: ElementTree.Element) -> None:
+        for selector in element:
+            if selector.tag == "acceptfont":
+                globs, patterns = self.accept_globs, self.accept_patterns
+            elif selector.tag == "rejectfont":
+                globs, patterns = self.reject_globs, self.reject_patterns
+            else:
+                continue
+
+            for child in selector:
+                if child.tag == "glob" and child.text:
+                    globs.append(child.text.strip())
+                elif child.tag == "pattern":
+                    patterns.append(tuple(
+                        (patelt.get("name", ""), tuple(_FontConfigParser._parse_value(value) for value in patelt))
+                        for patelt in child if patelt.tag == "patelt"
+                    ))
+
+
+    @staticmethod
+    def _parse_value(element: ElementTree.Element) -> FontPatternValue:
+        text = (element.text or "").strip()
+
+        if element.tag == "string":
+            return text
+        if element.tag == "int":
+            try:
+                return int(text)
+            except ValueError:
+                return None
+        if element.tag == "bool":
+            # Like FcNameBool
+            if text[:1] in ("t", "T", "y", "Y", "1") or text.lower() == "on":
+                return True
+            if text[:1] in ("f", "F", "n", "N", "0") or text.lower() == "off":
+                return False
+        return None
+
+
+    def _get_path(self, element: ElementTree.Element, xdg_variable_name: str, xdg_default: str, config_dir: str) -> Optional[str]:
+        """
+        Resolve the path of a <dir> or a <cachedir> element with its prefix attribute.
+        """
+        path = (element.text or "").strip()
+        if not path:
+            return None
+
+        prefix = element.get("prefix")
+        if prefix == "xdg":
+            path = os.path.join(self._get_xdg_dir(xdg_variable_name, xdg_default), path)
+        elif prefix == "relative":
+            path = os.path.join(config_dir, path)
+        elif path.startswith("~"):
+            path = os.path.expanduser(path)
+
+        # Like FcStrCanonFilename, the relative paths are relative to the current directory.
+        return os.path.normpath(os.path.abspath(path))
+
+
+    @staticmethod
+    def _get_xdg_dir(variable_name: str, default: str) -> str:
+        # https://specifications.freedesktop.org/basedir-spec/latest/
+        return os.environ.get(variable_name) or os.path.join(os.path.expanduser("~"), default)
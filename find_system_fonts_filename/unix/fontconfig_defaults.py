@@ -0,0 +1,30 @@
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "DEFAULT_CONFIG_DIR",
+    "DEFAULT_CONFIG_FILE",
+    "DEFAULT_CONFIG_PATH",
+    "DEFAULT_FONT_DIRS",
+    "FALLBACK_CONFIG",
+]
+
+# The values fontconfig is usually built with.
+# https://gitlab.freedesktop.org/fontconfig/fontconfig/-/blob/2.14.1/meson.build
+DEFAULT_CONFIG_PATH = "/etc/fonts"
+DEFAULT_CONFIG_FILE = "fonts.conf"
+DEFAULT_CONFIG_DIR = "/etc/fonts/conf.d"
+DEFAULT_CACHE_DIR = "/var/cache/fontconfig"
+DEFAULT_FONT_DIRS = ("/usr/share/fonts",)
+
+# The configuration fontconfig uses when the main configuration file cannot be loaded.
+# https://gitlab.freedesktop.org/fontconfig/fontconfig/-/blob/2.14.1/src/fcinit.c
+FALLBACK_CONFIG = (
+    "<fontconfig>"
+    + "".join(f"<dir>{font_dir}</dir>" for font_dir in DEFAULT_FONT_DIRS)
+    + "<dir prefix=\"xdg\">fonts</dir>"
+    + f"<cachedir>{DEFAULT_CACHE_DIR}</cachedir>"
+    + "<cachedir prefix=\"xdg\">fontconfig</cachedir>"
+    + f"<include ignore_missing=\"yes\">{DEFAULT_CONFIG_DIR}</include>"
+    + "<include ignore_missing=\"yes\" prefix=\"xdg\">fontconfig/conf.d</include>"
+    + "<include ignore_missing=\"yes\" prefix=\"xdg\">fontconfig/fonts.conf</include>"
+    + "</fontconfig>"
+)
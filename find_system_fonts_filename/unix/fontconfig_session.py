@@ -0,0 +1,281 @@
+import os
+from .fontconfig import FontConfig
+from contextlib import contextmanager
+from ctypes import c_void_p
+from threading import Lock
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+from ..instrumentation import span
+from ..read_write_lock import ReadWriteLock
+from ..snapshot import get_environment, get_paths_mtime
+
+__all__ = [
+    "FontConfigSession",
+    "LoadedFontConfig",
+]
+
+
+class LoadedFontConfig():
+    """
+    A FcConfig with the state it has been loaded from.
+
+    It is reference counted by the session: it is destroyed when it has been replaced
+    by a newer FcConfig and no thread uses it anymore.
+
+    Attributes:
+        config (c_void_p): The FcConfig. It must not be destroyed by the caller.
+        environment: The environment variables that were used to load the FcConfig.
+        paths_mtime: The font directories and configuration files of the FcConfig with their modification time.
+        font_dirs: The font directories, including their subdirectories, of the FcConfig.
+        config_files: The configuration files that fontconfig loaded.
+    """
+    __slots__ = ("config", "environment", "paths_mtime", "font_dirs", "config_files", "_references")
+
+    def __init__(
+        self,
+        config: c_void_p,
+        environment: Tuple[Tuple[str, Optional[str]], ...],
+        paths_mtime: Tuple[Tuple[str, int], ...],
+        font_dirs: FrozenSet[str],
+        config_files: FrozenSet[str] = frozenset()
+    ) -> None:
+        self.config = config
+        self.environment = environment
+        self.paths_mtime = paths_mtime
+        self.font_dirs = font_dirs
+        self.config_files = config_files
+        self._references = 0
+
+
+class FontConfigSession():
+    """
+    A long-lived fontconfig session.
+
+    The fontconfig library is loaded once per process and the FcConfig is kept
+    until fontconfig, the environment or the watched files report that it is stale.
+    Use FontConfigSession.get() to get the process-wide session.
+
+    The session is thread-safe. The readers (config()) share the current FcConfig and run concurrently.
+    The writers (write_config(), used to install and uninstall fonts) modify the FcConfig,
+    so they run one at a time and while no reader uses it.
+    When the FcConfig is stale, the next reader loads a new one, and the old one is destroyed
+    once the readers that still use it are done.
+    """
+
+    # The environment variables that change which fonts fontconfig finds.
+    ENVIRONMENT_VARIABLES = (
+        "FONTCONFIG_FILE",
+        "FONTCONFIG_PATH",
+        "FONTCONFIG_SYSROOT",
+        "HOME",
+        "XDG_CACHE_HOME",
+        "XDG_CONFIG_HOME",
+        "XDG_DATA_HOME",
+    )
+
+    _instance: Optional["FontConfigSession"] = None
+    _instance_lock = Lock()
+
+    def __init__(self) -> None:
+        with span("unix.library_load"):
+            self.font_config = FontConfig()
+        # _lock protects _loaded_config and the references, _rw_lock separates the readers from the writers.
+        self._lock = Lock()
+        self._rw_lock = ReadWriteLock()
+        self._loaded_config: Optional[LoadedFontConfig] = None
+
+
+    @staticmethod
+    def get() -> "FontConfigSession":
+        """
+        Returns:
+            The process-wide session. It is created on the first call.
+        """
+        if FontConfigSession._instance is None:
+            with FontConfigSession._instance_lock:
+                if FontConfigSession._instance is None:
+                    FontConfigSession._instance = FontConfigSession()
+
+        return FontConfigSession._instance
+
+
+    @staticmethod
+    def get_if_loaded() -> Optional["FontConfigSession"]:
+        """
+        Returns:
+            The process-wide session, or None if it hasn't been created yet. Unlike get, it never loads fontconfig.
+        """
+        return FontConfigSession._instance
+
+
+    @contextmanager
+    def config(self) -> Iterator[LoadedFontConfig]:
+        """
+        Yield an up to date FcConfig to read it. Many threads can use it at the same time.
+        """
+        with self._rw_lock.read():
+            loaded_config = self._acquire_config()
+            try:
+                yield loaded_config
+            finally:
+                self._release_config(loaded_config)
+
+
+    @contextmanager
+    def write_config(self) -> Iterator[LoadedFontConfig]:
+        """
+        Yield an up to date FcConfig to modify it, for example with FcDirCacheRescan.
+        It waits until no other thread uses the FcConfig.
+        """
+        with self._rw_lock.write():
+            loaded_config = self._acquire_config()
+            try:
+                yield loaded_config
+            finally:
+                self._release_config(loaded_config)
+
+
+    @property
+    def environment(self) -> Tuple[Tuple[str, Optional[str]], ...]:
+        """
+        The environment variables that were used to load the current FcConfig.
+        """
+        loaded_config = self._loaded_config
+        return loaded_config.environment if loaded_config is not None else ()
+
+
+    @property
+    def paths_mtime(self) -> Tuple[Tuple[str, int], ...]:
+        """
+        The font directories and configuration files of the current FcConfig with their modification time.
+        """
+        loaded_config = self._loaded_config
+        return loaded_config.paths_mtime if loaded_config is not None else ()
+
+
+    @property
+    def config_files(self) -> FrozenSet[str]:
+        """
+        The configuration files that fontconfig loaded for the current FcConfig.
+        """
+        loaded_config = self._loaded_config
+        return loaded_config.config_files if loaded_config is not None else frozenset()
+
+
+    @property
+    def font_dirs(self) -> FrozenSet[str]:
+        """
+        The font directories, including their subdirectories, of the current FcConfig.
+        """
+        loaded_config = self._loaded_config
+        return loaded_config.font_dirs if loaded_config is not None else frozenset()
+
+
+    def is_config_up_to_date(self) -> bool:
+        """
+        Returns:
+            True if the session has a FcConfig and it is still up to date, False otherwise.
+        """
+        # FcConfigUptoDate modifies the FcConfig, so it must not run while a writer uses it.
+        with self._rw_lock.read(), self._lock:
+            return self._loaded_config is not None and self._is_config_up_to_date(self._loaded_config)
+
+
+    def get_font_dirs(self, config: c_void_p) -> List[str]:
+        return self.get_str_list(self.font_config.FcConfigGetFontDirs(config))
+
+
+    def get_str_list(self, str_list: c_void_p) -> List[str]:
+        """
+        Parameters:
+            str_list (c_void_p): An FcStrList. It will be destroyed.
+        Returns:
+            The decoded strings of the FcStrList.
+        """
+        strings = []
+
+        if hasattr(self.font_config, "FcStrListFirst"):
+            self.font_config.FcStrListFirst(str_list)
+
+        while True:
+            string = self.font_config.FcStrListNext(str_list)
+            if not string:
+                break
+            # Decode with utf-8 since FcChar8
+            strings.append(string.decode())
+
+        self.font_config.FcStrListDone(str_list)
+
+        return strings
+
+
+    def _acquire_config(self) -> LoadedFontConfig:
+        with self._lock:
+            if self._loaded_config is None or not self._is_config_up_to_date(self._loaded_config):
+                self._load_config()
+            self._loaded_config._references += 1
+            return self._loaded_config
+
+
+    def _release_config(self, loaded_config: LoadedFontConfig) -> None:
+        with self._lock:
+            loaded_config._references -= 1
+            if loaded_config._references == 0 and loaded_config is not self._loaded_config:
+                self.font_config.FcConfigDestroy(loaded_config.config)
+
+
+    def _is_config_up_to_date(self, loaded_config: LoadedFontConfig) -> bool:
+        # FcConfigUptoDate only has a precision of one second, so the modification time
+        # in nanoseconds of the watched files is also compared.
+        return (
+            get_environment(FontConfigSession.ENVIRONMENT_VARIABLES) == loaded_config.environment
+            and self.font_config.FcConfigUptoDate(loaded_config.config)
+            and get_paths_mtime(path for path, _ in loaded_config.paths_mtime) == loaded_config.paths_mtime
+        )
+
+
+    def _load_config(self) -> None:
+        with span("unix.config_load"):
+            # The environment and the paths are read before fontconfig scans the fonts, so a font added
+            # during the scan changes the mtime of its directory after it was recorded, and the FcConfig is stale.
+            environment = get_environment(FontConfigSession.ENVIRONMENT_VARIABLES)
+            previous_paths_mtime = dict(get_paths_mtime(self._get_known_paths()))
+            config = self.font_config.FcInitLoadConfigAndFonts()
+
+            # The font directories include all their subdirectories, so their mtime change when a font is added or removed.
+            # The directories of the configuration files are also watched to detect new configuration files in conf.d.
+            font_dirs = self.get_font_dirs(config)
+            config_files = self.get_str_list(self.font_config.FcConfigGetConfigFiles(config))
+            config_dirs = dict.fromkeys(os.path.dirname(config_file) for config_file in config_files)
+            watched_paths = list(dict.fromkeys([*font_dirs, *config_files, *config_dirs]))
+            # Only the paths that weren't known before the scan are read now. It can only happen on the first load,
+            # or when the configuration added a directory.
+            new_paths_mtime = dict(get_paths_mtime(path for path in watched_paths if path not in previous_paths_mtime))
+            paths_mtime = tuple(
+                (path, previous_paths_mtime[path] if path in previous_paths_mtime else new_paths_mtime[path])
+                for path in watched_paths
+            )
+
+        # The previous FcConfig is destroyed by the last thread that uses it.
+        previous_config = self._loaded_config
+        self._loaded_config = LoadedFontConfig(config, environment, paths_mtime, frozenset(font_dirs), frozenset(config_files))
+        if previous_config is not None and previous_config._references == 0:
+            self.font_config.FcConfigDestroy(previous_config.config)
+
+
+    def _get_known_paths(self) -> List[str]:
+        """
+        Returns:
+            The paths that the next FcConfig will probably watch: the ones of the current FcConfig,
+            and the font directories and configuration files found by parsing the configuration.
+        """
+        known_paths: Dict[str, None] = {}
+        if self._loaded_config is not None:
+            known_paths.update((path, None) for path, _ in self._loaded_config.paths_mtime)
+
+        # Imported here since fontconfig_config imports this module.
+        from .fontconfig_config import FontConfigConfig
+        parsed_config = FontConfigConfig.get()
+        known_paths.update((path, None) for path in parsed_config.font_dirs)
+        known_paths.update((path, None) for path, _ in parsed_config.paths_mtime)
+
+        return list(known_paths)
@@ -0,0 +1,269 @@
+import logging
+import os
+from .inotify import Inotify, IN_FLAGS, IN_MASK
+from asyncio import AbstractEventLoop, ensure_future, Future, get_running_loop, iscoroutine, iscoroutinefunction, TimerHandle
+from select import select
+from threading import Lock, Thread
+from time import monotonic
+from typing import Callable, Dict, FrozenSet, Optional, Set
+from ..exceptions import FindSystemFontsFilenameException
+from ..fonts_filename import get_system_fonts_changes
+from ..snapshot import FontsChanges, FontsChangeToken
+
+__all__ = ["FontsWatcher"]
+
+_logger = logging.getLogger(__name__)
+
+FontsChangedCallback = Callable[[FrozenSet[str], FrozenSet[str]], None]
+
+
+class FontsWatcher():
+    """
+    Watch the fontconfig font directories and configuration files with inotify
+    and call a callback with the added and removed fonts filename.
+
+    A burst of events (for example, a package manager installing hundreds of fonts)
+    only produces one refresh: the snapshot is rebuilt once no event has been
+    received for debounce_delay seconds.
+
+    The watcher can run in its own thread with start() or in an asyncio event loop with start_asyncio().
+    """
+
+    DIRECTORY_MASK = (
+        IN_MASK.IN_CREATE
+        | IN_MASK.IN_DELETE
+        | IN_MASK.IN_MOVED_FROM
+        | IN_MASK.IN_MOVED_TO
+        | IN_MASK.IN_CLOSE_WRITE
+        | IN_MASK.IN_ATTRIB
+        | IN_MASK.IN_DELETE_SELF
+        | IN_MASK.IN_MOVE_SELF
+        | IN_MASK.IN_ONLYDIR
+    )
+
+    def __init__(self, callback: FontsChangedCallback, debounce_delay: float = 0.1) -> None:
+        """
+        Args:
+            callback: Called with the added and removed fonts filename. In asyncio mode, it can be a coroutine function.
+                In thread mode, there is no event loop to run a coroutine, so it must be a regular function.
+            debounce_delay: The number of seconds without any event before the fonts are enumerated again.
+        """
+        self.callback = callback
+        self.debounce_delay = debounce_delay
+
+        self._inotify = Inotify()
+        self._fd: Optional[int] = None
+        self._watches: Dict[str, int] = {}
+        self._token: Optional[FontsChangeToken] = None
+        self._lock = Lock()
+
+        # Thread mode
+        self._thread: Optional[Thread] = None
+        self._stop_pipe: Optional[tuple] = None
+
+        # Asyncio mode
+        self._loop: Optional[AbstractEventLoop] = None
+        self._timer: Optional[TimerHandle] = None
+        self._refresh_future: Optional[Future] = None
+
+
+    @property
+    def is_running(self) -> bool:
+        return self._fd is not None
+
+
+    def start(self) -> None:
+        """
+        Start watching the fonts in a daemon thread. The callback must be a regular function.
+        """
+        if iscoroutinefunction(self.callback):
+            raise TypeError("The callback of a FontsWatcher started in a thread cannot be a coroutine function. Use start_asyncio().")
+
+        self._open()
+        self._stop_pipe = os.pipe()
+        self._thread = Thread(target=self._run_thread, name="FontsWatcher", daemon=True)
+        self._thread.start()
+
+
+    def start_asyncio(self, loop: Optional[AbstractEventLoop] = None) -> None:
+        """
+        Start watching the fonts in an asyncio event loop with loop.add_reader.
+
+        Args:
+            loop: The event loop. If None, the running event loop is used.
+        """
+        self._loop = loop if loop is not None else get_running_loop()
+        self._open()
+        self._loop.add_reader(self._fd, self._on_asyncio_readable)
+
+
+    def stop(self) -> None:
+        """
+        Stop watching the fonts. The callback won't be called anymore.
+        """
+        if self._fd is None:
+            return
+
+        if self._thread is not None:
+            os.write(self._stop_pipe[1], b"\0")
+            self._thread.join()
+            self._thread = None
+            for fd in self._stop_pipe:
+                os.close(fd)
+            self._stop_pipe = None
+
+        if self._loop is not None:
+            self._loop.remove_reader(self._fd)
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._refresh_future is not None:
+                # A refresh that is already running in the executor cannot be cancelled, so the lock waits for it.
+                self._refresh_future.cancel()
+                self._refresh_future = None
+            self._loop = None
+
+        with self._lock:
+            os.close(self._fd)
+            self._fd = None
+            self._watches.clear()
+
+
+    def __enter__(self) -> "FontsWatcher":
+        self.start()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+    def _open(self) -> None:
+        if self._fd is not None:
+            raise FindSystemFontsFilenameException("The FontsWatcher is already running.")
+
+        self._fd = self._inotify.inotify_init1(IN_FLAGS.IN_NONBLOCK | IN_FLAGS.IN_CLOEXEC)
+        self._token = get_system_fonts_changes().token
+        # The fonts that change before the watches are added are part of the initial state.
+        while self._sync_watches():
+            self._token = get_system_fonts_changes(self._token).token
+
+
+    def _sync_watches(self) -> bool:
+        """
+        Watch the directories of the current snapshot and stop watching the ones that aren't used anymore.
+
+        Returns:
+            True if new directories are watched, False otherwise.
+        """
+        snapshot = self._token._snapshot
+        paths = snapshot.font_dirs.union(path for path, _ in snapshot.paths_mtime or ())
+
+        directories: Set[str] = set()
+        for path in paths:
+            # A configuration file or a directory that doesn't exist yet is detected by watching the closest existing directory.
+            while not os.path.isdir(path):
+                parent = os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+            directories.add(path)
+
+        for directory in set(self._watches).difference(directories):
+            wd = self._watches.pop(directory)
+            try:
+                self._inotify.inotify_rm_watch(self._fd, wd)
+            except FindSystemFontsFilenameException:
+                # The watch has already been removed by the kernel when the directory has been deleted.
+                pass
+
+        has_new_watches = False
+        for directory in directories.difference(self._watches):
+            try:
+                self._watches[directory] = self._inotify.inotify_add_watch(self._fd, os.fsencode(directory), FontsWatcher.DIRECTORY_MASK)
+                has_new_watches = True
+            except FindSystemFontsFilenameException:
+                # The directory may have been removed or may not be readable. It will be retried on the next refresh.
+                pass
+
+        return has_new_watches
+
+
+    def _get_changes(self) -> FontsChanges:
+        with self._lock:
+            if self._fd is None:
+                raise FindSystemFontsFilenameException("The FontsWatcher has been stopped.")
+
+            previous_token = self._token
+            while True:
+                changes = get_system_fonts_changes(previous_token)
+                self._token = changes.token
+                # A directory that has just been watched may have changed before its watch was added.
+                if not self._sync_watches():
+                    return changes
+
+
+    def _notify(self, changes: FontsChanges) -> None:
+        if changes.added or changes.removed:
+            result = self.callback(changes.added, changes.removed)
+            if iscoroutine(result):
+                if self._loop is None:
+                    result.close()
+                    raise TypeError("The callback of a FontsWatcher started in a thread cannot return a coroutine. Use start_asyncio().")
+                ensure_future(result, loop=self._loop)
+
+
+    def _run_thread(self) -> None:
+        deadline: Optional[float] = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - monotonic(), 0)
+            readable, _, _ = select([self._fd, self._stop_pipe[0]], [], [], timeout)
+
+            if self._stop_pipe[0] in readable:
+                return
+
+            if self._fd in readable:
+                # Drain the events. Their content doesn't matter, since the snapshot knows what changed.
+                for _ in Inotify.read_events(self._fd):
+                    pass
+                deadline = monotonic() + self.debounce_delay
+            elif deadline is not None and monotonic() >= deadline:
+                deadline = None
+                try:
+                    self._notify(self._get_changes())
+                except Exception:
+                    _logger.exception("An exception occurred while refreshing the fonts.")
+
+
+    def _on_asyncio_readable(self) -> None:
+        for _ in Inotify.read_events(self._fd):
+            pass
+
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._loop.call_later(self.debounce_delay, self._on_asyncio_timer)
+
+
+    def _on_asyncio_timer(self) -> None:
+        self._timer = None
+        # Enumerating the fonts can block, so it is done in the default executor.
+        self._refresh_future = self._loop.run_in_executor(None, self._get_changes)
+        self._refresh_future.add_done_callback(self._on_asyncio_refreshed)
+
+
+    def _on_asyncio_refreshed(self, future: Future) -> None:
+        if future.cancelled():
+            return
+
+        exception = future.exception()
+        if self._loop is None:
+            # The watcher has been stopped during the refresh.
+            return
+        if self._refresh_future is future:
+            self._refresh_future = None
+        if exception is not None:
+            _logger.error("An exception occurred while refreshing the fonts.", exc_info=exception)
+            return
+
+        self._notify(future.result())
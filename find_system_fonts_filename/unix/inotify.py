@@ -0,0 +1,109 @@
+import os
+from ctypes import c_char_p, c_int, c_uint32, CDLL, get_errno
+from enum import IntFlag
+from struct import Struct
+from typing import Iterator, NamedTuple
+from ..exceptions import OSNotSupported, SystemApiError
+
+__all__ = [
+    "Inotify",
+    "InotifyEvent",
+    "IN_FLAGS",
+    "IN_MASK",
+]
+
+
+class IN_FLAGS(IntFlag):
+    # https://man7.org/linux/man-pages/man2/inotify_init1.2.html
+    IN_CLOEXEC = 0o2000000
+    IN_NONBLOCK = 0o4000
+
+
+class IN_MASK(IntFlag):
+    # https://man7.org/linux/man-pages/man7/inotify.7.html
+    IN_ACCESS = 0x00000001
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_CLOSE_NOWRITE = 0x00000010
+    IN_OPEN = 0x00000020
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_UNMOUNT = 0x00002000
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_DONT_FOLLOW = 0x02000000
+    IN_EXCL_UNLINK = 0x04000000
+    IN_MASK_CREATE = 0x10000000
+    IN_MASK_ADD = 0x20000000
+    IN_ISDIR = 0x40000000
+    IN_ONESHOT = 0x80000000
+
+
+class InotifyEvent(NamedTuple):
+    wd: int
+    mask: int
+    cookie: int
+    name: bytes
+
+
+class Inotify():
+    # struct inotify_event without the name: https://man7.org/linux/man-pages/man7/inotify.7.html
+    INOTIFY_EVENT = Struct("iIII")
+
+    def __init__(self) -> None:
+        # The symbols of the C library are always loaded in the process.
+        libc = CDLL(None, use_errno=True)
+
+        try:
+            # https://man7.org/linux/man-pages/man2/inotify_init1.2.html
+            self.inotify_init1 = libc.inotify_init1
+            self.inotify_init1.restype = c_int
+            self.inotify_init1.argtypes = [c_int]
+            self.inotify_init1.errcheck = self.errcheck_is_result_negative_one
+        except AttributeError:
+            raise OSNotSupported("Watching the fonts requires inotify, which is only available on Linux.")
+
+        # https://man7.org/linux/man-pages/man2/inotify_add_watch.2.html
+        self.inotify_add_watch = libc.inotify_add_watch
+        self.inotify_add_watch.restype = c_int
+        self.inotify_add_watch.argtypes = [c_int, c_char_p, c_uint32]
+        self.inotify_add_watch.errcheck = self.errcheck_is_result_negative_one
+
+        # https://man7.org/linux/man-pages/man2/inotify_rm_watch.2.html
+        self.inotify_rm_watch = libc.inotify_rm_watch
+        self.inotify_rm_watch.restype = c_int
+        self.inotify_rm_watch.argtypes = [c_int, c_int]
+        self.inotify_rm_watch.errcheck = self.errcheck_is_result_negative_one
+
+
+    @staticmethod
+    def errcheck_is_result_negative_one(result, func, args):
+        if result == -1:
+            raise SystemApiError(f"{func.__name__} fails. {os.strerror(get_errno())}")
+        return result
+
+
+    @staticmethod
+    def read_events(fd: int) -> Iterator[InotifyEvent]:
+        """
+        Read all the pending events of a non-blocking inotify file descriptor.
+        """
+        while True:
+            try:
+                buffer = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                return
+
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, cookie, length = Inotify.INOTIFY_EVENT.unpack_from(buffer, offset)
+                offset += Inotify.INOTIFY_EVENT.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                yield InotifyEvent(wd, mask, cookie, name)
@@ -1,20 +1,29 @@
-from .fontconfig import FontConfig, FC_FONT_FORMAT, FC_RESULT
+from .fontconfig import FontConfig, FC_FONT_FORMAT, FC_RESULT, FcFontSet
+from .fontconfig_cache import FontConfigCache
+from .fontconfig_session import FontConfigSession
 import os
 from pathlib import Path
-from shutil import copyfile
-from ctypes import byref, c_char_p
-from typing import Set
-from ..exceptions import FindSystemFontsFilenameException, OSNotSupported
+from ctypes import byref, c_char_p, c_int, c_void_p, POINTER
+from typing import FrozenSet, Iterator, List, Optional, Set, Tuple
+from ..exceptions import FindSystemFontsFilenameException, FontConfigNotFound, OSNotSupported
+from ..font_filter import FontFilter
+from ..install_mode import InstallMode
+from ..instrumentation import increment, span
+from ..snapshot import FontsSnapshot
 from ..system_fonts import SystemFonts
 
 __all__ = ["UnixFonts"]
 
+FcFontSetPointer = POINTER(FcFontSet)
+
 
 class UnixFonts(SystemFonts):
     VALID_FONT_FORMATS = [
         FC_FONT_FORMAT.FT_FONT_FORMAT_TRUETYPE,
         FC_FONT_FORMAT.FT_FONT_FORMAT_CFF,
     ]
+    # The raw FC_FONTFORMAT values, so the formats can be compared without creating an enum member for each font.
+    VALID_FONT_FORMATS_VALUES = frozenset(font_format.value for font_format in VALID_FONT_FORMATS)
 
     def get_system_fonts_filename() -> Set[str]:
         """
@@ -22,91 +31,344 @@ class UnixFonts(SystemFonts):
 
         Return an list of all the font installed.
         """
+        return set(UnixFonts.get_system_fonts_snapshot().fonts_filename)
 
-        fonts_filename = set()
-        font_config = FontConfig()
 
-        config = font_config.FcInitLoadConfigAndFonts()
-        pat = font_config.FcPatternCreate()
-        os = font_config.FcObjectSetBuild(font_config.FC_FILE, font_config.FC_FONTFORMAT, 0)
-        fs = font_config.FcFontList(config, pat, os)
+    def iter_system_fonts_filename() -> Iterator[str]:
+        """
+        Yield the fonts filename while walking the FcFontSet. Only the new filenames are decoded.
+        The FcFontSet is destroyed when the generator is exhausted or closed.
+        """
+        try:
+            session = FontConfigSession.get()
+        except FontConfigNotFound:
+            from .directory_scanner import FontDirectoryScanner
+            yield from FontDirectoryScanner.get().get_system_fonts_snapshot().fonts_filename
+            return
+
+        font_set = UnixFonts._list_font_set(session)
+        try:
+            seen_filenames: Set[bytes] = set()
+            for file_path, _ in UnixFonts._iter_font_set_faces(session.font_config, font_set):
+                if file_path not in seen_filenames:
+                    seen_filenames.add(file_path)
+                    increment("bytes_decoded", len(file_path))
+                    # Decode with utf-8 since FcChar8.
+                    yield file_path.decode()
+        finally:
+            session.font_config.FcFontSetDestroy(font_set)
+
+
+    def count_system_fonts() -> int:
+        """
+        Count the fonts filename without decoding them.
+        """
+        try:
+            session = FontConfigSession.get()
+        except FontConfigNotFound:
+            from .directory_scanner import FontDirectoryScanner
+            return len(FontDirectoryScanner.get().get_system_fonts_snapshot().fonts_filename)
+
+        font_set = UnixFonts._list_font_set(session)
+        try:
+            return len({file_path for file_path, _ in UnixFonts._iter_font_set_faces(session.font_config, font_set)})
+        finally:
+            session.font_config.FcFontSetDestroy(font_set)
+
+
+    def list_filtered_fonts_faces(font_filter: FontFilter) -> FrozenSet[Tuple[str, int]]:
+        """
+        The criteria are added to the pattern given to FcFontList, so fontconfig skips the other fonts
+        and only the matching ones are returned to Python. Only the directory is checked in Python,
+        on the undecoded filenames, since a pattern cannot match a prefix.
+        """
+        session = FontConfigSession.get()
+
+        directory_prefix = None
+        if font_filter.directory is not None:
+            directory_prefix = os.path.join(os.path.abspath(font_filter.directory), "").encode("utf-8")
+
+        with session.config() as loaded_config:
+            font_set = UnixFonts._list_config_font_set(session.font_config, loaded_config.config, font_filter)
+        try:
+            return frozenset(
+                # Decode with utf-8 since FcChar8.
+                (file_path.decode(), index)
+                for file_path, index in UnixFonts._iter_font_set_faces(session.font_config, font_set)
+                if directory_prefix is None or file_path.startswith(directory_prefix)
+            )
+        finally:
+            session.font_config.FcFontSetDestroy(font_set)
+
+
+    def get_system_fonts_snapshot() -> FontsSnapshot:
+        with span("unix.enumerate") as enumerate_span:
+            # Reading the fontconfig caches avoids loading the fontconfig configuration,
+            # but it is only possible when all of them are up to date.
+            with span("unix.fontconfig_cache") as cache_span:
+                snapshot = FontConfigCache.get_system_fonts_snapshot()
+                cache_span.attributes["hit"] = snapshot is not None
+            if snapshot is not None:
+                increment("fontconfig_cache_hits")
+                enumerate_span.attributes["source"] = "fontconfig_cache"
+                return snapshot
+            increment("fontconfig_cache_misses")
+
+            try:
+                session = FontConfigSession.get()
+            except FontConfigNotFound:
+                # Without fontconfig, walk its default font directories.
+                enumerate_span.attributes["source"] = "directory_scan"
+                with span("unix.directory_scan"):
+                    from .directory_scanner import FontDirectoryScanner
+                    return FontDirectoryScanner.get().get_system_fonts_snapshot()
+
+            enumerate_span.attributes["source"] = "fontconfig"
+            with session.config() as loaded_config:
+                fonts_faces = UnixFonts._list_fonts_faces(session.font_config, loaded_config.config)
+                fonts_filename = frozenset(font_filename for font_filename, _ in fonts_faces)
+                # The snapshot stays valid as long as the FcConfig it comes from is up to date.
+                return FontsSnapshot(fonts_filename, loaded_config.environment, loaded_config.paths_mtime, loaded_config.font_dirs, frozenset(fonts_faces))
 
-        for i in range(fs.contents.nfont):
-            font = fs.contents.fonts[i]
-            file_path_ptr = c_char_p()
-            font_format_ptr = c_char_p()
 
-            if (
-                font_config.FcPatternGetString(font, font_config.FC_FONTFORMAT, 0, byref(font_format_ptr)) == FC_RESULT.FC_RESULT_MATCH
-                and font_config.FcPatternGetString(font, font_config.FC_FILE, 0, byref(file_path_ptr)) == FC_RESULT.FC_RESULT_MATCH
-            ):
-                font_format = FC_FONT_FORMAT(font_format_ptr.value)
+    def is_snapshot_up_to_date(snapshot: FontsSnapshot) -> bool:
+        session = FontConfigSession.get_if_loaded()
+        if session is not None and snapshot.paths_mtime is session.paths_mtime:
+            # The snapshot is built from the session FcConfig, so it is up to date as long as this FcConfig is.
+            return session.is_config_up_to_date()
 
-                if font_format in UnixFonts.VALID_FONT_FORMATS:
-                    # Decode with utf-8 since FcChar8
-                    fonts_filename.add(file_path_ptr.value.decode())
+        return snapshot.is_up_to_date()
+
+
+    @staticmethod
+    def _list_fonts_faces(font_config: FontConfig, config: c_void_p) -> Set[Tuple[str, int]]:
+        font_set = UnixFonts._list_config_font_set(font_config, config)
+        try:
+            with span("unix.pattern_read"):
+                raw_fonts_faces = list(UnixFonts._iter_font_set_faces(font_config, font_set))
+        finally:
+            font_config.FcFontSetDestroy(font_set)
+
+        with span("unix.decode"):
+            # Decode with utf-8 since FcChar8.
+            fonts_faces = {(file_path.decode(), index) for file_path, index in raw_fonts_faces}
+            increment("bytes_decoded", sum(len(file_path) for file_path, _ in raw_fonts_faces))
+        return fonts_faces
+
+
+    @staticmethod
+    def _list_font_set(session: FontConfigSession) -> FcFontSetPointer:
+        # The patterns of the FcFontSet are copies, so it can still be used once the FcConfig is released.
+        with session.config() as loaded_config:
+            return UnixFonts._list_config_font_set(session.font_config, loaded_config.config)
+
+
+    @staticmethod
+    def _list_config_font_set(font_config: FontConfig, config: c_void_p, font_filter: Optional[FontFilter] = None) -> FcFontSetPointer:
+        """
+        Returns:
+            The FcFontSet of the fonts that match the filter, or of all the fonts if it is None.
+            The caller must destroy it with FcFontSetDestroy.
+        """
+        pat = UnixFonts._create_filter_pattern(font_config, font_filter)
+        os = font_config.FcObjectSetBuild(font_config.FC_FILE, font_config.FC_FONTFORMAT, font_config.FC_INDEX, 0)
+        with span("unix.font_list") as font_list_span:
+            fs = font_config.FcFontList(config, pat, os)
+            font_list_span.attributes["fonts"] = fs.contents.nfont
+            font_list_span.attributes["filtered"] = font_filter is not None
 
-        font_config.FcConfigDestroy(config)
         font_config.FcPatternDestroy(pat)
         font_config.FcObjectSetDestroy(os)
-        font_config.FcFontSetDestroy(fs)
 
-        return fonts_filename
+        return fs
+
 
+    @staticmethod
+    def _create_filter_pattern(font_config: FontConfig, font_filter: Optional[FontFilter]) -> c_void_p:
+        """
+        Returns:
+            A FcPattern with the criteria of the filter. The caller must destroy it with FcPatternDestroy.
+        """
+        pat = font_config.FcPatternCreate()
+        if font_filter is None:
+            return pat
 
-    def install_font(font_filename: Path, windows_flags: bool) -> None:
-        font_config = FontConfig()
-        version = font_config.FcGetVersion()
+        for object_name, value in (
+            (font_config.FC_FAMILY, font_filter.family),
+            (font_config.FC_STYLE, font_filter.style),
+            (font_config.FC_LANG, font_filter.lang),
+        ):
+            if value is not None:
+                # fontconfig converts the string to a FcLangSet when it compares it to the languages of a font.
+                font_config.FcPatternAddString(pat, object_name, value.encode("utf-8"))
 
-        # We need 2.11.1 for FcDirCacheRescan
-        if version < 21101:
-            raise OSNotSupported("To install a font, you need to have at least the version 2.11.1 of fontconfig.")
+        if font_filter.spacing is not None:
+            font_config.FcPatternAddInteger(pat, font_config.FC_SPACING, font_filter.spacing)
 
-        config = font_config.FcConfigGetCurrent()
-        font_dirs = font_config.FcConfigGetFontDirs(config)
-        font_config.FcStrListFirst(font_dirs)
+        if font_filter.min_weight is not None or font_filter.max_weight is not None:
+            if not hasattr(font_config, "FcWeightFromOpenTypeDouble"):
+                font_config.FcPatternDestroy(pat)
+                raise OSNotSupported("To filter the fonts by weight, you need to have at least the version 2.12.92 of fontconfig.")
+
+            # fontconfig has its own weight scale, like 80 for regular and 200 for bold.
+            weight_range = font_config.FcRangeCreateDouble(
+                font_config.FcWeightFromOpenTypeDouble(1 if font_filter.min_weight is None else font_filter.min_weight),
+                font_config.FcWeightFromOpenTypeDouble(1000 if font_filter.max_weight is None else font_filter.max_weight),
+            )
+            font_config.FcPatternAddRange(pat, font_config.FC_WEIGHT, weight_range)
+            font_config.FcRangeDestroy(weight_range)
+
+        return pat
 
-        # We suppose that FcStrListNext always return the same Dirs
-        dirs_encoded = font_config.FcStrListNext(font_dirs)
-        if not dirs_encoded:
-            raise FindSystemFontsFilenameException(f"Couldn't get the font directory.")
-        dirs_decoded = dirs_encoded.decode("utf-8")
 
-        font_config.FcStrListDone(font_dirs)
+    @staticmethod
+    def _iter_font_set_faces(font_config: FontConfig, font_set: FcFontSetPointer) -> Iterator[Tuple[bytes, int]]:
+        """
+        Yield the undecoded filename and the face index of each font of a valid format.
+        """
+        scanned_count = 0
+        valid_count = 0
+        try:
+            for i in range(font_set.contents.nfont):
+                scanned_count += 1
+                font = font_set.contents.fonts[i]
+                file_path_ptr = c_char_p()
+                font_format_ptr = c_char_p()
+                index = c_int()
+
+                if (
+                    font_config.FcPatternGetString(font, font_config.FC_FONTFORMAT, 0, byref(font_format_ptr)) == FC_RESULT.FC_RESULT_MATCH
+                    and font_format_ptr.value in UnixFonts.VALID_FONT_FORMATS_VALUES
+                    and font_config.FcPatternGetString(font, font_config.FC_FILE, 0, byref(file_path_ptr)) == FC_RESULT.FC_RESULT_MATCH
+                ):
+                    if font_config.FcPatternGetInteger(font, font_config.FC_INDEX, 0, byref(index)) != FC_RESULT.FC_RESULT_MATCH:
+                        index.value = 0
+                    valid_count += 1
+                    # The high bits of the index are the named instance of a variable font, which is the same face.
+                    yield file_path_ptr.value, index.value & 0xFFFF
+        finally:
+            # The counters are updated once per FcFontSet, even when the generator is closed early.
+            increment("fonts_scanned", scanned_count)
+            increment("fonts_filtered_by_format", scanned_count - valid_count)
 
-        os.makedirs(dirs_decoded, exist_ok=True)
 
-        copyfile(font_filename, os.path.join(dirs_decoded, font_filename.name))
-        font_config.FcDirCacheRescan(dirs_encoded, config)
-        font_config.FcConfigDestroy(config)
+    def install_font(font_filename: Path, windows_flags: bool, install_mode: InstallMode = InstallMode.AUTO) -> None:
+        """
+        If a font with the same name and content is already in the install directory, nothing is copied and fontconfig doesn't rescan.
+        """
+        with span("unix.install") as install_span:
+            UnixFonts._install_fonts([font_filename], install_mode, install_span)
 
 
     def uninstall_font(font_filename: Path, windows_flags: bool) -> None:
-        font_config = FontConfig()
-        version = font_config.FcGetVersion()
+        session = FontConfigSession.get()
+
+        with span("unix.uninstall"), session.write_config() as loaded_config:
+            font_dir = UnixFonts._get_install_font_dir(session, loaded_config.config)
+            file_path = os.path.join(font_dir, font_filename.name)
+
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+            else:
+                raise FindSystemFontsFilenameException(f"Couldn't get delete the font {font_filename}.")
+
+            with span("unix.rescan"):
+                session.font_config.FcDirCacheRescan(font_dir.encode("utf-8"), loaded_config.config)
+
+
+    def install_fonts(fonts_filename: List[Path], windows_flags: bool, install_mode: InstallMode = InstallMode.AUTO) -> None:
+        """
+        The fonts are copied in parallel under temporary names, then renamed, and fontconfig rescans the directory once.
+        If a font cannot be installed, none of them are.
+        The fonts whose name and content are already in the install directory are skipped.
+        """
+        with span("unix.install_batch") as install_span:
+            UnixFonts._install_fonts(fonts_filename, install_mode, install_span)
+
+
+    @staticmethod
+    def _install_fonts(fonts_filename: List[Path], install_mode: InstallMode, install_span) -> None:
+        session = FontConfigSession.get()
+        install_span.attributes["fonts"] = len(fonts_filename)
+
+        with session.write_config() as loaded_config:
+            font_dir = UnixFonts._get_install_font_dir(session, loaded_config.config)
+
+            with span("unix.dedupe"):
+                new_fonts_filename = UnixFonts._get_new_fonts(fonts_filename, font_dir)
+            skipped_count = len(fonts_filename) - len(new_fonts_filename)
+            install_span.attributes["skipped"] = skipped_count
+            increment("fonts_install_skipped", skipped_count)
+            if not new_fonts_filename:
+                return
+
+            from .font_file_copier import FontFileCopier
+            from .font_files_transaction import FontFilesTransaction
+
+            os.makedirs(font_dir, exist_ok=True)
+            with span("unix.copy") as copy_span:
+                used_modes: Set[InstallMode] = set()
+
+                def copy(source: Path, destination: str) -> None:
+                    used_modes.add(FontFileCopier.copy(source, destination, install_mode))
+
+                FontFilesTransaction(font_dir).install(new_fonts_filename, copy)
+                copy_span.attributes["modes"] = sorted(mode.value for mode in used_modes)
+            with span("unix.rescan"):
+                session.font_config.FcDirCacheRescan(font_dir.encode("utf-8"), loaded_config.config)
+
+
+    def uninstall_fonts(fonts_filename: List[Path], windows_flags: bool) -> None:
+        """
+        If a font isn't installed, none of them are removed.
+        """
+        session = FontConfigSession.get()
+
+        with span("unix.uninstall_batch") as uninstall_span, session.write_config() as loaded_config:
+            uninstall_span.attributes["fonts"] = len(fonts_filename)
+            font_dir = UnixFonts._get_install_font_dir(session, loaded_config.config)
+
+            from .font_files_transaction import FontFilesTransaction
+            FontFilesTransaction(font_dir).uninstall(fonts_filename)
+            with span("unix.rescan"):
+                session.font_config.FcDirCacheRescan(font_dir.encode("utf-8"), loaded_config.config)
+
+
+    @staticmethod
+    def _get_new_fonts(fonts_filename: List[Path], font_dir: str) -> List[Path]:
+        """
+        Returns:
+            The fonts that aren't already in the install directory with the same name and the same content.
+            A copy in another font directory doesn't count, since uninstall_font only removes the fonts of the install directory.
+        """
+        from ..duplicates import FontDuplicatesFinder
+        duplicates_finder = FontDuplicatesFinder.get_default()
+        new_fonts_filename = []
+
+        for font_filename in fonts_filename:
+            source = os.path.abspath(font_filename)
+            installed_font = os.path.join(font_dir, font_filename.name)
+            if source != installed_font and not duplicates_finder.find_copies(source, [installed_font]):
+                new_fonts_filename.append(font_filename)
+
+        return new_fonts_filename
+
+
+    @staticmethod
+    def _get_install_font_dir(session: FontConfigSession, config: c_void_p) -> str:
+        """
+        Returns:
+            The directory where the fonts are installed.
+        """
+        version = session.font_config.FcGetVersion()
 
         # We need 2.11.1 for FcDirCacheRescan
         if version < 21101:
             raise OSNotSupported("To install a font, you need to have at least the version 2.11.1 of fontconfig.")
 
-        config = font_config.FcConfigGetCurrent()
-        font_dirs = font_config.FcConfigGetFontDirs(config)
-        font_config.FcStrListFirst(font_dirs)
-
         # We suppose that FcStrListNext always return the same Dirs
-        dirs_encoded = font_config.FcStrListNext(font_dirs)
-        if not dirs_encoded:
+        font_dirs = session.get_font_dirs(config)
+        if not font_dirs:
             raise FindSystemFontsFilenameException(f"Couldn't get the font directory.")
-        dirs_decoded = dirs_encoded.decode("utf-8")
-
-        font_config.FcStrListDone(font_dirs)
-
-        file_path = os.path.join(dirs_decoded, font_filename.name)
-
-        if os.path.isfile(file_path):
-            os.remove(file_path)
-        else:
-            raise FindSystemFontsFilenameException(f"Couldn't get delete the font {font_filename}.")
 
-        font_config.FcDirCacheRescan(dirs_encoded, config)
-        font_config.FcConfigDestroy(config)
+        return font_dirs[0]
@@ -28,6 +28,7 @@ from pathlib import Path
 from sys import getwindowsversion
 from typing import List, Set
 from ..exceptions import NotSupportedFontFile, OSNotSupported, SystemApiError
+from ..install_mode import InstallMode
 from ..system_fonts import SystemFonts
 
 __all__ = ["WindowsFonts"]
@@ -236,7 +237,7 @@ class WindowsFonts(SystemFonts):
         return registry_font_name
 
 
-    def install_font(font_filename: Path, add_font_to_registry: bool) -> None:
+    def install_font(font_filename: Path, add_font_to_registry: bool, install_mode: InstallMode) -> None:
         windows_version = getwindowsversion()
 
         if not WindowsVersionHelpers.is_windows_vista_sp2_or_greater(windows_version):
@@ -0,0 +1,48 @@
+import pytest
+import sys
+from os import name
+from pathlib import Path
+from platform import system
+from struct import pack, unpack_from
+from find_system_fonts_filename import invalidate_system_fonts_cache
+
+is_unix = system() != "Darwin" and name == "posix" and not hasattr(sys, "getandroidapilevel")
+
+
+def create_collection(font_path: str, collection_path: Path, faces_count: int) -> None:
+    """
+    Write a collection which contains the same font faces_count times.
+    """
+    font = bytearray(Path(font_path).read_bytes())
+    header_size = 12 + 4 * faces_count
+
+    # The tables move after the collection header.
+    num_tables, = unpack_from(">H", font, 4)
+    for i in range(num_tables):
+        record_offset = 12 + i * 16 + 8
+        table_offset, = unpack_from(">I", font, record_offset)
+        font[record_offset:record_offset + 4] = pack(">I", table_offset + header_size)
+
+    collection_path.write_bytes(b"ttcf" + pack(">HHI", 1, 0, faces_count) + pack(">I", header_size) * faces_count + font)
+
+
+@pytest.fixture
+def fontconfig_sandbox(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    Point fontconfig to a private configuration which only contains the fonts of the returned directory.
+    """
+    fonts_dir = tmp_path / "fonts"
+    fonts_dir.mkdir()
+    config_file = tmp_path / "fonts.conf"
+    config_file.write_text(
+        "<?xml version=\"1.0\"?>\n"
+        "<fontconfig>\n"
+        f"    <dir>{fonts_dir}</dir>\n"
+        f"    <cachedir>{tmp_path / 'cache'}</cachedir>\n"
+        "</fontconfig>\n"
+    )
+    monkeypatch.setenv("FONTCONFIG_FILE", str(config_file))
+    invalidate_system_fonts_cache()
+    yield fonts_dir
+    monkeypatch.delenv("FONTCONFIG_FILE")
+    invalidate_system_fonts_cache()
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+import time
+from conftest import is_unix
+from os.path import dirname, join, realpath, samefile
+from pathlib import Path
+from shutil import copyfile
+from find_system_fonts_filename import async_get_system_fonts_filename, async_install_font, async_uninstall_font, InstallMode
+import find_system_fonts_filename.async_fonts_filename as async_fonts_filename
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+def test_async_get_system_fonts_filename_coalesces(monkeypatch):
+    calls = []
+    snapshot = async_fonts_filename.get_system_fonts_snapshot()
+
+    def slow_get_system_fonts_snapshot():
+        calls.append(None)
+        time.sleep(0.1)
+        return snapshot
+
+    monkeypatch.setattr(async_fonts_filename, "get_system_fonts_snapshot", slow_get_system_fonts_snapshot)
+
+    async def burst():
+        return await asyncio.gather(*(async_get_system_fonts_filename() for _ in range(50)))
+
+    results = asyncio.run(burst())
+    assert len(calls) == 1
+    assert all(result == set(snapshot.fonts_filename) for result in results)
+    # Each awaiter gets its own set
+    assert len({id(result) for result in results}) == 50
+
+    # Once the call is done, the next awaiter starts a new one
+    asyncio.run(burst())
+    assert len(calls) == 2
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_async_install_font(fontconfig_sandbox):
+    # A hard link needs the font on the same filesystem as the font directory
+    font = fontconfig_sandbox.parent / "SuperFunky-lgmWw.ttf"
+    copyfile(font_path, font)
+
+    async def install_and_uninstall():
+        await async_install_font(font, install_mode=InstallMode.HARDLINK)
+        assert samefile(font, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+        installed = await async_get_system_fonts_filename()
+        await async_uninstall_font(Path(font_path))
+        return installed, await async_get_system_fonts_filename()
+
+    installed, uninstalled = asyncio.run(install_and_uninstall())
+    assert installed == {str(fontconfig_sandbox / "SuperFunky-lgmWw.ttf")}
+    assert uninstalled == set()
@@ -0,0 +1,87 @@
+import pytest
+import sys
+from pathlib import Path
+from typing import Set
+from find_system_fonts_filename import backends, get_backends, get_system_fonts_filename, register_backend, unregister_backend
+from find_system_fonts_filename.install_mode import InstallMode
+from find_system_fonts_filename.system_fonts import SystemFonts
+
+
+class FakeFonts(SystemFonts):
+    @staticmethod
+    def get_system_fonts_filename() -> Set[str]:
+        return {"/fake/font.ttf"}
+
+    @staticmethod
+    def install_font(font_filename: Path, add_font_to_registry: bool = False, install_mode: InstallMode = InstallMode.AUTO) -> None:
+        pass
+
+    @staticmethod
+    def uninstall_font(font_filename: Path, remove_font_in_registry: bool) -> None:
+        pass
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Each test gets its own copy of the registry
+    monkeypatch.setattr(backends, "_backends", dict(backends._backends))
+    monkeypatch.setattr(backends, "_probe_results", {})
+    monkeypatch.setattr(backends, "_entry_points_loaded", False)
+    monkeypatch.setattr(backends, "_system_fonts_class", None)
+
+
+def test_register_backend(registry):
+    default_fonts_filename = get_system_fonts_filename()
+
+    probe_calls = []
+    register_backend("unavailable", lambda: pytest.fail("An unavailable backend is never loaded"), 20, lambda: probe_calls.append(1) or False)
+    register_backend("fake", lambda: FakeFonts, 10)
+    assert [backend.name for backend in get_backends()][:2] == ["unavailable", "fake"]
+    assert get_system_fonts_filename() == {"/fake/font.ttf"}
+
+    # The probe results are kept when another backend is registered
+    register_backend("other", lambda: FakeFonts, -1)
+    assert get_system_fonts_filename() == {"/fake/font.ttf"}
+    assert probe_calls == [1]
+
+    unregister_backend("fake")
+    assert get_system_fonts_filename() == default_fonts_filename
+    with pytest.raises(ValueError):
+        unregister_backend("fake")
+
+
+def test_broken_probe(registry):
+    register_backend("broken", lambda: FakeFonts, 10, lambda: 1 / 0)
+    assert backends.get_system_fonts_class() is not FakeFonts
+
+
+def test_entry_point(registry, tmp_path, monkeypatch):
+    (tmp_path / "fake_fonts_backend.py").write_text(
+        "from find_system_fonts_filename.system_fonts import SystemFonts\n"
+        "class FakeFonts(SystemFonts):\n"
+        "    get_system_fonts_filename = staticmethod(lambda: {'/entry-point/font.ttf'})\n"
+        "    install_font = uninstall_font = staticmethod(lambda *args: None)\n"
+        "class UnavailableFonts(FakeFonts):\n"
+        "    is_available = classmethod(lambda cls: False)\n"
+    )
+    (tmp_path / "unused_fonts_backend.py").write_text("raise AssertionError('A backend after the selected one is never imported')\n")
+    dist_info = tmp_path / "fake_fonts_backend-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: fake-fonts-backend\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[find_system_fonts_filename.backends]\n"
+        "missing = fake_fonts_backend:MissingFonts\n"
+        "unavailable = fake_fonts_backend:UnavailableFonts\n"
+        "fake = fake_fonts_backend:FakeFonts\n"
+        "unused = unused_fonts_backend:UnusedFonts\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "fake_fonts_backend", raising=False)
+
+    # Listing the backends doesn't import them, and the entry points are probed before the built-in backends
+    assert [backend.name for backend in get_backends()][:4] == ["missing", "unavailable", "fake", "unused"]
+    assert "fake_fonts_backend" not in sys.modules
+
+    # The broken entry point and the unavailable one are skipped
+    assert get_system_fonts_filename() == {"/entry-point/font.ttf"}
+    assert backends._probe_results == {"missing": False, "unavailable": False, "fake": True}
@@ -0,0 +1,139 @@
+import os
+import pytest
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from pathlib import Path
+from shutil import copyfile
+from find_system_fonts_filename import get_system_fonts_filename, install_font, install_fonts, InstallMode, reset_stats, stats, uninstall_font, uninstall_fonts
+from find_system_fonts_filename.exceptions import FindSystemFontsFilenameException
+from find_system_fonts_filename.unix.font_files_transaction import FontFilesTransaction
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+def create_fonts(directory: Path, count: int):
+    directory.mkdir()
+    fonts = [directory / f"SuperFunky-{i}.ttf" for i in range(count)]
+    for font in fonts:
+        copyfile(font_path, font)
+    return fonts
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_install_fonts(fontconfig_sandbox, tmp_path):
+    fonts = create_fonts(tmp_path / "new", 10)
+    installed_fonts = {str(fontconfig_sandbox / font.name) for font in fonts}
+
+    install_fonts(fonts)
+    assert get_system_fonts_filename() == installed_fonts
+    # The temporary files have been renamed or removed
+    assert sorted(os.listdir(fontconfig_sandbox)) == sorted(font.name for font in fonts)
+
+    # Installing them again skips them, since the installed fonts have the same content
+    reset_stats()
+    install_fonts(fonts)
+    assert stats()["fonts_install_skipped"] == len(fonts)
+    assert "span.unix.copy.count" not in stats()
+    assert get_system_fonts_filename() == installed_fonts
+
+    uninstall_fonts(fonts)
+    assert get_system_fonts_filename() == set()
+    assert os.listdir(fontconfig_sandbox) == []
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_install_fonts_rollback(fontconfig_sandbox, tmp_path):
+    fonts = create_fonts(tmp_path / "new", 5)
+    installed_font = fontconfig_sandbox / fonts[0].name
+    copyfile(font_path, installed_font)
+    installed_bytes = installed_font.read_bytes()
+
+    def failing_copy(source: Path, destination: str) -> None:
+        if source == fonts[3]:
+            raise OSError("No space left on device")
+        copyfile(source, destination)
+
+    with pytest.raises(OSError):
+        FontFilesTransaction(str(fontconfig_sandbox)).install(fonts, failing_copy)
+    assert os.listdir(fontconfig_sandbox) == [installed_font.name]
+    assert installed_font.read_bytes() == installed_bytes
+
+    # If a font isn't installed, none of them are removed
+    with pytest.raises(FindSystemFontsFilenameException):
+        uninstall_fonts(fonts)
+    assert os.listdir(fontconfig_sandbox) == [installed_font.name]
+
+    with pytest.raises(ValueError):
+        install_fonts([fonts[1], fonts[1]])
+    assert get_system_fonts_filename() == {str(installed_font)}
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_install_fonts_rollback_failed_backup(fontconfig_sandbox, tmp_path, monkeypatch):
+    fonts = create_fonts(tmp_path / "new", 3)
+    installed_fonts = [fontconfig_sandbox / font.name for font in fonts[:2]]
+    for installed_font in installed_fonts:
+        installed_font.write_bytes(b"installed")
+
+    replace = os.replace
+    def failing_replace(source, destination):
+        # The backup of the second installed font fails, and so does the restore of the first one.
+        if source == str(installed_fonts[1]) or destination == str(installed_fonts[0]):
+            raise PermissionError("Operation not permitted")
+        replace(source, destination)
+    monkeypatch.setattr(os, "replace", failing_replace)
+
+    # The error of the backup is raised, not the one of the rollback
+    with pytest.raises(PermissionError):
+        FontFilesTransaction(str(fontconfig_sandbox)).install(fonts)
+    monkeypatch.setattr(os, "replace", replace)
+
+    # The staged fonts are removed, and the backup which couldn't be restored is kept
+    names = os.listdir(fontconfig_sandbox)
+    assert installed_fonts[1].read_bytes() == b"installed"
+    assert not installed_fonts[0].exists()
+    assert len(names) == 2 and any(name.startswith(f".{installed_fonts[0].name}.") for name in names)
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+@pytest.mark.parametrize("install_mode", [InstallMode.AUTO, InstallMode.HARDLINK, InstallMode.COPY_FILE_RANGE, InstallMode.COPY])
+def test_install_mode(fontconfig_sandbox, tmp_path, install_mode):
+    font = create_fonts(tmp_path / "new", 1)[0]
+    installed_font = fontconfig_sandbox / font.name
+
+    install_font(font, install_mode=install_mode)
+    assert get_system_fonts_filename() == {str(installed_font)}
+    assert installed_font.read_bytes() == font.read_bytes()
+    assert os.path.samefile(font, installed_font) == (install_mode == InstallMode.HARDLINK)
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_install_identical_font(fontconfig_sandbox, tmp_path):
+    font = create_fonts(tmp_path / "new", 1)[0]
+    installed_font = fontconfig_sandbox / font.name
+    copyfile(font_path, installed_font)
+
+    reset_stats()
+    install_font(font)
+    assert stats()["fonts_install_skipped"] == 1
+    assert "span.unix.copy.count" not in stats()
+    assert os.listdir(fontconfig_sandbox) == [font.name]
+
+    # A font with the same name but another content is installed
+    font.write_bytes(font.read_bytes() + b"\0")
+    install_font(font)
+    assert installed_font.read_bytes() == font.read_bytes()
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_install_font_copied_in_other_font_dir(fontconfig_sandbox, tmp_path):
+    (fontconfig_sandbox / "sub").mkdir()
+    other_font = fontconfig_sandbox / "sub" / "SuperFunky-0.ttf"
+    copyfile(font_path, other_font)
+    font = create_fonts(tmp_path / "new", 1)[0]
+
+    # A copy outside of the install directory doesn't count, since uninstall_font cannot remove it
+    install_font(font)
+    assert get_system_fonts_filename() == {str(other_font), str(fontconfig_sandbox / font.name)}
+    uninstall_font(font)
+    assert get_system_fonts_filename() == {str(other_font)}
@@ -0,0 +1,36 @@
+import os
+import pytest
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from shutil import copyfile
+from find_system_fonts_filename import get_system_fonts_filename
+
+if is_unix:
+    from find_system_fonts_filename.unix.directory_scanner import FontDirectoryScanner
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_scan(fontconfig_sandbox):
+    sub_dir = fontconfig_sandbox / "sub"
+    sub_dir.mkdir()
+    copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+    copyfile(font_path, sub_dir / "copy.ttf")
+    copyfile(font_path, fontconfig_sandbox / ".hidden.ttf")
+    (fontconfig_sandbox / "readme.txt").write_text("Not a font")
+
+    scanner = FontDirectoryScanner()
+    scanned_dirs = scanner.scan([str(fontconfig_sandbox)])
+    fonts_filename = {font_filename for scanned_dir in scanned_dirs.values() for font_filename in scanned_dir.fonts_filename}
+
+    # The scanner finds the same fonts than fontconfig
+    assert fonts_filename == get_system_fonts_filename()
+    assert fonts_filename == {str(fontconfig_sandbox / "SuperFunky-lgmWw.ttf"), str(sub_dir / "copy.ttf")}
+
+    # Only the directories that changed are read again
+    copyfile(font_path, fontconfig_sandbox / "new.ttf")
+    os.utime(fontconfig_sandbox, ns=(0, scanned_dirs[str(fontconfig_sandbox)].mtime_ns + 1))
+    rescanned_dirs = scanner.scan([str(fontconfig_sandbox)])
+    assert rescanned_dirs[str(sub_dir)] is scanned_dirs[str(sub_dir)]
+    assert str(fontconfig_sandbox / "new.ttf") in rescanned_dirs[str(fontconfig_sandbox)].fonts_filename
@@ -0,0 +1,61 @@
+import os
+import pytest
+from conftest import create_collection, is_unix
+from os.path import dirname, join, realpath
+from pathlib import Path
+from shutil import copyfile
+from find_system_fonts_filename import find_installed_copies, FontDuplicatesFinder, get_system_fonts_duplicates
+from find_system_fonts_filename.sfnt import Sfnt
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+def test_find_duplicates(tmp_path):
+    copies = [str(tmp_path / f"copy-{i}.ttf") for i in range(3)]
+    for copy in copies:
+        copyfile(font_path, copy)
+
+    # Same size and same table directory, but another content: only the hash can tell them apart
+    modified = tmp_path / "modified.ttf"
+    content = bytearray(Path(font_path).read_bytes())
+    content[-1] ^= 0xFF
+    modified.write_bytes(content)
+    assert Sfnt.read_fingerprint(content) == Sfnt.read_fingerprint(Path(font_path).read_bytes())
+
+    collections = [tmp_path / f"collection-{i}.ttc" for i in range(2)]
+    for collection in collections:
+        create_collection(font_path, collection, 2)
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"\0" * 10)
+
+    finder = FontDuplicatesFinder()
+    fonts_filename = [font_path, *copies, str(modified), *map(str, collections), str(other), str(tmp_path / "missing.ttf")]
+    assert finder.find_duplicates(fonts_filename) == sorted([
+        tuple(sorted(map(str, collections))),
+        tuple(sorted([font_path, *copies])),
+    ])
+    assert finder.find_copies(str(modified), fonts_filename) == []
+    assert finder.find_copies(copies[0], fonts_filename) == sorted([font_path, *copies[1:]])
+
+    # The fonts of another size than the source are never read
+    finder.clear()
+    assert finder.find_copies(font_path, fonts_filename) == sorted(copies)
+    assert all(finder._cache[str(collection)].fingerprint is None for collection in collections)
+    assert finder._cache[str(modified)].digest is not None
+
+    # The cache is keyed by the stat of the files
+    modified.write_bytes(Path(font_path).read_bytes())
+    os.utime(modified, ns=(0, 0))
+    assert finder.find_copies(font_path, fonts_filename) == sorted([*copies, str(modified)])
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_get_system_fonts_duplicates(fontconfig_sandbox):
+    (fontconfig_sandbox / "sub").mkdir()
+    installed_fonts = [fontconfig_sandbox / "SuperFunky.ttf", fontconfig_sandbox / "sub" / "SuperFunky-copy.ttf"]
+    for installed_font in installed_fonts:
+        copyfile(font_path, installed_font)
+
+    assert get_system_fonts_duplicates() == [tuple(sorted(map(str, installed_fonts)))]
+    assert find_installed_copies(Path(font_path)) == sorted(map(str, installed_fonts))
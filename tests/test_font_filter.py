@@ -0,0 +1,30 @@
+import pytest
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from shutil import copyfile
+from find_system_fonts_filename import FontFilter, get_system_fonts_faces, get_system_fonts_filename
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_font_filter(fontconfig_sandbox):
+    (fontconfig_sandbox / "sub").mkdir()
+    installed_font = fontconfig_sandbox / "sub" / "SuperFunky-lgmWw.ttf"
+    copyfile(font_path, installed_font)
+    installed_fonts = {str(installed_font)}
+
+    # Like fontconfig, the case and the spaces of the family are ignored
+    assert get_system_fonts_filename(FontFilter(family="superfunky")) == installed_fonts
+    assert get_system_fonts_faces(FontFilter(family="Super Funky", style="Regular")) == {(str(installed_font), 0)}
+    assert get_system_fonts_filename(FontFilter(family="Arial")) == set()
+
+    assert get_system_fonts_filename(FontFilter(min_weight=300, max_weight=500)) == installed_fonts
+    assert get_system_fonts_filename(FontFilter(min_weight=600)) == set()
+
+    assert get_system_fonts_filename(FontFilter(directory=str(fontconfig_sandbox / "sub"))) == installed_fonts
+    assert get_system_fonts_filename(FontFilter(directory=str(fontconfig_sandbox / "su"))) == set()
+
+    # The results are cached until the fonts change
+    copyfile(font_path, fontconfig_sandbox / "SuperFunky-copy.ttf")
+    assert len(get_system_fonts_filename(FontFilter(family="superfunky"))) == 2
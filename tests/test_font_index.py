@@ -0,0 +1,51 @@
+import pytest
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from shutil import copyfile
+from find_system_fonts_filename import find_font_file, FontInfo, FontMetadataCache, FontNameIndex
+from find_system_fonts_filename.sfnt import NAME_ID, SfntInfo
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+def test_find():
+    font = FontInfo(font_path)
+    index = FontNameIndex([font])
+
+    # The family, full and PostScript names are indexed without the case
+    assert index.find("Super Funky") is font
+    assert index.find("super funky") is font
+    assert index.find("SUPERFUNKY", weight=700, italic=True) is font
+    assert index.find("Super") is None
+
+
+def test_find_preferences():
+    fonts = {}
+    for name, weight, italic in [("regular", 400, False), ("bold", 700, False), ("italic", 400, True)]:
+        font = fonts[name] = FontInfo(f"/fonts/{name}.ttf")
+        font._set_info(SfntInfo({NAME_ID.FAMILY: ["Family"]}, weight, italic))
+    index = FontNameIndex(fonts.values())
+
+    assert index.find("Family") is fonts["regular"]
+    assert index.find("Family", weight=800) is fonts["bold"]
+    assert index.find("Family", weight=800, italic=True) is fonts["italic"]
+
+    # The weight and the italic only rank the fonts with the name, they don't filter them
+    index = FontNameIndex([fonts["regular"], fonts["bold"]])
+    assert index.find("Family", italic=True) is fonts["regular"]
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_find_font_file(fontconfig_sandbox, tmp_path, monkeypatch):
+    # The default metadata cache is created in a private cache directory, not in the user one
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+    monkeypatch.setattr(FontMetadataCache, "_default", None)
+
+    assert find_font_file("Super Funky") is None
+
+    installed_font = fontconfig_sandbox / "SuperFunky-lgmWw.ttf"
+    copyfile(font_path, installed_font)
+
+    # The index is rebuilt once the fonts changed
+    assert find_font_file("Super Funky") == FontInfo(str(installed_font))
+    assert FontMetadataCache.get_default().path.startswith(str(tmp_path))
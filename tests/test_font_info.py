@@ -0,0 +1,26 @@
+from conftest import create_collection
+from os.path import dirname, join, realpath
+from find_system_fonts_filename import FontInfo
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+def test_names():
+    font = FontInfo(font_path)
+    assert font.family_name == "Super Funky"
+    assert font.subfamily_name == "Regular"
+    assert font.full_name == "Super Funky"
+    assert font.postscript_name == "SuperFunky"
+    assert font == FontInfo(font_path, 0)
+
+
+def test_collection_names(tmp_path):
+    collection_path = tmp_path / "collection.ttc"
+    create_collection(font_path, collection_path, 2)
+
+    assert FontInfo(str(collection_path), 1).family_name == "Super Funky"
+    assert FontInfo(str(collection_path), 2).family_name is None
+
+
+def test_missing_file(tmp_path):
+    assert FontInfo(str(tmp_path / "missing.ttf")).family_name is None
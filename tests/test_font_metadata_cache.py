@@ -0,0 +1,56 @@
+import os
+import sqlite3
+from contextlib import closing
+from os.path import dirname, join, realpath
+from shutil import copyfile
+from find_system_fonts_filename import FontInfo, FontMetadataCache
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+def test_load(tmp_path):
+    fonts_filename = []
+    for i in range(5):
+        fonts_filename.append(str(tmp_path / f"font{i}.ttf"))
+        copyfile(font_path, fonts_filename[-1])
+
+    cache = FontMetadataCache(str(tmp_path / "cache" / "metadata.sqlite"))
+    assert cache.load([FontInfo(font_filename) for font_filename in fonts_filename]) == 5
+
+    # Only the file that changed is read again
+    os.utime(fonts_filename[0], ns=(0, 0))
+    fonts = [FontInfo(font_filename) for font_filename in fonts_filename]
+    assert cache.load(fonts) == 1
+    assert all(font.family_name == "Super Funky" and font.weight == 400 and font.italic is False for font in fonts)
+    assert cache.load(fonts) == 0
+
+    # Loading fonts doesn't read the rows of the other fonts. The rows of the deleted fonts are removed by prune.
+    os.remove(fonts_filename[1])
+    assert cache.load([FontInfo(font_filename) for font_filename in fonts_filename[2:]]) == 0
+    with closing(sqlite3.connect(cache.path)) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM fonts").fetchone()[0] == 5
+    assert cache.prune() == 1
+    with closing(sqlite3.connect(cache.path)) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM fonts").fetchone()[0] == 4
+
+
+def test_load_many_fonts(tmp_path, monkeypatch):
+    # The paths are queried in many chunks
+    monkeypatch.setattr(FontMetadataCache, "QUERY_CHUNK_SIZE", 2)
+    fonts_filename = []
+    for i in range(5):
+        fonts_filename.append(str(tmp_path / f"font{i}.ttf"))
+        copyfile(font_path, fonts_filename[-1])
+
+    cache = FontMetadataCache(str(tmp_path / "cache" / "metadata.sqlite"))
+    assert cache.load([FontInfo(font_filename) for font_filename in fonts_filename]) == 5
+    assert cache.load([FontInfo(font_filename) for font_filename in fonts_filename]) == 0
+
+
+def test_load_without_database(tmp_path):
+    (tmp_path / "file").write_text("")
+    # The database cannot be created in a file, so the fonts are read directly.
+    cache = FontMetadataCache(str(tmp_path / "file" / "metadata.sqlite"))
+    font = FontInfo(font_path)
+    assert cache.load([font]) == 1
+    assert font.family_name == "Super Funky"
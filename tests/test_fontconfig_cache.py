@@ -0,0 +1,76 @@
+import pytest
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from shutil import copyfile
+from find_system_fonts_filename import get_system_fonts_filename
+
+if is_unix:
+    from find_system_fonts_filename.unix.fontconfig_cache import FontConfigCache
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_read_font_dirs(fontconfig_sandbox):
+    cache_dir = str(fontconfig_sandbox.parent / "cache")
+    installed_font = fontconfig_sandbox / "SuperFunky-lgmWw.ttf"
+    copyfile(font_path, installed_font)
+
+    # Loading the fonts with fontconfig writes the cache of the directory
+    assert get_system_fonts_filename() == {str(installed_font)}
+
+    scanned_dirs = FontConfigCache.read_font_dirs([str(fontconfig_sandbox)], [cache_dir])
+    assert list(scanned_dirs) == [str(fontconfig_sandbox)]
+    assert scanned_dirs[str(fontconfig_sandbox)].fonts_filename == [str(installed_font)]
+
+    # The cache is stale once the directory changes
+    copyfile(font_path, fontconfig_sandbox / "copy.ttf")
+    assert FontConfigCache.read_font_dirs([str(fontconfig_sandbox)], [cache_dir]) is None
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_reject_globs(fontconfig_sandbox):
+    from find_system_fonts_filename.unix import UnixFonts
+    from find_system_fonts_filename.unix.fontconfig_session import FontConfigSession
+
+    (fontconfig_sandbox / "rejected").mkdir()
+    copyfile(font_path, fontconfig_sandbox / "kept.ttf")
+    copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+    copyfile(font_path, fontconfig_sandbox / "rejected" / "other.ttf")
+
+    config_file = fontconfig_sandbox.parent / "fonts.conf"
+    config_file.write_text(config_file.read_text().replace(
+        "</fontconfig>",
+        "    <selectfont><rejectfont><glob>*/SuperFunky-lgmWw.ttf</glob><glob>*/rejected</glob></rejectfont></selectfont>\n</fontconfig>"
+    ))
+
+    # Loading the fonts with fontconfig writes the cache of the directories
+    session = FontConfigSession.get()
+    with session.config() as loaded_config:
+        session_fonts_filename = {font_filename for font_filename, _ in UnixFonts._list_fonts_faces(session.font_config, loaded_config.config)}
+    assert session_fonts_filename == {str(fontconfig_sandbox / "kept.ttf")}
+
+    snapshot = FontConfigCache.get_system_fonts_snapshot()
+    assert snapshot is not None
+    assert snapshot.fonts_filename == session_fonts_filename
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_untrusted_config(fontconfig_sandbox, monkeypatch):
+    from find_system_fonts_filename.unix.fontconfig_config import FontConfigConfig
+
+    copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+    assert get_system_fonts_filename() == {str(fontconfig_sandbox / "SuperFunky-lgmWw.ttf")}
+    config = FontConfigConfig.load()
+    assert FontConfigCache.is_config_loaded_by_fontconfig(config)
+
+    # The configuration libfontconfig loaded isn't the parsed one
+    config.config_filename = str(fontconfig_sandbox / "other.conf")
+    assert not FontConfigCache.is_config_loaded_by_fontconfig(config)
+
+    # Without the main configuration file, the parsed configuration is the fallback one,
+    # whose directories may not be the ones libfontconfig was built with
+    monkeypatch.setenv("FONTCONFIG_FILE", "missing.conf")
+    config = FontConfigConfig.get()
+    assert config.config_filename is None
+    assert FontConfigCache.get_system_fonts_snapshot() is None
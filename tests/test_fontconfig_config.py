@@ -0,0 +1,84 @@
+import os
+import pytest
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from shutil import copyfile
+from find_system_fonts_filename import get_system_fonts_filename, invalidate_system_fonts_cache
+
+if is_unix:
+    from find_system_fonts_filename.unix.fontconfig_cache import FontConfigCache
+    from find_system_fonts_filename.unix.fontconfig_config import FontConfigConfig
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_parse(tmp_path, monkeypatch):
+    conf_d = tmp_path / "conf.d"
+    conf_d.mkdir()
+    config_file = tmp_path / "fonts.conf"
+    config_file.write_text(
+        "<?xml version=\"1.0\"?>\n"
+        "<!DOCTYPE fontconfig SYSTEM \"urn:fontconfig:fonts.dtd\">\n"
+        "<fontconfig>\n"
+        "    <dir>/first</dir>\n"
+        "    <dir prefix=\"xdg\">fonts</dir>\n"
+        "    <dir prefix=\"relative\">relative</dir>\n"
+        f"    <include ignore_missing=\"yes\">{conf_d}</include>\n"
+        "    <cachedir prefix=\"xdg\">fontconfig</cachedir>\n"
+        "</fontconfig>\n"
+    )
+    (conf_d / "10-reject.conf").write_text(
+        "<fontconfig>\n"
+        "    <dir>/second</dir>\n"
+        f"    <include>{config_file}</include>\n"
+        "    <selectfont>\n"
+        "        <rejectfont><glob>/first/*</glob></rejectfont>\n"
+        "        <acceptfont><glob>*.ttf</glob></acceptfont>\n"
+        "        <rejectfont><pattern><patelt name=\"scalable\"><bool>false</bool></patelt></pattern></rejectfont>\n"
+        "    </selectfont>\n"
+        "</fontconfig>\n"
+    )
+    # Only the files that start with a digit are loaded
+    (conf_d / "reset.conf").write_text("<fontconfig><reset-dirs/></fontconfig>")
+    monkeypatch.setenv("FONTCONFIG_FILE", str(config_file))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+    config = FontConfigConfig.get()
+    assert config.font_dirs == ("/first", str(tmp_path / "data" / "fonts"), str(tmp_path / "relative"), "/second")
+    assert config.cache_dirs == (str(tmp_path / "cache" / "fontconfig"),)
+    assert config.reject_patterns == ((("scalable", (False,)),),)
+    assert not config.accepts_filename("/first/font.otf")
+    assert config.accepts_filename("/first/font.ttf")
+    assert config.accepts_filename("/second/font.otf")
+
+    # The configuration is only parsed again when it changes
+    assert FontConfigConfig.get() is config
+    (conf_d / "20-reset.conf").write_text("<fontconfig><reset-dirs/></fontconfig>")
+    assert FontConfigConfig.get().font_dirs == ()
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_cache_reject_pattern(tmp_path, monkeypatch):
+    fonts_dir = tmp_path / "fonts"
+    fonts_dir.mkdir()
+    copyfile(font_path, fonts_dir / "SuperFunky-lgmWw.ttf")
+    config_file = tmp_path / "fonts.conf"
+    config_file.write_text(
+        "<fontconfig>\n"
+        f"    <dir>{fonts_dir}</dir>\n"
+        f"    <cachedir>{tmp_path / 'cache'}</cachedir>\n"
+        "    <selectfont><rejectfont><pattern><patelt name=\"family\"><string>superfunky</string></patelt></pattern></rejectfont></selectfont>\n"
+        "</fontconfig>\n"
+    )
+    monkeypatch.setenv("FONTCONFIG_FILE", str(config_file))
+    invalidate_system_fonts_cache()
+
+    # Loading the fonts with fontconfig writes the cache of the directory, which contains the rejected font
+    assert get_system_fonts_filename() == set()
+    snapshot = FontConfigCache.get_system_fonts_snapshot()
+    assert snapshot is not None and snapshot.fonts_filename == frozenset()
+
+    monkeypatch.delenv("FONTCONFIG_FILE")
+    invalidate_system_fonts_cache()
@@ -0,0 +1,102 @@
+import os
+import pytest
+from concurrent.futures import ThreadPoolExecutor, wait
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from pathlib import Path
+from shutil import copyfile
+from find_system_fonts_filename import get_system_fonts_filename, install_font, uninstall_font
+
+if is_unix:
+    from find_system_fonts_filename.unix.fontconfig_session import FontConfigSession
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_session_reuses_config_until_fonts_change(fontconfig_sandbox):
+    session = FontConfigSession.get()
+    assert FontConfigSession.get() is session
+    assert FontConfigSession.get_if_loaded() is session
+
+    with session.config() as config:
+        pass
+    with session.config() as same_config:
+        assert same_config == config
+    assert session.is_config_up_to_date()
+
+    copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+    assert not session.is_config_up_to_date()
+
+    with session.config():
+        pass
+    assert session.is_config_up_to_date()
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_session_keeps_config_used_by_reader(fontconfig_sandbox):
+    session = FontConfigSession.get()
+
+    with session.config() as old_config:
+        copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+        # Another reader gets a new FcConfig while the old one is still used
+        with session.config() as new_config:
+            assert new_config is not old_config
+        assert session.get_font_dirs(old_config.config) == [str(fontconfig_sandbox)]
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_font_added_while_config_loads(fontconfig_sandbox, monkeypatch):
+    session = FontConfigSession.get()
+    load_config = session.font_config.FcInitLoadConfigAndFonts
+
+    def load_config_and_add_font():
+        config = load_config()
+        copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+        return config
+
+    # The mtime of the directory surely changes when the font is added
+    os.utime(fontconfig_sandbox, ns=(0, 0))
+    monkeypatch.setattr(session.font_config, "FcInitLoadConfigAndFonts", load_config_and_add_font)
+    with session.config():
+        pass
+    # The config doesn't contain the font, so it must be stale
+    assert not session.is_config_up_to_date()
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_up_to_date_check_waits_for_writer(fontconfig_sandbox):
+    session = FontConfigSession.get()
+
+    with ThreadPoolExecutor(1) as executor:
+        with session.write_config():
+            future = executor.submit(session.is_config_up_to_date)
+            # The check doesn't use the FcConfig while the writer modifies it
+            assert not wait([future], timeout=0.2).done
+        assert future.result()
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_concurrent_enumeration_and_install(fontconfig_sandbox):
+    fonts_paths = [Path(fontconfig_sandbox.parent / f"font_{i}.ttf") for i in range(4)]
+    for font in fonts_paths:
+        copyfile(font_path, font)
+    installed_paths = {str(fontconfig_sandbox / font.name) for font in fonts_paths}
+
+    def read():
+        for _ in range(20):
+            fonts_filename = get_system_fonts_filename()
+            assert fonts_filename <= installed_paths
+
+    def write(font):
+        for _ in range(5):
+            install_font(font)
+            uninstall_font(font)
+
+    with ThreadPoolExecutor(64) as executor:
+        futures = [executor.submit(write, font) for font in fonts_paths]
+        futures += [executor.submit(read) for _ in range(60)]
+        for future in futures:
+            future.result()
+
+    assert get_system_fonts_filename() == set()
@@ -0,0 +1,33 @@
+import pytest
+from conftest import create_collection, is_unix
+from os.path import dirname, join, realpath
+from find_system_fonts_filename import FontsSnapshot, get_system_fonts_faces, invalidate_system_fonts_cache
+
+if is_unix:
+    from find_system_fonts_filename.unix.fontconfig_cache import FontConfigCache
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+def test_faces_from_collection_header(tmp_path):
+    collection_path = tmp_path / "collection.ttc"
+    create_collection(font_path, collection_path, 3)
+
+    snapshot = FontsSnapshot(frozenset({str(collection_path), font_path}))
+    assert snapshot.get_fonts_faces() == {(str(collection_path), 0), (str(collection_path), 1), (str(collection_path), 2), (font_path, 0)}
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_get_system_fonts_faces(fontconfig_sandbox):
+    collection_path = fontconfig_sandbox / "collection.ttc"
+    create_collection(font_path, collection_path, 2)
+    expected_faces = {(str(collection_path), 0), (str(collection_path), 1)}
+
+    # From FcFontList
+    assert get_system_fonts_faces() == expected_faces
+
+    # From the cache written by fontconfig
+    snapshot = FontConfigCache.get_system_fonts_snapshot()
+    assert snapshot is not None and snapshot.get_fonts_faces() == expected_faces
+    invalidate_system_fonts_cache()
+    assert get_system_fonts_faces() == expected_faces
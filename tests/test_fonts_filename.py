@@ -5,7 +5,7 @@ from os import name
 from os.path import dirname, isfile, join, realpath, samefile
 from pathlib import Path
 from platform import system
-from find_system_fonts_filename import get_system_fonts_filename, install_font, uninstall_font, OSNotSupported
+from find_system_fonts_filename import count_system_fonts, get_system_fonts_filename, install_font, invalidate_system_fonts_cache, iter_system_fonts_filename, uninstall_font, OSNotSupported
 
 
 def test_get_system_fonts_filename():
@@ -101,3 +101,20 @@ def test_install_uninstall_font_android():
     with pytest.raises(OSNotSupported) as exc_info:
         uninstall_font(filename)
     assert str(exc_info.value) == "You cannot uninstall font on android."
+
+
+def test_iter_system_fonts_filename():
+    invalidate_system_fonts_cache()
+    # Without a snapshot, the fonts are streamed from the backend
+    fonts_filename = list(iter_system_fonts_filename())
+    assert len(fonts_filename) == len(set(fonts_filename))
+    assert set(fonts_filename) == get_system_fonts_filename()
+    assert count_system_fonts() == len(fonts_filename)
+
+    # Closing the generator early must release the enumeration
+    invalidate_system_fonts_cache()
+    iterator = iter_system_fonts_filename()
+    if fonts_filename:
+        assert next(iterator) in fonts_filename
+    iterator.close()
+    assert count_system_fonts() == len(fonts_filename)
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import pytest
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from platform import system
+from queue import Queue
+from shutil import copyfile
+from threading import Event
+from time import sleep
+from find_system_fonts_filename import create_fonts_watcher
+
+if is_unix:
+    from find_system_fonts_filename.unix import fonts_watcher
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+@pytest.mark.skipif(not (is_unix and system() == "Linux"), reason="Test runs only on Linux")
+def test_fonts_watcher_thread(fontconfig_sandbox):
+    changes = Queue()
+    watcher = create_fonts_watcher(lambda added, removed: changes.put((added, removed)), debounce_delay=0.2)
+
+    with watcher:
+        # A burst of changes is reported at once
+        (fontconfig_sandbox / "sub").mkdir()
+        installed_fonts = [fontconfig_sandbox / "sub" / f"font_{i}.ttf" for i in range(10)]
+        for installed_font in installed_fonts:
+            copyfile(font_path, installed_font)
+
+        added, removed = changes.get(timeout=5)
+        assert added == frozenset(str(installed_font) for installed_font in installed_fonts)
+        assert removed == frozenset()
+
+        installed_fonts[0].unlink()
+        added, removed = changes.get(timeout=5)
+        assert added == frozenset()
+        assert removed == frozenset([str(installed_fonts[0])])
+
+    assert not watcher.is_running
+
+
+@pytest.mark.skipif(not (is_unix and system() == "Linux"), reason="Test runs only on Linux")
+def test_fonts_watcher_asyncio(fontconfig_sandbox):
+    async def watch():
+        changes = asyncio.Queue()
+
+        async def callback(added, removed):
+            await changes.put((added, removed))
+
+        watcher = create_fonts_watcher(callback, debounce_delay=0.05)
+        watcher.start_asyncio()
+        try:
+            installed_font = fontconfig_sandbox / "SuperFunky-lgmWw.ttf"
+            copyfile(font_path, installed_font)
+            return await asyncio.wait_for(changes.get(), 5), installed_font
+        finally:
+            watcher.stop()
+
+    (added, removed), installed_font = asyncio.run(watch())
+    assert added == frozenset([str(installed_font)])
+    assert removed == frozenset()
+
+
+@pytest.mark.skipif(not (is_unix and system() == "Linux"), reason="Test runs only on Linux")
+def test_fonts_watcher_thread_rejects_coroutine_function(fontconfig_sandbox):
+    async def callback(added, removed):
+        pass
+
+    watcher = create_fonts_watcher(callback)
+    with pytest.raises(TypeError):
+        watcher.start()
+    assert not watcher.is_running
+
+
+@pytest.mark.skipif(not (is_unix and system() == "Linux"), reason="Test runs only on Linux")
+def test_fonts_watcher_asyncio_stop_during_refresh(fontconfig_sandbox, monkeypatch, caplog):
+    refreshing = Event()
+    get_system_fonts_changes = fonts_watcher.get_system_fonts_changes
+
+    def slow_get_system_fonts_changes(since=None):
+        if refreshing.is_set():
+            sleep(0.2)
+        return get_system_fonts_changes(since)
+
+    async def watch():
+        watcher = create_fonts_watcher(lambda added, removed: None, debounce_delay=0)
+        watcher.start_asyncio()
+        monkeypatch.setattr(fonts_watcher, "get_system_fonts_changes", slow_get_system_fonts_changes)
+        refreshing.set()
+        copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+        # Let the refresh start in the executor
+        await asyncio.sleep(0.1)
+        # The file descriptor is only closed once the refresh is done
+        watcher.stop()
+        assert not watcher.is_running
+        await asyncio.sleep(0.1)
+
+    asyncio.run(watch())
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
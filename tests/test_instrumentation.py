@@ -0,0 +1,50 @@
+import pytest
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from pathlib import Path
+from shutil import copyfile
+from find_system_fonts_filename import add_observer, get_system_fonts_filename, install_font, remove_observer, reset_stats, stats, uninstall_font
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_spans_and_stats(fontconfig_sandbox):
+    copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+    spans = []
+    reset_stats()
+    add_observer(spans.append)
+    try:
+        # Without fontconfig cache, the fonts are listed with FcFontList
+        get_system_fonts_filename()
+        get_system_fonts_filename()
+    finally:
+        remove_observer(spans.append)
+
+    names = [span.name for span in spans]
+    assert "unix.font_list" in names
+    assert "unix.decode" in names
+    assert names[-1] == "unix.enumerate"
+    assert spans[-1].attributes["source"] == "fontconfig"
+    assert all(span.duration >= 0 and not span.failed for span in spans)
+
+    current_stats = stats()
+    assert current_stats["calls"] == 2
+    assert current_stats["snapshot_cache_hits"] == 1
+    assert current_stats["snapshot_cache_misses"] == 1
+    assert current_stats["fonts_scanned"] == 1
+    assert current_stats["fonts_filtered_by_format"] == 0
+    assert current_stats["bytes_decoded"] == len(str(fontconfig_sandbox / "SuperFunky-lgmWw.ttf").encode())
+    assert current_stats["span.unix.font_list.count"] == 1
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_install_spans(fontconfig_sandbox):
+    reset_stats()
+    install_font(Path(font_path))
+    uninstall_font(Path(font_path))
+
+    current_stats = stats()
+    assert current_stats["span.unix.install.count"] == 1
+    assert current_stats["span.unix.uninstall.count"] == 1
+    assert current_stats["span.unix.rescan.count"] == 2
@@ -0,0 +1,45 @@
+import tracemalloc
+from find_system_fonts_filename import FontsInventory
+
+
+def test_inventory():
+    fonts_filename = {"/usr/share/fonts/b.ttf", "/usr/share/fonts/a.otf", "/home/user/.fonts/a.otf", "/fonts/\udcff.ttf", "C:\\Windows\\Fonts\\arial.ttf"}
+    inventory = FontsInventory(fonts_filename)
+
+    assert len(inventory) == 5
+    assert set(inventory) == fonts_filename
+    assert inventory == fonts_filename
+    assert hash(inventory) == hash(frozenset(fonts_filename))
+    assert "/usr/share/fonts/a.otf" in inventory
+    assert "/usr/share/fonts/c.otf" not in inventory
+    assert "/usr/share/a.otf" not in inventory
+    assert 1 not in inventory
+    assert inventory - {"/usr/share/fonts/b.ttf"} == fonts_filename - {"/usr/share/fonts/b.ttf"}
+
+    # The IDs follow the order of the filenames, so they don't depend on the order of the input
+    font_ids = {font_filename: inventory.get_id(font_filename) for font_filename in fonts_filename}
+    assert sorted(font_ids.values()) == list(range(5))
+    assert all(inventory.get_filename(font_id) == font_filename for font_filename, font_id in font_ids.items())
+    assert FontsInventory(sorted(fonts_filename, reverse=True)).get_id("/usr/share/fonts/b.ttf") == font_ids["/usr/share/fonts/b.ttf"]
+    assert inventory.get_directory_fonts("/usr/share/fonts/") == ["/usr/share/fonts/a.otf", "/usr/share/fonts/b.ttf"]
+
+
+def test_inventory_memory():
+    def build_paths():
+        return [f"/usr/share/texlive/texmf-dist/fonts/opentype/public/family{i // 20:04d}/Family{i // 20:04d}-Style{i % 20:02d}.otf" for i in range(20000)]
+
+    tracemalloc.start()
+    try:
+        fonts_filename = set(build_paths())
+        set_size = tracemalloc.get_traced_memory()[0]
+        del fonts_filename
+
+        tracemalloc.reset_peak()
+        start_size = tracemalloc.get_traced_memory()[0]
+        inventory = FontsInventory(build_paths())
+        inventory_size = tracemalloc.get_traced_memory()[0] - start_size
+    finally:
+        tracemalloc.stop()
+
+    assert len(inventory) == 20000
+    assert set_size >= 4 * inventory_size
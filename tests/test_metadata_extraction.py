@@ -0,0 +1,54 @@
+import pytest
+import sys
+from conftest import create_collection
+from os.path import dirname, join, realpath
+from struct import pack
+from find_system_fonts_filename import extract_metadata, OSNotSupported
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+@pytest.mark.parametrize("backend", [
+    "thread",
+    pytest.param("process", marks=pytest.mark.skipif(hasattr(sys, "getandroidapilevel"), reason="Android doesn't support multiprocessing")),
+])
+def test_extract_metadata(tmp_path, backend):
+    collection_path = tmp_path / "collection.ttc"
+    create_collection(font_path, collection_path, 2)
+    empty_path = tmp_path / "empty.ttf"
+    empty_path.write_bytes(b"")
+    missing_path = tmp_path / "missing.ttf"
+
+    paths = [font_path, str(collection_path), str(empty_path), str(missing_path)] * 10
+    results = list(extract_metadata(paths, workers=2, backend=backend, chunk_size=3))
+
+    # The failures are reported instead of stopping the extraction
+    assert len(results) == 50
+    assert sum(1 for result in results if result.error is None and result.names[1] == ["Super Funky"]) == 30
+    assert {(result.filename, result.face_index) for result in results if result.error is None} == {(font_path, 0), (str(collection_path), 0), (str(collection_path), 1)}
+    assert {result.filename for result in results if result.error is not None} == {str(empty_path), str(missing_path)}
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        list(extract_metadata([font_path], backend="fiber"))
+
+
+def test_broken_face(tmp_path):
+    collection_path = tmp_path / "collection.ttc"
+    create_collection(font_path, collection_path, 3)
+    # The second face points after the end of the file
+    content = bytearray(collection_path.read_bytes())
+    content[16:20] = pack(">I", len(content) + 1000)
+    collection_path.write_bytes(content)
+
+    results = list(extract_metadata([str(collection_path)], workers=1))
+
+    assert [(result.face_index, result.error is None) for result in results] == [(0, True), (1, False), (2, True)]
+    assert results[2].names[1] == ["Super Funky"]
+
+
+def test_process_backend_on_android(monkeypatch):
+    monkeypatch.setattr(sys, "getandroidapilevel", lambda: 30, raising=False)
+    with pytest.raises(OSNotSupported):
+        list(extract_metadata([font_path], backend="process"))
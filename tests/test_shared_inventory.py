@@ -0,0 +1,54 @@
+import pytest
+import subprocess
+import sys
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from shutil import copyfile
+from find_system_fonts_filename import FindSystemFontsFilenameException, FontsInventory, get_system_fonts_inventory, publish_fonts_inventory, SharedFontsInventory
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+def test_publish_fonts_inventory(tmp_path):
+    path = str(tmp_path / "fonts.inventory")
+    shared_inventory = SharedFontsInventory(path)
+    with pytest.raises(FindSystemFontsFilenameException):
+        shared_inventory.get()
+
+    fonts_filename = ["/usr/share/fonts/b/B.ttf", "/usr/share/fonts/a/A.otf", "/usr/share/fonts/a/\udcff.ttf", "/opt/C.ttc"]
+    assert publish_fonts_inventory(path, FontsInventory(fonts_filename)) == 1
+    inventory = shared_inventory.get()
+    assert shared_inventory.generation == 1
+    assert inventory == FontsInventory(fonts_filename) == set(fonts_filename)
+    assert shared_inventory.get() is inventory
+    assert inventory.get_id("/opt/C.ttc") == 0
+    assert inventory.get_filename(3) == "/usr/share/fonts/b/B.ttf"
+    assert inventory.get_directory_fonts("/usr/share/fonts/a/") == ["/usr/share/fonts/a/A.otf", "/usr/share/fonts/a/\udcff.ttf"]
+
+    # A new generation is mapped on the next get, and the previous inventory stays usable
+    assert publish_fonts_inventory(path, FontsInventory(fonts_filename[:1])) == 2
+    assert shared_inventory.get() == set(fonts_filename[:1])
+    assert shared_inventory.generation == 2
+    assert inventory == set(fonts_filename)
+
+    with open(path, "wb") as file:
+        file.write(b"not an inventory" * 10)
+    with pytest.raises(FindSystemFontsFilenameException):
+        shared_inventory.get()
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_shared_inventory_without_fontconfig(fontconfig_sandbox, tmp_path):
+    copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+    path = str(tmp_path / "fonts.inventory")
+    publish_fonts_inventory(path)
+
+    # The worker process maps the inventory without loading fontconfig
+    output = subprocess.run([sys.executable, "-c", (
+        "import sys\n"
+        "from find_system_fonts_filename import SharedFontsInventory\n"
+        f"print(sorted(SharedFontsInventory({path!r}).get()))\n"
+        "print(any('fontconfig' in line for line in open('/proc/self/maps')))\n"
+    )], check=True, stdout=subprocess.PIPE, text=True).stdout.splitlines()
+
+    assert output == [str(sorted(get_system_fonts_inventory())), "False"]
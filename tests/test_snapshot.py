@@ -0,0 +1,50 @@
+import pytest
+from conftest import is_unix
+from os.path import dirname, join, realpath
+from shutil import copyfile
+from find_system_fonts_filename import get_system_fonts_changes, get_system_fonts_filename, get_system_fonts_snapshot, invalidate_system_fonts_cache, warm_up_system_fonts_cache
+
+font_path = join(dirname(realpath(__file__)), "SuperFunky-lgmWw.ttf")
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_snapshot_is_reused_until_fonts_change(fontconfig_sandbox):
+    warm_up_system_fonts_cache()
+    snapshot = get_system_fonts_snapshot()
+    assert snapshot.fonts_filename == frozenset()
+    assert get_system_fonts_snapshot() is snapshot
+
+    copyfile(font_path, fontconfig_sandbox / "SuperFunky-lgmWw.ttf")
+    assert get_system_fonts_filename() == {str(fontconfig_sandbox / "SuperFunky-lgmWw.ttf")}
+    assert get_system_fonts_snapshot() is not snapshot
+
+
+def test_invalidate_system_fonts_cache():
+    snapshot = get_system_fonts_snapshot()
+    invalidate_system_fonts_cache()
+    new_snapshot = get_system_fonts_snapshot()
+
+    assert new_snapshot is not snapshot
+    assert new_snapshot.fonts_filename == snapshot.fonts_filename
+
+
+@pytest.mark.skipif(not is_unix, reason="Test runs only on Unix")
+def test_get_system_fonts_changes(fontconfig_sandbox):
+    changes = get_system_fonts_changes()
+    assert changes.added == frozenset() and changes.removed == frozenset()
+
+    unchanged = get_system_fonts_changes(changes.token)
+    assert unchanged.token is changes.token
+    assert unchanged.added == frozenset() and unchanged.removed == frozenset()
+
+    (fontconfig_sandbox / "sub").mkdir()
+    installed_font = fontconfig_sandbox / "sub" / "SuperFunky-lgmWw.ttf"
+    copyfile(font_path, installed_font)
+    added = get_system_fonts_changes(unchanged.token)
+    assert added.added == frozenset([str(installed_font)])
+    assert added.removed == frozenset()
+
+    installed_font.unlink()
+    removed = get_system_fonts_changes(added.token)
+    assert removed.added == frozenset()
+    assert removed.removed == frozenset([str(installed_font)])
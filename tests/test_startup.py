@@ -0,0 +1,74 @@
+import os
+import pytest
+import subprocess
+import sys
+import find_system_fonts_filename
+from importlib import import_module
+
+# The budgets are much higher than the measured times (see benchmarks/benchmark_startup.py), so a slow machine doesn't fail them.
+# They fail when a module imports an heavy dependency at import time again.
+IMPORT_TIME_BUDGET = 0.03
+IMPORT_API_TIME_BUDGET = 0.1
+
+# Android cannot start another interpreter, and sys.executable isn't a Python interpreter when Python is embedded or frozen.
+is_android = hasattr(sys, "getandroidapilevel")
+is_standalone_executable = bool(sys.executable) and not getattr(sys, "frozen", False) and os.path.isfile(sys.executable) and os.access(sys.executable, os.X_OK)
+
+
+def run_python(statement: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", statement], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+def get_imported_modules(statement: str) -> set:
+    output = run_python(f"import sys\n{statement}\nprint('\\n'.join(sys.modules))").stdout
+    return set(output.splitlines())
+
+
+def get_import_time(statement: str) -> float:
+    """
+    Returns:
+        The best time of 3 runs, in seconds, of the top level imports from the first import of the package, from python -X importtime.
+    """
+    times = []
+    for _ in range(3):
+        total = 0
+        started = False
+        for line in run_python(statement).stderr.splitlines():
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit() and module.startswith(" ") and not module.startswith("  "):
+                started = started or module.strip().startswith("find_system_fonts_filename")
+                total += int(cumulative) if started else 0
+        times.append(total / 1_000_000)
+    return min(times)
+
+
+@pytest.mark.skipif(is_android, reason="Android cannot run a subprocess of Python")
+@pytest.mark.skipif(not is_standalone_executable, reason="sys.executable isn't a standalone Python interpreter")
+def test_import_is_lazy():
+    modules = get_imported_modules("import find_system_fonts_filename")
+    assert not modules & {"find_system_fonts_filename.fonts_filename", "typing", "pathlib", "platform", "ctypes", "sqlite3", "asyncio"}
+
+    # The backend is only imported by the first call that needs it
+    modules = get_imported_modules("from find_system_fonts_filename import get_system_fonts_filename, FontFilter, install_font")
+    assert not modules & {"find_system_fonts_filename.unix", "find_system_fonts_filename.windows", "find_system_fonts_filename.mac", "ctypes", "sqlite3", "asyncio"}
+
+
+@pytest.mark.skipif(is_android, reason="Android cannot run a subprocess of Python")
+@pytest.mark.skipif(not is_standalone_executable, reason="sys.executable isn't a standalone Python interpreter")
+def test_import_time_budget():
+    assert get_import_time("import find_system_fonts_filename") < IMPORT_TIME_BUDGET
+    assert get_import_time("from find_system_fonts_filename import get_system_fonts_filename") < IMPORT_API_TIME_BUDGET
+
+
+def test_lazy_attributes():
+    # Each public name is exported by the module that the package maps it to, and the modules don't export other names
+    attributes_module = find_system_fonts_filename._ATTRIBUTES_MODULE
+    for module_name in set(attributes_module.values()):
+        module = import_module(f"find_system_fonts_filename.{module_name}")
+        assert set(module.__all__) == {name for name, name_module in attributes_module.items() if name_module == module_name}
+        for name in module.__all__:
+            assert getattr(find_system_fonts_filename, name) is getattr(module, name)
+
+    assert set(dir(find_system_fonts_filename)) >= set(find_system_fonts_filename.__all__)
+    with pytest.raises(AttributeError):
+        find_system_fonts_filename.not_an_attribute